@@ -0,0 +1,144 @@
+import time
+
+# ButtonInput.py
+try:
+    import keypad
+except ImportError:
+    keypad = None
+
+try:
+    from supervisor import ticks_ms
+except ImportError:
+    def ticks_ms():
+        return int(time.monotonic() * 1000) & TICKS_MAX
+
+TICKS_MAX = (1 << 29) - 1   # supervisor.ticks_ms() wraps at 2**29
+TICKS_HALF = 1 << 28
+
+PRESS = 1
+RELEASE = 2
+LONG_PRESS = 4
+
+
+def ticks_diff(a, b):
+    """a - b in ms, correct across a ticks_ms() wrap"""
+    return ((a - b + TICKS_HALF) & TICKS_MAX) - TICKS_HALF
+
+
+class ButtonInput:
+    def __init__(self, pin, long_press=1.0, queue_size=8):
+        """
+        Push button scanned and debounced in the background by keypad.Keys,
+        so presses made during a slow frame are queued instead of missed.
+        Falls back to a polled Debouncer where keypad is missing.
+        long_press: seconds held before a LONG_PRESS event is queued
+        After update(), fell / rose / long_press tell what happened since the
+        previous update() (same names as adafruit_debouncer).
+        """
+        self.pin = pin
+        self.long_press_ms = int(long_press * 1000)
+        self.queue = []           # (kind, ticks_ms) waiting for update()
+        self.queue_size = queue_size
+        self.pressed = False
+        self.press_ms = 0
+        self.long_sent = False
+
+        self.fell = False
+        self.rose = False
+        self.long_press = False
+
+        self.debouncer = None
+        if keypad is not None:
+            self.keys = keypad.Keys((pin,), value_when_pressed=False, pull=True)
+            self.event = keypad.Event()   # Reused for every read
+        else:
+            import digitalio
+            from adafruit_debouncer import Debouncer
+            io = digitalio.DigitalInOut(pin)
+            io.direction = digitalio.Direction.INPUT
+            io.pull = digitalio.Pull.UP
+            self.keys = None
+            self.debouncer = Debouncer(io)
+
+    def _push(self, kind, t):
+        if len(self.queue) < self.queue_size:
+            self.queue.append((kind, t))
+
+    def poll(self):
+        """Move scanner events into the queue and detect long presses"""
+        if self.keys is not None:
+            event = self.event
+            while self.keys.events.get_into(event):
+                self._edge(event.pressed, event.timestamp)
+        elif self.debouncer is not None:
+            self.debouncer.update()
+            if self.debouncer.fell:
+                self._edge(True, ticks_ms())
+            elif self.debouncer.rose:
+                self._edge(False, ticks_ms())
+
+        if self.pressed and not self.long_sent:
+            now = ticks_ms()
+            if ticks_diff(now, self.press_ms) >= self.long_press_ms:
+                self.long_sent = True
+                self._push(LONG_PRESS, now)
+
+    def _edge(self, pressed, t):
+        if pressed == self.pressed:
+            return   # Already known, e.g. the press that woke the board
+        self.pressed = pressed
+        if pressed:
+            self.press_ms = t
+            self.long_sent = False
+            self._push(PRESS, t)
+        else:
+            self._push(RELEASE, t)
+
+    def pending(self):
+        """True once an event is queued for the next update()"""
+        self.poll()
+        return bool(self.queue)
+
+    def release_pin(self):
+        """Stop scanning and free the pin for a wake-up alarm; None if it cannot be lent"""
+        if self.keys is None:
+            return None
+        self.keys.deinit()
+        self.keys = None
+        return self.pin
+
+    def claim_pin(self, pressed=False):
+        """
+        Scan again after release_pin().
+        pressed: the button woke the board; its press is queued here, since
+            it may be over before the scanner runs again
+        """
+        import digitalio
+        io = digitalio.DigitalInOut(self.pin)
+        io.switch_to_input(pull=digitalio.Pull.UP)
+        held = not io.value
+        io.deinit()
+        t = ticks_ms()
+        if pressed:
+            self._edge(True, t)
+        if not held:
+            self._edge(False, t)   # Also ends a hold that was released while asleep
+        self.keys = keypad.Keys((self.pin,), value_when_pressed=False, pull=True)
+
+    def update(self):
+        """Collect everything queued since the last update into fell/rose/long_press"""
+        self.poll()
+        self.fell = self.rose = self.long_press = False
+        for kind, _ in self.queue:
+            if kind == PRESS:
+                self.fell = True
+            elif kind == RELEASE:
+                self.rose = True
+            else:
+                self.long_press = True
+        self.queue.clear()
+
+    @property
+    def value(self):
+        """False while held down (pull-up wiring, same as the Debouncer)"""
+        return not self.pressed
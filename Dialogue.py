@@ -0,0 +1,112 @@
+import displayio
+
+from Text import make_label
+
+# Dialogue.py
+MAX_CHARS = 16        # Characters per line on the 128 px screen
+LAYOUT_CACHE_SIZE = 48
+
+
+def split_text_to_lines(text, max_chars_per_line=MAX_CHARS):
+    """Split long text into multiple lines, each line <= max_chars_per_line"""
+    words = text.split(' ')
+    lines = []
+    current_line = ""
+    for word in words:
+        if len(current_line + ' ' + word) <= max_chars_per_line:
+            if current_line:
+                current_line += ' ' + word
+            else:
+                current_line = word
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+class DialogueWidget:
+    def __init__(self, max_lines=5, y_start=22, line_height=12):
+        """
+        One persistent screen for dialogues and menus.
+        Line labels are created once and only relabelled when their text
+        changes; wrapped layouts are cached per (text, width).
+        max_lines: labels preallocated (more are added if a text needs them)
+        """
+        self.group = displayio.Group()
+        self.y_start = y_start
+        self.line_height = line_height
+        self.labels = []
+        self.shown = []          # Text currently on each label
+        self.layouts = {}        # (text, width) -> tuple of wrapped lines
+        for _ in range(max_lines):
+            self._add_label()
+
+        self.arrow = make_label(
+            "v",
+            anchored_position=(110, y_start),
+            anchor_point=(0.5, 0.5)
+        )
+        self.arrow.hidden = True
+        self.group.append(self.arrow)
+
+    def _add_label(self):
+        lbl = make_label(
+            "",
+            anchored_position=(64, self.y_start + len(self.labels) * self.line_height),
+            anchor_point=(0.5, 0.5)
+        )
+        self.labels.append(lbl)
+        self.shown.append("")
+        self.group.append(lbl)
+
+    def wrap(self, text, width=MAX_CHARS):
+        key = (text, width)
+        lines = self.layouts.get(key)
+        if lines is None:
+            if len(self.layouts) >= LAYOUT_CACHE_SIZE:
+                self.layouts.clear()
+            lines = tuple(split_text_to_lines(text, width))
+            self.layouts[key] = lines
+        return lines
+
+    def set_line(self, i, text):
+        """Relabel line i only if its text changed"""
+        while i >= len(self.labels):
+            self._add_label()
+        if self.shown[i] != text:
+            self.labels[i].text = text
+            self.shown[i] = text
+
+    def show(self, options, arrow=False):
+        """
+        Lay out options, each wrapped onto as many lines as it needs.
+        arrow: show the "continue" arrow below the first option
+        Returns the text of the last line (used to time the typing sound).
+        """
+        n = 0
+        line_text = ""
+        arrow_y = self.y_start
+        for i, text in enumerate(options):
+            for line_text in self.wrap(text):
+                self.set_line(n, line_text)
+                n += 1
+            if i == 0:
+                arrow_y = self.y_start + n * self.line_height
+
+        # Blank the lines the previous screen used beyond this one
+        for i in range(n, len(self.labels)):
+            self.set_line(i, "")
+
+        self.arrow.anchored_position = (110, arrow_y)
+        self.arrow.hidden = not arrow
+        return line_text
+
+    def select(self, options, selection):
+        """Update menu lines to highlight the current selection"""
+        for idx, text in enumerate(options):
+            if idx == selection:
+                self.set_line(idx, "> " + text + " <")
+            else:
+                self.set_line(idx, "  " + text + "  ")
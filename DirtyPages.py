@@ -0,0 +1,175 @@
+import displayio
+
+import Log
+
+# DirtyPages.py
+# What a frame costs on the I2C bus. The SSD1306 keeps 8 pages of 128
+# column bytes (one byte = 8 rows); displayio pushes changed areas through
+# the column/page address window commands. This tracker keeps, per page, the
+# span of columns that changed this frame, packs the spans into windows the
+# same way and counts the bytes they take against a full 1 KB frame.
+#     DirtyPages.enable()
+#     DirtyPages.mark(x, y, w, h)     content redrawn in place (text, blink)
+#     tracker.end_frame(group)        moves/shows/hides found by a scan
+# mark() is a do-nothing stub until enable() (same idea as Log.configure()).
+WIDTH = 128
+PAGES = 8
+EMPTY = 0xFF
+# Per window: address + control + 6 command bytes (0x21 c0 c1 0x22 p0 p1),
+# then address + control before the data bytes
+WINDOW_OVERHEAD = 10
+FULL_FRAME = WIDTH * PAGES + WINDOW_OVERHEAD
+
+
+class PageTracker:
+    def __init__(self):
+        self.lo = bytearray([EMPTY] * PAGES)   # First dirty column per page
+        self.hi = bytearray(PAGES)             # Last dirty column per page
+        self.items = {}    # id(TileGrid) -> (x, y, w, h) while visible
+        self.seen = {}     # Scratch dict reused by end_frame()
+
+        self.last_bytes = 0
+        self.last_windows = 0
+        self.frames = 0
+        self.total = 0
+        self.worst = 0
+        self.idle = 0          # Frames with nothing to send
+        self.window_frames = 0
+        self.window_total = 0
+
+    def mark(self, x, y, w, h):
+        """Pixels (x, y, w, h) change this frame"""
+        x0 = max(0, x)
+        x1 = min(WIDTH - 1, x + w - 1)
+        y0 = max(0, y)
+        y1 = min(PAGES * 8 - 1, y + h - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        lo = self.lo
+        hi = self.hi
+        for p in range(y0 >> 3, (y1 >> 3) + 1):
+            if lo[p] == EMPTY or x0 < lo[p]:
+                lo[p] = x0
+            if x1 > hi[p]:
+                hi[p] = x1
+
+    def _scan(self, group, ox, oy, visible):
+        ox += group.x
+        oy += group.y
+        visible = visible and not group.hidden
+        items = self.items
+        seen = self.seen
+        for item in group:
+            if isinstance(item, displayio.Group):
+                self._scan(item, ox, oy, visible)
+                continue
+            key = id(item)
+            old = items.get(key)
+            if visible and not item.hidden:
+                rect = (ox + item.x, oy + item.y,
+                        item.width * item.tile_width, item.height * item.tile_height)
+                seen[key] = rect
+                if old != rect:
+                    if old is not None:
+                        self.mark(*old)
+                    self.mark(*rect)
+            elif old is not None:
+                self.mark(*old)
+
+    def end_frame(self, group):
+        """Scan `group` for changed sprites, then count this frame's windows"""
+        seen = self.seen
+        self._scan(group, 0, 0, True)
+        # Sprites removed from the tree since the last frame
+        for key, rect in self.items.items():
+            if key not in seen:
+                self.mark(*rect)
+        self.items, self.seen = seen, self.items
+        self.seen.clear()
+
+        nbytes, windows = self._windows()
+        self.last_bytes = nbytes
+        self.last_windows = windows
+        self.frames += 1
+        self.total += nbytes
+        self.window_frames += 1
+        self.window_total += nbytes
+        if nbytes > self.worst:
+            self.worst = nbytes
+        if not nbytes:
+            self.idle += 1
+        return nbytes
+
+    def _windows(self):
+        """Bytes and windows needed for the dirty spans, then clear them"""
+        lo = self.lo
+        hi = self.hi
+        nbytes = 0
+        windows = 0
+        c0 = c1 = p0 = p1 = -1
+        for p in range(PAGES):
+            if lo[p] == EMPTY:
+                continue
+            a = lo[p]
+            b = hi[p]
+            lo[p] = EMPTY
+            hi[p] = 0
+            if p0 >= 0 and p == p1 + 1:
+                # Grow the open window over this page when that is cheaper
+                # than starting a new one
+                merged = (max(c1, b) - min(c0, a) + 1) * (p - p0 + 1)
+                apart = (c1 - c0 + 1) * (p1 - p0 + 1) + (b - a + 1) + WINDOW_OVERHEAD
+                if merged <= apart:
+                    c0 = min(c0, a)
+                    c1 = max(c1, b)
+                    p1 = p
+                    continue
+            if p0 >= 0:
+                nbytes += (c1 - c0 + 1) * (p1 - p0 + 1) + WINDOW_OVERHEAD
+                windows += 1
+            c0, c1, p0, p1 = a, b, p, p
+        if p0 >= 0:
+            nbytes += (c1 - c0 + 1) * (p1 - p0 + 1) + WINDOW_OVERHEAD
+            windows += 1
+        return nbytes, windows
+
+    def take_window(self):
+        """Average bytes per frame since the last call, and its share of a full frame in %"""
+        n = self.window_frames
+        avg = self.window_total // n if n else 0
+        self.window_frames = 0
+        self.window_total = 0
+        return avg, avg * 100 // FULL_FRAME
+
+    def report(self):
+        """Log the totals since the last report, then start over"""
+        n = self.frames
+        if n:
+            avg = self.total // n
+            Log.info("I2C: %d frames, avg %d B/frame (%d%% of a full %d B frame), worst %d B, %d idle",
+                     n, avg, avg * 100 // FULL_FRAME, FULL_FRAME, self.worst, self.idle)
+        self.frames = 0
+        self.total = 0
+        self.worst = 0
+        self.idle = 0
+
+
+# ================================
+# Module-level API
+# ================================
+tracker = None   # Active PageTracker, None while tracking is disabled
+
+
+def _off(x, y, w, h):
+    pass
+
+
+mark = _off
+
+
+def enable():
+    """Start tracking; mark() calls now reach the tracker"""
+    global tracker, mark
+    tracker = PageTracker()
+    mark = tracker.mark
+    return tracker
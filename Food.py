@@ -1,39 +1,35 @@
 import random
 import displayio
 
+from GameRules import SCREEN_WIDTH, SCREEN_HEIGHT, FOOD_SIZE
+
+# Every food looks the same, so they all share one bitmap and palette
+BITMAP = displayio.Bitmap(FOOD_SIZE, FOOD_SIZE, 2)
+BITMAP.fill(1)
+PALETTE = displayio.Palette(2)
+PALETTE[0] = 0x000000  # background black
+PALETTE[1] = 0xFFFFFF  # food color
+
+
 class Food:
-    def __init__(self, group, screen_width, screen_height, size=2, points=1):
+    size = FOOD_SIZE
+    points = 1   # score gained when eaten
+
+    def __init__(self, group=None, rng=random):
         """
         group: displayio.Group, the display group
-        screen_width, screen_height: screen dimensions, used for random placement
-        size: size of the food
-        points: score gained when eaten
+            (None preallocates a hidden food for a later place())
+        rng: random source for the initial position (the random module or a seeded Rng)
         """
         self.group = group
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.size = size
-        self.points = points
-
-        self.bitmap = displayio.Bitmap(size, size, 2)
-        palette = displayio.Palette(2)
-        palette[0] = 0x000000  # background black
-        palette[1] = 0xFFFFFF  # food color
-        self.tile = displayio.TileGrid(self.bitmap, pixel_shader=palette)
+        self.tile = displayio.TileGrid(BITMAP, pixel_shader=PALETTE)
+        self.x = 0
+        self.y = 0
+        self.eaten = True
 
         # randomly generate initial position
-        self.x = random.randint(0, screen_width - size)
-        self.y = random.randint(0, screen_height - size)
-        self.tile.x = self.x
-        self.tile.y = self.y
-
-        # initialize food pixels
-        for i in range(size):
-            for j in range(size):
-                self.bitmap[i, j] = 1
-
-        self.group.append(self.tile)
-        self.eaten = False
+        if group is not None:
+            self.respawn(rng)
 
     def check_collision(self, player_x, player_y, player_size):
         """
@@ -46,8 +42,8 @@ class Food:
 
         f_left = self.x
         f_top = self.y
-        f_right = self.x + self.size
-        f_bottom = self.y + self.size
+        f_right = f_left + FOOD_SIZE
+        f_bottom = f_top + FOOD_SIZE
 
         p_left = player_x
         p_top = player_y
@@ -64,17 +60,27 @@ class Food:
     def eat(self):
         """Mark as eaten and remove from display"""
         if not self.eaten:
-            if self.tile in self.group:
+            if self.group is not None and self.tile in self.group:
                 self.group.remove(self.tile)
             self.eaten = True
 
-    def respawn(self):
+    def respawn(self, rng=random):
         """Respawn randomly (optional)"""
+        self.place(rng.randint(0, SCREEN_WIDTH - FOOD_SIZE),
+                   rng.randint(0, SCREEN_HEIGHT - FOOD_SIZE))
+
+    def place(self, x, y, group=None):
+        """
+        Reuse this food at a given position on the next tile
+        group: move the food to this display group (e.g. a new level)
+        """
+        if group is not None and group is not self.group:
+            self.eat()
+            self.group = group
         self.eaten = False
-        self.x = random.randint(0, self.screen_width - self.size)
-        self.y = random.randint(0, self.screen_height - self.size)
-        self.tile.x = self.x
-        self.tile.y = self.y
+        self.x = x
+        self.y = y
+        self.tile.x = x
+        self.tile.y = y
         if self.tile not in self.group:
             self.group.append(self.tile)
-
@@ -0,0 +1,278 @@
+import math
+
+# GameRules.py
+# Pure game rules shared by the board and the host simulator (no displayio here)
+
+# ================================
+# Screen parameters
+# ================================
+SCREEN_WIDTH = 128
+SCREEN_HEIGHT = 64
+BALL_SIZE = 5
+ENEMY_SIZE = 8
+FOOD_SIZE = 2
+WALL_OFFSET = 5
+
+# ================================
+# Physics simulation parameters
+# ================================
+ACC_SCALE = 0.3
+FRICTION = 0.90
+MAX_SPEED = 2.5
+
+# ================================
+# Level parameters
+# ================================
+INVINCIBLE_TIME = 3       # seconds of blinking after a hit
+BLINK_INTERVAL = 0.15
+BOSS_TIME_LIMIT = 60
+BOSS_LIVES = 10
+BOSS_ENEMY_SPEED = 0.8
+BOSS_ENEMY_ACTIVATE = 30
+CHASER_SPEED = 1
+CHASER_ACTIVATE = 150
+
+# One-Euro tilt filter (filter.py): (min_cutoff Hz, beta), compared against
+# the old fixed EMA with tools/filter_compare.py and tools/latency_bench.py.
+# Every setting moves the ball as soon as the EMA did on a 0.5 m/s^2 tilt;
+# a low cutoff keeps the resting ball still, beta lets tilts through.
+TILT_FILTER = (0.7, 0.8)
+TILT_FILTER_CALM = (0.5, 0.6)     # Tutorial: steadiest ball
+TILT_FILTER_FAST = (1.0, 0.8)     # Boss: dodging the chaser needs the least lag
+
+SHIELD_ORDER = ["UP", "RIGHT", "DOWN", "LEFT"]  # Clockwise rotary order
+SHIELD_LENGTH = 20
+SHIELD_THICKNESS = 2
+SHIELD_PADDING = 2
+
+
+def level_params(mode, times):
+    """
+    Rules of a normal level.
+    mode: 0 Easy, 1 Medium, 2 Hard; times: levels passed so far
+    Returns: (time_limit, lives, target_score)
+    """
+    if mode == 0:
+        time_limit = 60
+        lives = 5
+    elif mode == 1:
+        time_limit = 40
+        lives = 3
+    else:
+        time_limit = 30
+        lives = 1
+
+    target_score = 1
+    if times == 20:
+        time_limit = 1000
+        target_score = 1000
+    return time_limit, lives, target_score
+
+
+def enemy_params(times):
+    """Enemies get faster and more alert with every level passed: (speed, activate_dist)"""
+    return 0.1 + times * 0.1, 10 + 2 * times
+
+
+# ================================
+# Movement & Collision
+# ================================
+def step_ball(x, y, vx, vy, ax, ay):
+    """Integrate one frame of tilt input; returns new (x, y, vx, vy)"""
+    vx += ax * ACC_SCALE
+    vy -= ay * ACC_SCALE
+
+    vx = max(-MAX_SPEED, min(MAX_SPEED, vx)) * FRICTION
+    vy = max(-MAX_SPEED, min(MAX_SPEED, vy)) * FRICTION
+
+    x += vx
+    y += vy
+
+    # Boundary hard limits
+    x = max(WALL_OFFSET, min(SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET, x))
+    y = max(WALL_OFFSET, min(SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET, y))
+    return x, y, vx, vy
+
+
+def check_direction_collision(x, y):
+    """Check if the ball hits UP / DOWN / LEFT / RIGHT wall based on its position"""
+    if y <= WALL_OFFSET:
+        return "UP"
+    if y >= SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET:
+        return "DOWN"
+    if x <= WALL_OFFSET:
+        return "LEFT"
+    if x >= SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET:
+        return "RIGHT"
+    return None
+
+
+def rects_overlap(x1, y1, w1, h1, x2, y2, w2, h2):
+    """Axis-aligned bounding box (AABB) test of two rectangles"""
+    return x1 < x2 + w2 and x1 + w1 > x2 and y1 < y2 + h2 and y1 + h1 > y2
+
+
+def overlaps(ax, ay, a_size, bx, by, b_size):
+    """AABB test of two squares given by top-left corner and size"""
+    return rects_overlap(ax, ay, a_size, a_size, bx, by, b_size, b_size)
+
+
+def mask_hits_rect(rows, size, x, y, rx, ry, rw, rh):
+    """
+    Pixel-accurate test of a sprite against a filled rectangle (player, shield).
+    rows: the sprite's row bitmasks (bit i = column i), see spiky_rows()
+    size: sprite width/height; x, y: its integer top-left corner
+    The AABB test rejects most pairs; the rest AND one integer per shared row.
+    """
+    if not (x < rx + rw and x + size > rx and y < ry + rh and y + size > ry):
+        return False
+    left = rx - x
+    span = (1 << rw) - 1
+    span = span << left if left >= 0 else span >> -left
+    for row in range(max(y, ry) - y, min(y + size, ry + rh) - y):
+        if rows[row] & span:
+            return True
+    return False
+
+
+def chase(ex, ey, player_x, player_y, speed):
+    """Move an enemy one step toward the player on each axis"""
+    if ex < player_x:
+        ex += speed
+    elif ex > player_x:
+        ex -= speed
+
+    if ey < player_y:
+        ey += speed
+    elif ey > player_y:
+        ey -= speed
+    return ex, ey
+
+
+def rotate_shield(current_dir, steps=1):
+    """Turn the shield clockwise by rotary steps"""
+    idx = SHIELD_ORDER.index(current_dir)
+    return SHIELD_ORDER[(idx + steps) % 4]
+
+
+def shield_rect(direction, player_x, player_y):
+    """Shield line next to the player: (x, y, w, h)"""
+    length = SHIELD_LENGTH
+    padding = SHIELD_PADDING
+    px = int(player_x)
+    py = int(player_y)
+    if direction == "UP":
+        return px - length // 2, py - length // 2 - padding, length, SHIELD_THICKNESS
+    if direction == "DOWN":
+        return px - length // 2, py + length // 2 + padding, length, SHIELD_THICKNESS
+    if direction == "LEFT":
+        return px - length // 2 - padding, py - length // 2, SHIELD_THICKNESS, length
+    return px + length // 2 + padding, py - length // 2, SHIELD_THICKNESS, length
+
+
+# ================================
+# Sprite shapes: one bitmask per row, bit i = column i
+# ================================
+def diamond_rows(size):
+    """Manhattan circle (blinking enemies and the chaser)"""
+    center = size // 2
+    return tuple(
+        sum(1 << i for i in range(size) if abs(i - center) + abs(j - center) <= center)
+        for j in range(size)
+    )
+
+
+def spiky_rows(size, teeth_count):
+    """Circle with `teeth_count` spikes; its corners are empty"""
+    center = (size - 1) / 2
+    rows = []
+    for j in range(size):
+        mask = 0
+        for i in range(size):
+            dx = i - center
+            dy = j - center
+            angle = math.atan2(dy, dx)
+            dist = (dx * dx + dy * dy) ** 0.5
+            if dist <= center * (0.7 + 0.3 * math.sin(angle * teeth_count)):
+                mask |= 1 << i
+        rows.append(mask)
+    return tuple(rows)
+
+
+# ================================
+# Per-mode configuration
+# ================================
+class LevelRules:
+    def __init__(self, name, lives, time_limit=None, target_score=None,
+                 first_foods=0, first_enemies=0, world=True, spawn_food=True,
+                 fixed_enemies=None, enemy_speed=0.4, enemy_activate=20,
+                 shield=False, chaser=False, show_score=True,
+                 signals=False, lives_lights=False, tilt_filter=TILT_FILTER,
+                 mode=None, times=None):
+        """
+        Everything the single game loop needs to know about one mode.
+        name: scene name used in logs and memory reports
+        lives: hits the player can take
+        time_limit: seconds before the level is lost (None = no countdown)
+        target_score: score that wins the level (None = decided by hooks)
+        first_foods / first_enemies: spawns on the starting tile
+        world: tiles come from the seeded world (False = hooks spawn them)
+        spawn_food: False for modes without food
+        fixed_enemies: overrides the per-tile enemy count
+        enemy_speed / enemy_activate: regular enemy tuning
+        shield: rotary shield available from the start
+        chaser: boss chaser that follows the player between tiles
+        show_score: draw the score HUD
+        signals: LEDs point at exits rich in food/enemies
+        lives_lights: LEDs show remaining lives
+        tilt_filter: (min_cutoff, beta) of the One-Euro tilt filter
+        mode / times: difficulty and levels passed of a normal level, for telemetry
+        """
+        self.name = name
+        self.lives = lives
+        self.time_limit = time_limit
+        self.target_score = target_score
+        self.first_foods = first_foods
+        self.first_enemies = first_enemies
+        self.world = world
+        self.spawn_food = spawn_food
+        self.fixed_enemies = fixed_enemies
+        self.enemy_speed = enemy_speed
+        self.enemy_activate = enemy_activate
+        self.shield = shield
+        self.chaser = chaser
+        self.show_score = show_score
+        self.signals = signals
+        self.lives_lights = lives_lights
+        self.tilt_filter = tilt_filter
+        self.mode = mode
+        self.times = times
+
+
+def tutorial_rules():
+    """No countdown, no lives lost; spawns and the win are scripted by hooks"""
+    return LevelRules("tutorial", lives=3, world=False, tilt_filter=TILT_FILTER_CALM)
+
+
+def normal_rules(mode, times):
+    time_limit, lives, target_score = level_params(mode, times)
+    speed, activate_dist = enemy_params(times)
+    return LevelRules(
+        "normal", lives, time_limit, target_score,
+        first_foods=10, first_enemies=1,
+        fixed_enemies=1 if times == 20 else None,
+        enemy_speed=speed, enemy_activate=activate_dist,
+        shield=times > 6, signals=times > 3,
+        mode=mode, times=times
+    )
+
+
+def boss_rules():
+    """Survive the time limit while the chaser follows you through every wall"""
+    return LevelRules(
+        "boss", BOSS_LIVES, BOSS_TIME_LIMIT,
+        spawn_food=False,
+        enemy_speed=BOSS_ENEMY_SPEED, enemy_activate=BOSS_ENEMY_ACTIVATE,
+        chaser=True, show_score=False, lives_lights=True,
+        tilt_filter=TILT_FILTER_FAST
+    )
@@ -0,0 +1,142 @@
+import time
+
+# IdleManager.py
+# Low-power waiting for screens where nothing moves until the player acts:
+#   nap()           dialogues, menus, name entry: time.sleep() until a button
+#                   event is queued or a timeout; the key scanner keeps running
+#   wait_motion()   end screen: panel off, light sleep until the ADXL345 sees
+#                   a shake or the button is pressed. With INT1 wired
+#                   (ACCEL_INT_PIN in code.py) the shake itself wakes the
+#                   board; without it, it wakes every MOTION_POLL seconds to
+#                   read the activity flag
+#   power_off()     boss endings: deep sleep; the button restarts code.py
+#   static_screen() render-on-change: no auto-refresh, callers refresh()
+# Only wait_motion() and power_off() lend the button pin to a PinAlarm, once
+# per wait. Without the alarm module they poll with time.sleep() instead;
+# while enabled is False (e.g. during a replay) the button pin is never lent.
+try:
+    import alarm
+except ImportError:
+    alarm = None
+
+NAP_SLICE = 0.02        # Seconds between button queue checks in nap()
+MOTION_POLL = 0.25      # Seconds between activity checks without an interrupt pin
+MOTION_THRESHOLD = 20   # ADXL345 activity threshold, 62.5 mg/LSB (20 = 1.25 g)
+
+
+class _StaticScreen:
+    def __init__(self, display):
+        self.display = display
+
+    def __enter__(self):
+        self.display.auto_refresh = False
+        self.display.refresh()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.display.auto_refresh = True
+        return False
+
+
+class IdleManager:
+    def __init__(self, display, button, sensor, motion_pin=None):
+        """
+        display: the SSD1306 display
+        button: ButtonInput; its pin is lent to a PinAlarm while asleep
+        sensor: the adafruit_adxl34x.ADXL345 itself (not the tilt filter)
+        motion_pin: board pin wired to the ADXL345 INT1 output, or None to
+            poll the activity flag every MOTION_POLL seconds instead
+        """
+        self.display = display
+        self.button = button
+        self.sensor = sensor
+        self.motion_pin = motion_pin
+        self.enabled = True
+        self.screen = _StaticScreen(display)
+
+    def static_screen(self):
+        """with idle.static_screen(): ... refresh() only after changing the screen"""
+        return self.screen
+
+    def refresh(self):
+        self.display.refresh(minimum_frames_per_second=0)
+
+    def nap(self, seconds):
+        """
+        Wait up to `seconds`, returning early once a button event is queued.
+        The scanner is never stopped, so no press is lost and nothing is
+        rebuilt; time.sleep() idles the CPU between checks.
+        """
+        if not self.enabled:
+            time.sleep(min(seconds, NAP_SLICE))
+            return
+        button = self.button
+        end = time.monotonic() + seconds
+        while not button.pending():
+            left = end - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, NAP_SLICE))
+
+    def wait_motion(self):
+        """Sleep with the panel off until the board is shaken or the button pressed"""
+        sensor = self.sensor
+        sensor.enable_motion_detection(threshold=MOTION_THRESHOLD)
+        sensor.events   # Clear an activity flag left from before
+        self.display.sleep()
+        # The pin is lent to the alarm once for the whole wait, not per check
+        pin = self.button.release_pin() if self.enabled and alarm is not None else None
+        pressed = False
+        try:
+            if pin is None:
+                self._poll_motion()
+            else:
+                pressed = self._sleep_until_motion(pin)
+        finally:
+            if pin is not None:
+                self.button.claim_pin(pressed)
+                self.button.update()   # The waking press is not meant for the next screen
+            self.display.wake()
+            sensor.disable_motion_detection()
+
+    def _poll_motion(self):
+        sensor = self.sensor
+        while True:
+            self.nap(MOTION_POLL)
+            if sensor.events["motion"]:
+                return
+            self.button.update()
+            if self.button.fell:
+                return
+
+    def _sleep_until_motion(self, pin):
+        """
+        Light sleep until INT1 rises, or between activity flag checks every
+        MOTION_POLL seconds without it. Returns True if the button woke us.
+        """
+        sensor = self.sensor
+        button_alarm = alarm.pin.PinAlarm(pin, value=False, pull=True)
+        motion_alarm = None
+        if self.motion_pin is not None:
+            motion_alarm = alarm.pin.PinAlarm(self.motion_pin, value=True)
+        while True:
+            if motion_alarm is None:
+                woke = alarm.light_sleep_until_alarms(
+                    alarm.time.TimeAlarm(monotonic_time=time.monotonic() + MOTION_POLL),
+                    button_alarm
+                )
+            else:
+                woke = alarm.light_sleep_until_alarms(motion_alarm, button_alarm)
+            if isinstance(woke, alarm.pin.PinAlarm) and woke.pin == pin:
+                return True
+            if sensor.events["motion"]:
+                return False
+
+    def power_off(self):
+        """Deep sleep for good; pressing the button boots code.py again"""
+        self.display.sleep()
+        pin = self.button.release_pin()
+        if alarm is None or pin is None:
+            while True:
+                time.sleep(1)
+        alarm.exit_and_deep_sleep_until_alarms(alarm.pin.PinAlarm(pin, value=False, pull=True))
@@ -0,0 +1,274 @@
+import struct
+import time
+
+import Log
+
+# InputTrace.py
+# Binary trace of one play session:
+#   header:  b"DVR1" + <IbbB>  seed, mode, times, game (0 normal, 1 boss)
+#   b"F" + <hhhH>  frame: filtered ax, ay, az in 1/100 m/s^2, ms since last frame
+#                  (0 for the first one: dialogue and setup before it are not timed)
+#   b"R" + <b>     rotary step returned by update()
+#   b"B" + <B>     button events (1 = fell, 2 = rose, 4 = long press)
+# Rotary and button records belong to the frame written before them; the
+# ones ahead of the first frame come from the dialogue before the level.
+MAGIC = b"DVR1"
+HEADER_FMT = "<4sIbbB"
+FRAME_FMT = "<hhhH"
+GAME_NORMAL = 0
+GAME_BOSS = 1
+
+
+class ReplayFinished(Exception):
+    """Raised when a replayed game asks for a frame past the end of the trace"""
+    pass
+
+
+def _quantize(v):
+    return max(-32768, min(32767, int(round(v * 100))))
+
+
+# ================================
+# Recording
+# ================================
+class TraceRecorder:
+    def __init__(self, path, seed, mode=0, times=0, game=GAME_NORMAL, buffer_size=512):
+        """
+        path: output file (flash needs to be writable, same as bit.txt)
+        seed: world seed of the recorded game
+        Records are packed into a preallocated buffer and written in chunks.
+        """
+        self.file = open(path, "wb")
+        self.file.write(struct.pack(HEADER_FMT, MAGIC, seed, mode, times, game))
+        self.buf = bytearray(buffer_size)
+        self.pos = 0
+        self.frames = 0
+        self.t0 = None     # Set by the first frame, once the level is running
+        self.last_ms = 0
+        self.now = 0.0     # Frame clock seen by the game
+
+    def clock(self):
+        """Time of the current frame, quantized to what the trace stores"""
+        return self.now
+
+    def frame(self, ax, ay, az):
+        """Start a new frame; returns the values the game must use"""
+        if self.t0 is None:
+            self.t0 = time.monotonic()
+        ms = int((time.monotonic() - self.t0) * 1000)
+        dt = min(ms - self.last_ms, 0xFFFF)
+        self.last_ms += dt
+        self.now = self.last_ms / 1000
+
+        qx, qy, qz = _quantize(ax), _quantize(ay), _quantize(az)
+        self._reserve(9)
+        self.buf[self.pos] = 0x46  # "F"
+        struct.pack_into(FRAME_FMT, self.buf, self.pos + 1, qx, qy, qz, dt)
+        self.pos += 9
+        self.frames += 1
+        return qx / 100, qy / 100, qz / 100
+
+    def event(self, tag, value):
+        self._reserve(2)
+        self.buf[self.pos] = tag
+        self.buf[self.pos + 1] = value & 0xFF
+        self.pos += 2
+
+    def close(self):
+        if self.file is None:
+            return
+        self._flush()
+        self.file.close()
+        self.file = None
+        Log.info("Trace recorded: %d frames", self.frames)
+
+    def _reserve(self, n):
+        if self.pos + n > len(self.buf):
+            self._flush()
+
+    def _flush(self):
+        if self.pos:
+            self.file.write(memoryview(self.buf)[:self.pos])
+            self.file.flush()
+            self.pos = 0
+
+
+class RecordingAccelerometer:
+    def __init__(self, accel, recorder):
+        self.accel = accel
+        self.recorder = recorder
+
+    def read_filtered(self):
+        ax, ay, az = self.accel.read_filtered()
+        return self.recorder.frame(ax, ay, az)
+
+    def tune(self, min_cutoff, beta):
+        self.accel.tune(min_cutoff, beta)
+
+
+class RecordingRotary:
+    def __init__(self, rotary, recorder):
+        self.rotary = rotary
+        self.recorder = recorder
+
+    def update(self):
+        step = self.rotary.update()
+        if step != 0:
+            self.recorder.event(0x52, max(-128, min(127, step)))  # "R"
+        return step
+
+    def drain(self):
+        # Dropped turns never reach the game, so the trace does not hold them
+        self.rotary.drain()
+
+
+class RecordingButton:
+    def __init__(self, button, recorder):
+        self.button = button
+        self.recorder = recorder
+
+    def update(self):
+        self.button.update()
+        edges = ((1 if self.button.fell else 0) | (2 if self.button.rose else 0)
+                 | (4 if self.button.long_press else 0))
+        if edges:
+            self.recorder.event(0x42, edges)  # "B"
+
+    @property
+    def fell(self):
+        return self.button.fell
+
+    @property
+    def rose(self):
+        return self.button.rose
+
+    @property
+    def long_press(self):
+        return self.button.long_press
+
+    @property
+    def value(self):
+        return self.button.value
+
+
+# ================================
+# Replay
+# ================================
+class TraceReplayer:
+    def __init__(self, path):
+        """Load a trace recorded by TraceRecorder"""
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, self.seed, self.mode, self.times, self.game = struct.unpack_from(HEADER_FMT, data, 0)
+        if magic != MAGIC:
+            raise ValueError("not an input trace: " + path)
+        self.data = data
+        self.pos = struct.calcsize(HEADER_FMT)
+
+        self.frames = 0
+        self.ms = 0
+        self.now = 0.0     # Same ms / 1000 as the recorder, so countdowns end on the same frame
+        self.rotary_queue = []
+        self.button_queue = []
+        self.finished = False
+        self._queue_events()   # Presses and turns made before the first frame
+
+        # Frame time comparison: recorded vs. measured during replay
+        self.worst_recorded_ms = 0
+        self.worst_replay_ms = 0
+        self.last_real = None
+
+    def clock(self):
+        return self.now
+
+    def next_frame(self):
+        data = self.data
+        if self.pos >= len(data) or data[self.pos] != 0x46:
+            raise ReplayFinished()
+
+        ax, ay, az, dt = struct.unpack_from(FRAME_FMT, data, self.pos + 1)
+        self.pos += 9
+        self.frames += 1
+        self.ms += dt
+        self.now = self.ms / 1000
+        self.worst_recorded_ms = max(self.worst_recorded_ms, dt)
+
+        real = time.monotonic()
+        if self.last_real is not None:
+            self.worst_replay_ms = max(self.worst_replay_ms, int((real - self.last_real) * 1000))
+        self.last_real = real
+
+        self._queue_events()
+        return ax / 100, ay / 100, az / 100
+
+    def _queue_events(self):
+        """Queue the rotary and button records up to the next frame"""
+        data = self.data
+        while self.pos < len(data) and data[self.pos] != 0x46:
+            tag = data[self.pos]
+            value = data[self.pos + 1]
+            if tag == 0x52:
+                self.rotary_queue.append(value - 256 if value > 127 else value)
+            else:
+                self.button_queue.append(value)
+            self.pos += 2
+        self.finished = self.pos >= len(data)
+
+    def report(self):
+        Log.info("Replayed %d frames", self.frames)
+        Log.info("Worst frame recorded: %d ms", self.worst_recorded_ms)
+        Log.info("Worst frame replayed: %d ms", self.worst_replay_ms)
+
+
+class ReplayAccelerometer:
+    def __init__(self, replayer):
+        self.replayer = replayer
+
+    def read_filtered(self):
+        return self.replayer.next_frame()
+
+    def tune(self, min_cutoff, beta):
+        pass   # The trace already holds the filtered tilt
+
+
+class ReplayRotary:
+    def __init__(self, replayer):
+        self.replayer = replayer
+
+    def update(self):
+        queue = self.replayer.rotary_queue
+        return queue.pop(0) if queue else 0
+
+    def drain(self):
+        pass   # Turns dropped while recording were never written
+
+
+class ReplayButton:
+    def __init__(self, replayer):
+        self.replayer = replayer
+        self.edges = 0
+
+    def update(self):
+        queue = self.replayer.button_queue
+        if queue:
+            self.edges = queue.pop(0)
+        elif self.replayer.finished:
+            self.edges = 1   # Past the end of the trace: click through dialogues
+        else:
+            self.edges = 0
+
+    @property
+    def fell(self):
+        return bool(self.edges & 1)
+
+    @property
+    def rose(self):
+        return bool(self.edges & 2)
+
+    @property
+    def long_press(self):
+        return bool(self.edges & 4)
+
+    @property
+    def value(self):
+        return not self.fell
@@ -0,0 +1,130 @@
+import time
+
+import Log
+
+# LatencyProbe.py
+# End-to-end input latency: from the ADXL345 sample that starts a tilt to
+# the refresh that shows the ball on another pixel.
+#   read     raw sample read over I2C (the sample time is the start of it)
+#   filter   read_filtered() returned
+#   physics  step_ball() returned
+#   tile     ball_tile moved to another pixel (may be frames later)
+#   refresh  display.refresh() returned, the pixel is on the panel
+# Stage times are cumulative from the sample. Used by code.py when
+# LATENCY_PROBE is set and by tools/latency_bench.py on the host.
+READ = 0
+FILTER = 1
+PHYSICS = 2
+TILE = 3
+REFRESH = 4
+STAGES = ("read", "filter", "physics", "tile", "refresh")
+MAX_FRAMES = 50   # Give up when the ball never moves (e.g. pushed against a wall)
+
+
+class ProbedSensor:
+    def __init__(self, sensor, probe):
+        """Wraps the accelerometer so the probe sees every raw sample and its read time"""
+        self.sensor = sensor
+        self.probe = probe
+
+    @property
+    def acceleration(self):
+        probe = self.probe
+        start = probe.clock()
+        sample = self.sensor.acceleration
+        probe.sample(start, sample)
+        return sample
+
+
+class LatencyProbe:
+    def __init__(self, threshold=2.0, size=16, clock=time.monotonic_ns):
+        """
+        threshold: raw tilt change (m/s^2, x or y) between two samples that
+            starts a measurement; ignored while one is running
+        size: measurements kept for report()
+        clock: time source in ns
+        """
+        self.threshold = threshold
+        self.size = size
+        self.clock = clock
+        self.last = None
+        self.start = 0
+        self.stamps = [0] * len(STAGES)
+        self.armed = False
+        self.frames = 0
+        self.px = 0          # Ball pixel at the end of the previous frame
+        self.py = 0
+        self.origin = None   # Ball pixel when the measured sample was taken
+        self.results = []   # (frames, stamps in us) per finished measurement
+
+    def wrap(self, sensor):
+        return ProbedSensor(sensor, self)
+
+    def begin(self, px, py):
+        """A level starts with the ball at pixel (px, py)"""
+        self.px = px
+        self.py = py
+        self.armed = False
+
+    def sample(self, start, acceleration):
+        """A raw sample was read (called by ProbedSensor)"""
+        now = self.clock()
+        last = self.last
+        self.last = acceleration
+        if self.armed:
+            self.frames += 1
+            if self.frames > MAX_FRAMES:
+                self.armed = False
+            return
+        if last is None:
+            return
+        if (abs(acceleration[0] - last[0]) >= self.threshold
+                or abs(acceleration[1] - last[1]) >= self.threshold):
+            self.armed = True
+            self.frames = 1
+            self.origin = None
+            self.start = start
+            self.stamps[READ] = now - start
+
+    def mark(self, stage):
+        """Stage reached in the frame of the sample"""
+        if self.armed and self.frames == 1:
+            self.stamps[stage] = self.clock() - self.start
+
+    def moved(self, px, py):
+        """
+        Called once per frame with the ball's pixel position. Returns True when
+        it left the pixel it had at the sample: refresh, then call done().
+        """
+        prev_x, prev_y = self.px, self.py
+        self.px, self.py = px, py
+        if not self.armed:
+            return False
+        if self.origin is None:
+            self.origin = (prev_x, prev_y)
+        if px == self.origin[0] and py == self.origin[1]:
+            return False
+        self.stamps[TILE] = self.clock() - self.start
+        return True
+
+    def done(self):
+        """The refresh showing the moved ball has finished"""
+        self.stamps[REFRESH] = self.clock() - self.start
+        if len(self.results) == self.size:
+            self.results.pop(0)
+        self.results.append((self.frames, [t // 1000 for t in self.stamps]))
+        self.armed = False
+
+    def report(self):
+        """Average and worst of every stage over the kept measurements"""
+        n = len(self.results)
+        if not n:
+            Log.info("Latency: no tilt step measured")
+            return
+        frames = [r[0] for r in self.results]
+        Log.info("Latency: %d steps, %d-%d frames until the ball moved",
+                 n, min(frames), max(frames))
+        for i, name in enumerate(STAGES):
+            values = [r[1][i] for r in self.results]
+            Log.info("  %-8s avg %6.1f ms  worst %6.1f ms",
+                     name, sum(values) / n / 1000, max(values) / 1000)
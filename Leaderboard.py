@@ -0,0 +1,93 @@
+import json
+import os
+
+import Log
+
+# Leaderboard.py
+# Top-N survival times of the endless level. Read from flash once at boot and
+# kept in RAM best first; the file (a JSON list of {"name", "time"}) is only
+# rewritten when an entry actually changes.
+
+
+def insert_index(times, value):
+    """
+    Where `value` goes in `times`, sorted best (largest) first: after every
+    entry that is >= value, so an equal older time keeps its place.
+    """
+    lo = 0
+    hi = len(times)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if value > times[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class Leaderboard:
+    def __init__(self, path, size=3, empty_name="__"):
+        """
+        path: JSON file on flash (missing file = empty table)
+        size: entries kept; empty slots hold time 0
+        """
+        self.path = path
+        self.size = size
+        self.empty_name = empty_name
+        self.entries = []    # {"name", "time"}, best first, always `size` long
+        self.times = []      # Times of entries, for insert_index()
+        self.threshold = 0   # Time to beat to get on the table
+        self.load()
+
+    def load(self):
+        entries = []
+        try:
+            with open(self.path, "r") as f:
+                for e in json.load(f):
+                    entries.append({"name": e.get("name", self.empty_name), "time": e.get("time", 0)})
+        except OSError:
+            pass
+        except Exception as e:
+            Log.error("read %s error: %s", self.path, e)
+            entries = []
+
+        self.entries = []
+        self.times = []
+        for e in sorted(entries, key=lambda e: e["time"], reverse=True)[:self.size]:
+            self.entries.append(e)
+            self.times.append(e["time"])
+        while len(self.entries) < self.size:
+            self.entries.append({"name": self.empty_name, "time": 0})
+            self.times.append(0)
+        self.threshold = self.times[-1]
+
+    def qualifies(self, survived_time):
+        """True if this time would enter the table"""
+        return survived_time > self.threshold
+
+    def insert(self, name, survived_time):
+        """Add an entry if it qualifies; returns its rank (0 = best) or None"""
+        if not self.qualifies(survived_time):
+            return None
+        i = insert_index(self.times, survived_time)
+        self.entries.insert(i, {"name": name, "time": survived_time})
+        self.times.insert(i, survived_time)
+        self.entries.pop()
+        self.times.pop()
+        self.threshold = self.times[-1]
+        self.save()
+        return i
+
+    def save(self):
+        """Overwrite the file with the current table"""
+        try:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            with open(self.path, "w") as f:
+                json.dump(self.entries, f)
+                f.flush()
+            Log.debug("Saved high_scores: %s", self.entries)
+        except Exception as e:
+            Log.error("save high_scores error: %s", e)
@@ -0,0 +1,503 @@
+import time
+import displayio
+
+from Enemy import Enemy
+from Food import Food
+from SignalController import SignalController, WHITE
+from WallUtils import WallUtils
+from GameRules import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, ENEMY_SIZE, INVINCIBLE_TIME,
+    BLINK_INTERVAL, CHASER_SPEED, CHASER_ACTIVATE,
+    step_ball, check_direction_collision, rotate_shield
+)
+from TileGenerator import TileGenerator, enter_next_tile
+from WorldGenerator import WorldGenerator
+from MemoryMonitor import mem_free
+from Profiler import FrameMeter
+from LatencyProbe import FILTER, PHYSICS
+import DirtyPages
+import Profiler
+import Log
+
+# Level.py
+# The one game loop behind the tutorial, normal and boss levels. Whatever it
+# reads or drives comes from a Machine, so code.py runs it on the board and
+# tools/simulate.py runs the very same loop headless with stub devices.
+FRAME_SLEEP = 0.015   # Pause at the end of every frame
+
+
+class Machine:
+    def __init__(self, display, pixels, accel, rotary, button, mem, gc_policy,
+                 clock=time.monotonic, sleep=time.sleep, telemetry=None,
+                 latency=None, max_foods=20, max_enemies=3):
+        """
+        Devices and services shared by every level of a session.
+        display: root_group / refresh() (the SSD1306 or a stub)
+        pixels: direction -> one-LED NeoPixel strip
+        accel: filtered tilt, read_filtered() and tune()
+        rotary / button: RotaryInput / ButtonInput or their trace wrappers
+        mem / gc_policy: MemoryMonitor and GcPolicy of the session
+        clock: frame clock in seconds; sleep: end-of-frame pause
+        telemetry / latency: optional Telemetry and LatencyProbe
+        max_foods / max_enemies: Food / Enemy objects allocated up front
+        """
+        self.display = display
+        self.pixels = pixels
+        self.accel = accel
+        self.rotary = rotary
+        self.button = button
+        self.mem = mem
+        self.gc_policy = gc_policy
+        self.clock = clock
+        self.sleep = sleep
+        self.telemetry = telemetry
+        self.latency = latency
+
+        # FPS / worst frame / free heap overlay, kept across levels once toggled on
+        self.perf_overlay = False
+        # Long-lived objects are allocated once at boot, before the heap fragments
+        self.food_pool = [Food() for _ in range(max_foods)]
+        self.enemy_pool = [new_enemy() for _ in range(max_enemies)]
+
+    def safe_point(self):
+        """Nothing on screen is moving: print deferred logs and collect garbage"""
+        Log.flush()
+        self.gc_policy.safe_point()
+
+
+def clear(group):
+    """Clear all items from a display group"""
+    for i in range(len(group)):
+        group.pop()
+    return
+
+
+def place_foods(group, food_pool, positions):
+    """
+    Move pooled Food objects onto a new tile instead of allocating new ones.
+    food_pool: every Food created so far (grows only when needed)
+    Returns: list of foods active on the new tile
+    """
+    while len(food_pool) < len(positions):
+        food_pool.append(Food())
+
+    foods = []
+    for food_obj, (fx, fy) in zip(food_pool, positions):
+        food_obj.place(fx, fy, group)
+        foods.append(food_obj)
+
+    # Hide pooled foods this tile does not need
+    for i in range(len(positions), len(food_pool)):
+        food_pool[i].eat()
+    return foods
+
+
+def new_enemy():
+    """A hidden regular enemy for the pool"""
+    return Enemy(None, 0, 0, size=ENEMY_SIZE, style="spiky_circle", teeth_count=12)
+
+
+def place_enemies(group, enemy_pool, positions, speed, activate_dist):
+    """
+    Move pooled Enemy objects onto a new tile, asleep, with the level's tuning.
+    enemy_pool: every regular Enemy created so far (grows only when needed)
+    Returns: list of enemies active on the new tile
+    """
+    while len(enemy_pool) < len(positions):
+        enemy_pool.append(new_enemy())
+
+    enemies = []
+    for e, (ex, ey) in zip(enemy_pool, positions):
+        e.place(ex, ey, group, speed, activate_dist)
+        enemies.append(e)
+
+    # Hide pooled enemies this tile does not need
+    for i in range(len(positions), len(enemy_pool)):
+        enemy_pool[i].remove()
+    return enemies
+
+
+class Level:
+    def __init__(self, machine, rules, sound=False, seed=None, on_tile=None, on_hit=None):
+        """
+        One level of play. Tutorial, normal and boss levels all run the same
+        loop; what differs between them is described by a LevelRules object.
+        machine: Machine with the devices the level reads and drives
+        seed: world seed (None picks a random one)
+        on_tile(level, tile_count): scripted spawns when rules.world is False,
+            return True to end the level as a win
+        on_hit(level): replaces losing a life when an enemy touches the player
+        """
+        self.machine = machine
+        machine.mem.scene(rules.name)
+        machine.accel.tune(*rules.tilt_filter)
+        self.rules = rules
+        self.sound = sound
+        self.on_tile = on_tile
+        self.on_hit = on_hit
+
+        self.group = displayio.Group()
+        self.wall_utils = WallUtils()
+        self.lives = rules.lives
+        self.score = 0
+        self.tile_count = 0
+        self.remaining_time = rules.time_limit
+        self.survived = 0
+        self.meter = None      # FrameMeter of run(), summarized by telemetry
+        self.tile_data = {}    # Food/enemy counts behind each exit
+
+        self.foods = []        # Food items currently on screen
+        self.enemies = []      # Regular enemies on this tile
+        self.chaser = None
+        self.chaser_obj = None  # Boss chaser, placed again on every tile
+        self.shield_on = rules.shield
+        self.shield_dir = "UP"
+
+        # Light controllers
+        self.controllers = {d: SignalController(p) for d, p in machine.pixels.items()}
+
+        group = self.group
+        self.wall_utils.draw_lives(group, self.lives)
+        if rules.time_limit is not None:
+            self.wall_utils.draw_countdown(group, rules.time_limit)
+
+        # Create ball bitmap
+        bitmap = displayio.Bitmap(BALL_SIZE, BALL_SIZE, 1)
+        palette = displayio.Palette(1)
+        palette[0] = 0xFFFFFF
+        self.ball_tile = displayio.TileGrid(bitmap, pixel_shader=palette)
+        group.append(self.ball_tile)
+
+        # Initial ball state
+        self.x = SCREEN_WIDTH // 2
+        self.y = SCREEN_HEIGHT // 2
+
+        # First tile
+        self.tile_gen = None
+        if rules.world:
+            # Seeded world: every tile is reproducible from the printed seed
+            world = WorldGenerator(seed)
+            Log.info("World seed: %d", world.seed)
+            self.tile_gen = TileGenerator(world, spawn_food=rules.spawn_food,
+                                          fixed_enemies=rules.fixed_enemies)
+            layout = self.tile_gen.first(self.x, self.y, rules.first_foods, rules.first_enemies)
+            self.allowed_dirs = layout["allowed_dirs"]
+        else:
+            self.allowed_dirs = self.wall_utils.generate_random_directions("UP")
+        self.wall_utils.draw_block_walls(group, self.allowed_dirs)
+
+        if rules.show_score:
+            self.wall_utils.draw_score(group, initial_score=0)
+        self.wall_utils.draw_perf(group, machine.perf_overlay, DirtyPages.tracker is not None)
+        if self.shield_on:
+            self.wall_utils.draw_player_shields(group, self.x, self.y, [self.shield_dir])
+        if rules.chaser:
+            self.spawn_chaser(20, 20)
+        if rules.world:
+            self.apply_layout(layout)
+        if rules.lives_lights:
+            # Initial white light for all directions
+            for ctrl in self.controllers.values():
+                ctrl.set(WHITE)
+
+        # Start the level with an empty heap of garbage
+        machine.gc_policy.enter_gameplay()
+
+    # ----------------------------------------
+    # Spawning
+    # ----------------------------------------
+    def spawn_foods(self, positions):
+        self.foods = place_foods(self.group, self.machine.food_pool, positions)
+
+    def spawn_enemies(self, positions):
+        rules = self.rules
+        self.enemies = place_enemies(self.group, self.machine.enemy_pool, positions,
+                                     rules.enemy_speed, rules.enemy_activate)
+
+    def spawn_chaser(self, x, y):
+        if self.chaser_obj is None:
+            self.chaser_obj = Enemy(None, 0, 0, size=ENEMY_SIZE, speed=CHASER_SPEED,
+                                    activate_dist=CHASER_ACTIVATE, style="blink_circle")
+        self.chaser_obj.place(x, y, self.group)
+        self.chaser = self.chaser_obj
+
+    def clear_tile(self):
+        """Take the food and enemies of the tile being left off the screen"""
+        for food_obj in self.foods:
+            food_obj.eat()
+        self.foods = []
+        for e in self.enemies:
+            e.remove()
+        self.enemies = []
+        if self.chaser is not None:
+            self.chaser.remove()
+        self.chaser = None
+
+    def apply_layout(self, layout):
+        """Swap in a tile layout built by the TileGenerator"""
+        self.spawn_foods(layout["foods"])
+        self.spawn_enemies(layout["enemies"])
+        self.allowed_dirs = layout["allowed_dirs"]
+        self.tile_data = layout["tile_data"]
+        # Light indicators for the exits of the new tile
+        if self.rules.signals:
+            SignalController.direction_signal(layout["food_max_dirs"], layout["enemy_max_dirs"],
+                                              self.controllers)
+
+    def enter_tile(self, hit_dir):
+        """Move to the next tile; returns True if a hook ended the level"""
+        self.tile_count += 1
+        self.clear_tile()
+        if self.rules.chaser:
+            # The chaser follows the player through the wall
+            self.spawn_chaser(*enter_next_tile(hit_dir, self.x, self.y))
+
+        if self.tile_gen is not None:
+            self.apply_layout(self.tile_gen.take(hit_dir))
+        else:
+            if self.on_tile is not None and self.on_tile(self, self.tile_count):
+                return True
+            self.allowed_dirs = self.wall_utils.generate_random_directions(hit_dir)
+        self.wall_utils.draw_block_walls(self.group, self.allowed_dirs)
+        # The old tile's objects are garbage now and the screen just changed
+        self.machine.safe_point()
+        return False
+
+    def lose_life(self):
+        """Returns True when the last life is gone"""
+        self.lives -= 1
+        if self.rules.lives_lights:
+            SignalController.update_lights_by_lives(self.lives, self.controllers)
+        if self.lives == 0:
+            return True
+        self.wall_utils.draw_lives(self.group, self.lives)
+        return False
+
+    def toggle_perf_overlay(self):
+        machine = self.machine
+        machine.perf_overlay = not machine.perf_overlay
+        self.wall_utils.show_perf(machine.perf_overlay)
+
+    # ----------------------------------------
+    # Main loop
+    # ----------------------------------------
+    def run(self):
+        """Play until the level ends; returns "win", "timeout" or "dead" """
+        machine = self.machine
+        rules = self.rules
+        group = self.group
+        wall_utils = self.wall_utils
+        ball_tile = self.ball_tile
+        tile_gen = self.tile_gen
+        time_limit = rules.time_limit
+        target_score = rules.target_score
+        display = machine.display
+        read_accel = machine.accel.read_filtered
+        rotary = machine.rotary
+        button = machine.button
+        frame_clock = machine.clock
+        frame_sleep = machine.sleep
+        mem_frame = machine.mem.frame
+        meter = self.meter = FrameMeter()
+        probe = machine.latency
+        pages = DirtyPages.tracker
+
+        # Span tracing is picked once here: while it is off, a stage costs one
+        # None test and no call. Each lap covers the frame since the last one.
+        tracer = Profiler.tracer
+        if tracer is not None:
+            lap = tracer.lap
+            (span_input, span_tile, span_food, span_enemies, span_chaser,
+             span_lights, span_sleep) = tracer.laps(
+                "input", "tile", "food", "enemies", "chaser", "lights", "sleep")
+
+        x = self.x
+        y = self.y
+        vx = 0.0
+        vy = 0.0
+        allowed_dirs = self.allowed_dirs
+        shield_list = wall_utils.shield_list
+        last_remaining = time_limit
+        invincible = False
+        invincible_end_time = 0
+        blink_state = True
+        blink_timer = 0
+
+        display.root_group = group
+        rotary.drain()  # Turns made during dialogues must not spin the shield
+        if probe is not None:
+            probe.begin(int(x), int(y))
+        start_time = frame_clock()
+
+        while True:
+            mem_frame()
+            now = frame_clock()
+
+            # --- Long-press D9: toggle the performance overlay ---
+            button.update()
+            if button.long_press:
+                self.toggle_perf_overlay()
+            if meter.tick(now) and machine.perf_overlay:
+                wall_utils.update_perf(meter.fps, meter.worst_ms, mem_free() // 1024)
+                if pages is not None:
+                    wall_utils.update_i2c(*pages.take_window())
+
+            # --- Update countdown ---
+            if time_limit is not None:
+                remaining_time = max(0, int(time_limit - (now - start_time)))
+                if remaining_time != last_remaining:
+                    last_remaining = remaining_time
+                    self.remaining_time = remaining_time
+                    wall_utils.update_countdown(remaining_time)
+                if remaining_time <= 0:
+                    return self.finish("timeout", start_time)
+
+            # --- Invincibility blink logic ---
+            if invincible:
+                if now >= invincible_end_time:
+                    invincible = False
+                    ball_tile.hidden = False  # Restore visibility
+                elif now - blink_timer > BLINK_INTERVAL:
+                    blink_timer = now
+                    blink_state = not blink_state
+                    ball_tile.hidden = blink_state
+
+            # --- Update speed & position ---
+            ax, ay, az = read_accel()
+            if probe is not None:
+                probe.mark(FILTER)
+            x, y, vx, vy = step_ball(x, y, vx, vy, ax, ay)
+            if probe is not None:
+                probe.mark(PHYSICS)
+            ball_tile.x = int(x)
+            ball_tile.y = int(y)
+            if probe is not None and probe.moved(ball_tile.x, ball_tile.y):
+                # Push the moved ball out now instead of at the next auto-refresh
+                display.refresh(minimum_frames_per_second=0)
+                probe.done()
+            if tracer is not None:
+                lap(span_input)
+
+            # --- Check for collisions with walls ---
+            hit_dir = check_direction_collision(x, y)
+            if hit_dir and hit_dir in allowed_dirs:
+                # Allowed direction: move to next tile
+                x, y = enter_next_tile(hit_dir, x, y)
+                ball_tile.x = int(x)
+                ball_tile.y = int(y)
+                self.x = x
+                self.y = y
+                if self.enter_tile(hit_dir):
+                    return self.finish("win", start_time)
+                allowed_dirs = self.allowed_dirs
+                display.root_group = group  # Hooks may have shown dialogue
+            elif tile_gen is not None:
+                # Idle frame: build the next tiles ahead of time
+                tile_gen.prefetch_step()
+            if tracer is not None:
+                lap(span_tile)
+
+            # Check target score reached
+            if target_score is not None and self.score >= target_score:
+                return self.finish("win", start_time)
+
+            # Check if player collects food
+            foods = self.foods
+            i = 0
+            while i < len(foods):
+                food_obj = foods[i]
+                if food_obj.check_collision(x, y, BALL_SIZE):
+                    self.score += food_obj.points
+                    wall_utils.update_score(self.score)
+                    foods.pop(i)
+                else:
+                    i += 1
+            if tracer is not None:
+                lap(span_food)
+
+            # Player shield logic
+            if self.shield_on:
+                move = rotary.update()
+                if move != 0:  # Rotate by every detent turned since last frame
+                    self.shield_dir = rotate_shield(self.shield_dir, move)
+                    wall_utils.draw_player_shields(group, x, y, [self.shield_dir])
+                wall_utils.update_shields_position(x, y)
+
+            # Enemy logic
+            enemies = self.enemies
+            i = 0
+            while i < len(enemies):
+                e = enemies[i]
+                e.check_activation(x, y)
+                e.update(x, y)
+
+                # Check if enemy hits shield
+                if shield_list and e.check_hit_shield(shield_list):
+                    e.remove()
+                    enemies.pop(i)
+                    continue
+                i += 1
+
+                if invincible or not e.has_collision(x, y, BALL_SIZE):
+                    continue
+                self.x = x
+                self.y = y
+                if self.on_hit is not None:
+                    self.on_hit(self)
+                    display.root_group = group
+                    continue
+                if self.lose_life():
+                    return self.finish("dead", start_time)
+                # Trigger invincibility
+                invincible = True
+                invincible_end_time = frame_clock() + INVINCIBLE_TIME
+                blink_timer = frame_clock()
+                blink_state = False
+                ball_tile.hidden = True  # Start blinking immediately
+            if tracer is not None:
+                lap(span_enemies)
+
+            # Chaser logic
+            chaser = self.chaser
+            if chaser is not None:
+                chaser.check_activation(x, y)
+                chaser.update(x, y)
+                if not invincible and chaser.has_collision(x, y, BALL_SIZE):
+                    if self.lose_life():
+                        return self.finish("dead", start_time)
+                    invincible = True
+                    invincible_end_time = frame_clock() + INVINCIBLE_TIME
+                    blink_timer = frame_clock()
+                    blink_state = False
+                    ball_tile.hidden = True
+            if tracer is not None:
+                lap(span_chaser)
+
+            # Push LED changes once per frame
+            SignalController.render_all(self.controllers, now)
+
+            # What the coming auto-refresh has to send
+            if pages is not None:
+                pages.end_frame(group)
+            if tracer is not None:
+                lap(span_lights)
+
+            frame_sleep(FRAME_SLEEP)
+            if tracer is not None:
+                lap(span_sleep)
+
+    def finish(self, outcome, start_time):
+        machine = self.machine
+        clock = machine.clock
+        self.survived = clock() - start_time
+        telemetry = machine.telemetry
+        if telemetry is not None:
+            rules = self.rules
+            telemetry.level(rules.name, outcome, rules.mode, rules.times,
+                            rules.lives - self.lives, self.score, self.survived,
+                            self.meter.average_ms(), self.meter.peak_ms())
+        SignalController.render_all(self.controllers, clock())
+        machine.gc_policy.leave_gameplay()
+        clear(self.group)
+        machine.mem.scene("dialogue")
+        return outcome
@@ -0,0 +1,108 @@
+import time
+from array import array
+
+# Log.py
+# Leveled logging that replaces print() in the game code:
+#     Log.info("World seed: %d", seed)
+# The message is only formatted when it is printed. configure() swaps the
+# functions below the active level for a do-nothing stub, so a disabled
+# Log.debug(...) costs one call and nothing else. Every enabled record also
+# lands in a preallocated ring buffer of recent events (see recent()).
+# With deferred=True nothing is printed in the game loop: records wait in
+# the ring until flush() is called at a safe point (tile crossing, dialogue).
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "D", INFO: "I", WARN: "W", ERROR: "E"}
+
+RING_SIZE = 64
+_times = array("L", [0] * RING_SIZE)     # ms since boot
+_levels = bytearray(RING_SIZE)
+_messages = [None] * RING_SIZE
+_args = [None] * RING_SIZE
+_pos = 0
+_count = 0
+_pending = 0     # Records not printed yet (deferred mode)
+_deferred = False
+_t0 = time.monotonic()
+
+
+def _format(i):
+    msg = _messages[i]
+    args = _args[i]
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = msg + " " + " ".join(str(a) for a in args)
+    return "{:>8} {} {}".format(_times[i], LEVEL_NAMES.get(_levels[i], "?"), msg)
+
+
+def _record(level, msg, args):
+    global _pos, _count, _pending
+    i = _pos
+    _times[i] = int((time.monotonic() - _t0) * 1000) & 0xFFFFFFFF
+    _levels[i] = level
+    _messages[i] = msg
+    _args[i] = args
+    _pos = (i + 1) % RING_SIZE
+    if _count < RING_SIZE:
+        _count += 1
+    if _deferred:
+        if _pending < RING_SIZE:
+            _pending += 1
+    else:
+        print(_format(i))
+
+
+def _off(msg, *args):
+    pass
+
+
+def _debug(msg, *args):
+    _record(DEBUG, msg, args)
+
+
+def _info(msg, *args):
+    _record(INFO, msg, args)
+
+
+def _warn(msg, *args):
+    _record(WARN, msg, args)
+
+
+def _error(msg, *args):
+    _record(ERROR, msg, args)
+
+
+debug = _off
+info = _info
+warn = _warn
+error = _error
+
+
+def configure(level=INFO, deferred=False):
+    """Pick the lowest level that is recorded and whether printing waits for flush()"""
+    global debug, info, warn, error, _deferred
+    debug = _debug if level <= DEBUG else _off
+    info = _info if level <= INFO else _off
+    warn = _warn if level <= WARN else _off
+    error = _error if level <= ERROR else _off
+    if _deferred and not deferred:
+        flush()
+    _deferred = deferred
+
+
+def flush():
+    """Print the records held back in deferred mode; call where a pause is invisible"""
+    global _pending
+    n = _pending
+    _pending = 0
+    for k in range(n):
+        print(_format((_pos - n + k) % RING_SIZE))
+
+
+def recent():
+    """Formatted recent records, oldest first (e.g. for a post-mortem dump)"""
+    return [_format((_pos - _count + k) % RING_SIZE) for k in range(_count)]
@@ -0,0 +1,178 @@
+import gc
+import time
+
+import Log
+
+# MemoryMonitor.py
+# Heap and GC statistics: sampled at frame boundaries and scene transitions,
+# dumped over serial (board) or at the end of tools/simulate.py --mem (host).
+
+try:
+    mem_free = gc.mem_free
+    mem_alloc = gc.mem_alloc
+except AttributeError:
+    # Host Python has no fixed heap: tracemalloc stands in for the allocation
+    # counter (it also drops on plain frees) and free memory is reported as 0
+    import tracemalloc
+
+    def mem_alloc():
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[0]
+
+    def mem_free():
+        return 0
+
+
+class SceneStats:
+    def __init__(self, name, alloc, free):
+        """Memory figures of one scene (a level, a dialogue, the menu...)"""
+        self.name = name
+        self.entries = 0
+        self.frames = 0
+        self.start_alloc = alloc
+        self.peak_alloc = alloc      # High-water mark of allocated bytes
+        self.min_free = free         # Low-water mark of free bytes
+        self.max_delta = 0           # Largest growth of the heap in one frame
+        self.total_delta = 0         # Sum of positive per-frame growth
+        self.auto_gcs = 0            # Frames where the heap shrank (GC ran)
+        self.worst_gc_frame_ms = 0   # Longest frame that contained a GC
+
+
+class MemoryMonitor:
+    def __init__(self, enabled=True, log_scenes=True):
+        """
+        enabled: False turns frame()/scene() into cheap no-ops
+        log_scenes: print a snapshot line at every scene transition
+        """
+        self.enabled = enabled
+        self.log_scenes = log_scenes
+        self.scenes = {}
+        self.current = None
+        self.last_alloc = 0
+        self.last_time = 0
+
+        # Explicit gc.collect() pauses measured by collect()
+        self.collects = 0
+        self.pause_total_ms = 0
+        self.pause_max_ms = 0
+        self.freed_total = 0
+
+        if enabled:
+            self.scene("boot")
+
+    # ----------------------------------------
+    # Sampling
+    # ----------------------------------------
+    def scene(self, name):
+        """Mark a scene transition and print a one-line snapshot"""
+        if not self.enabled:
+            return
+        alloc = mem_alloc()
+        free = mem_free()
+        stats = self.scenes.get(name)
+        if stats is None:
+            stats = SceneStats(name, alloc, free)
+            self.scenes[name] = stats
+        stats.entries += 1
+        self.current = stats
+        self._sample(stats, alloc, free)
+        self.last_alloc = alloc
+        self.last_time = time.monotonic()
+        if self.log_scenes:
+            Log.info("[mem] %s: alloc=%d free=%d peak=%d", name, alloc, free, stats.peak_alloc)
+
+    def frame(self):
+        """Call once per game loop iteration"""
+        if not self.enabled:
+            return
+        alloc = mem_alloc()
+        now = time.monotonic()
+        stats = self.current
+        stats.frames += 1
+
+        delta = alloc - self.last_alloc
+        if delta >= 0:
+            stats.total_delta += delta
+            if delta > stats.max_delta:
+                stats.max_delta = delta
+        else:
+            # The heap shrank during the frame: an automatic collection ran
+            stats.auto_gcs += 1
+            frame_ms = int((now - self.last_time) * 1000)
+            if frame_ms > stats.worst_gc_frame_ms:
+                stats.worst_gc_frame_ms = frame_ms
+
+        self._sample(stats, alloc, mem_free())
+        self.last_alloc = alloc
+        self.last_time = now
+
+    def collect(self):
+        """Run gc.collect() and time the pause; returns the pause in ms"""
+        before = mem_alloc()
+        start = time.monotonic()
+        gc.collect()
+        pause_ms = (time.monotonic() - start) * 1000
+        after = mem_alloc()
+
+        self.collects += 1
+        self.pause_total_ms += pause_ms
+        self.pause_max_ms = max(self.pause_max_ms, pause_ms)
+        self.freed_total += max(0, before - after)
+        self.last_alloc = after
+        return pause_ms
+
+    @staticmethod
+    def _sample(stats, alloc, free):
+        if alloc > stats.peak_alloc:
+            stats.peak_alloc = alloc
+        if free < stats.min_free:
+            stats.min_free = free
+
+    # ----------------------------------------
+    # Report
+    # ----------------------------------------
+    def report(self):
+        """Print the per-scene table and the collect() pause statistics"""
+        if not self.enabled:
+            return
+        Log.info("[mem] scene        frames   peak  minfree  maxd  avgd  gcs  gcms")
+        for s in self.scenes.values():
+            avg = s.total_delta // s.frames if s.frames else 0
+            Log.info("[mem] {:<12}{:>7}{:>7}{:>9}{:>6}{:>6}{:>5}{:>6}".format(
+                s.name, s.frames, s.peak_alloc, s.min_free, s.max_delta,
+                avg, s.auto_gcs, s.worst_gc_frame_ms))
+        if self.collects:
+            Log.info("[mem] collect: %d runs, avg %.1f ms, max %.1f ms, freed %d bytes",
+                     self.collects, self.pause_total_ms / self.collects,
+                     self.pause_max_ms, self.freed_total)
+
+
+# ================================
+# Scheduled collection
+# ================================
+class GcPolicy:
+    def __init__(self, monitor, threshold=None):
+        """
+        Collect at points where a pause cannot be seen (tile crossings,
+        dialogue screens) instead of letting the GC pick a gameplay frame.
+        monitor: MemoryMonitor that times every collection
+        threshold: bytes allocated before an automatic collection during
+            gameplay (gc.threshold); None leaves the firmware default
+        """
+        self.monitor = monitor
+        self.threshold = threshold
+        self.can_threshold = hasattr(gc, "threshold")
+
+    def safe_point(self):
+        """Collect now; returns the pause in ms"""
+        return self.monitor.collect()
+
+    def enter_gameplay(self):
+        self.safe_point()
+        if self.threshold is not None and self.can_threshold:
+            gc.threshold(self.threshold)
+
+    def leave_gameplay(self):
+        if self.threshold is not None and self.can_threshold:
+            gc.threshold(-1)   # Back to collecting only when the heap is full
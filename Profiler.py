@@ -0,0 +1,200 @@
+import struct
+import time
+from array import array
+
+import Log
+
+# Profiler.py
+# Span tracing into a preallocated ring buffer:
+#     with trace("enemies"):
+#         ...
+#     @traced("save_game_data")
+#     def save_game_data(...):
+# enable() must run before decorated functions are defined (modules imported
+# earlier use `with trace(...)` instead); while disabled
+# trace() hands out one shared do-nothing span and @traced returns the
+# function unchanged. Hot loops check `Profiler.tracer` once and close
+# back-to-back spans with tracer.lap() instead of entering a span per stage. dump() writes the buffer for tools/spans_to_chrome.py:
+#   b"SPN1" + <HH>  name count, record count
+#   names:   <B> length + utf-8 bytes, one per name id
+#   records: <HII>  name id, start us, duration us (oldest first)
+MAGIC = b"SPN1"
+RECORD_FMT = "<HII"
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Span:
+    def __init__(self, tracer, name_id):
+        self.tracer = tracer
+        self.name_id = name_id
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name_id, self.start, time.monotonic_ns())
+        return False
+
+
+class SpanTracer:
+    def __init__(self, size=512):
+        """
+        size: spans kept; the oldest are overwritten once the ring is full
+        """
+        self.size = size
+        self.name_ids = array("H", [0] * size)
+        self.starts = array("L", [0] * size)
+        self.durations = array("L", [0] * size)
+        self.pos = 0
+        self.count = 0
+        self.t0 = time.monotonic_ns()
+
+        self.names = []     # name id -> name
+        self.spans = {}     # name -> reusable _Span
+        self.last_lap = self.t0
+
+    def span(self, name):
+        s = self.spans.get(name)
+        if s is None:
+            s = _Span(self, len(self.names))
+            self.names.append(name)
+            self.spans[name] = s
+        return s
+
+    def laps(self, *names):
+        """Name ids for lap(), one per name; the first lap starts now"""
+        self.last_lap = time.monotonic_ns()
+        return [self.span(name).name_id for name in names]
+
+    def lap(self, name_id):
+        """Record the time since the previous lap as span name_id"""
+        now = time.monotonic_ns()
+        self.record(name_id, self.last_lap, now)
+        self.last_lap = now
+
+    def record(self, name_id, start_ns, end_ns):
+        i = self.pos
+        self.name_ids[i] = name_id
+        self.starts[i] = ((start_ns - self.t0) // 1000) & 0xFFFFFFFF
+        self.durations[i] = min((end_ns - start_ns) // 1000, 0xFFFFFFFF)
+        i += 1
+        self.pos = 0 if i == self.size else i
+        if self.count < self.size:
+            self.count += 1
+
+    def dump(self, path):
+        """Write the buffer (oldest span first) for the host converter"""
+        first = (self.pos - self.count) % self.size
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<HH", len(self.names), self.count))
+            for name in self.names:
+                data = name.encode()
+                f.write(bytes([len(data)]) + data)
+            for k in range(self.count):
+                i = (first + k) % self.size
+                f.write(struct.pack(RECORD_FMT, self.name_ids[i], self.starts[i], self.durations[i]))
+        Log.info("Spans dumped: %d -> %s", self.count, path)
+
+
+# ================================
+# Module-level API
+# ================================
+NULL_SPAN = _NullSpan()
+tracer = None   # Active SpanTracer, None while tracing is disabled
+
+
+def enable(size=512):
+    """Start recording spans into a ring buffer of `size` entries"""
+    global tracer
+    tracer = SpanTracer(size)
+    return tracer
+
+
+def trace(name):
+    """Context manager timing the enclosed block as span `name`"""
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name)
+
+
+def traced(name=None):
+    """Decorator timing every call of a function as one span"""
+    def wrap(fn):
+        if tracer is None:
+            return fn
+        s = tracer.span(name or fn.__name__)
+
+        def wrapper(*args, **kwargs):
+            with s:
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+def dump(path):
+    if tracer is not None:
+        tracer.dump(path)
+
+
+# ================================
+# Frame rate
+# ================================
+class FrameMeter:
+    def __init__(self, window=1.0):
+        """
+        Frame rate and worst frame time over windows of `window` seconds.
+        tick() returns True when a window closes and fps/worst_ms are fresh.
+        average_ms() / peak_ms() cover every frame since the meter was made.
+        """
+        self.window = window
+        self.window_start = None
+        self.last = 0
+        self.frames = 0
+        self.worst = 0
+        self.fps = 0
+        self.worst_ms = 0
+        self.start = None
+        self.total_frames = 0
+        self.peak = 0
+
+    def tick(self, now):
+        if self.window_start is None:
+            self.window_start = now
+            self.start = now
+            self.last = now
+            return False
+        dt = now - self.last
+        self.last = now
+        self.frames += 1
+        self.total_frames += 1
+        if dt > self.worst:
+            self.worst = dt
+            if dt > self.peak:
+                self.peak = dt
+
+        elapsed = now - self.window_start
+        if elapsed < self.window:
+            return False
+        self.fps = int(self.frames / elapsed)
+        self.worst_ms = int(self.worst * 1000)
+        self.window_start = now
+        self.frames = 0
+        self.worst = 0
+        return True
+
+    def average_ms(self):
+        if not self.total_frames:
+            return 0
+        return (self.last - self.start) * 1000 / self.total_frames
+
+    def peak_ms(self):
+        return self.peak * 1000
@@ -0,0 +1,41 @@
+# RotaryInput.py
+try:
+    import rotaryio
+except ImportError:
+    rotaryio = None
+
+
+class RotaryInput:
+    def __init__(self, pin_a, pin_b, pulses_per_detent=3):
+        """
+        Rotary encoder counted in the background by rotaryio (PIO on the RP2040),
+        so no step is lost between two reads however long a frame takes.
+        Falls back to the polled RotaryDecoder where rotaryio is missing.
+        pulses_per_detent: encoder pulses per click of the knob
+        """
+        self.pulses_per_detent = pulses_per_detent
+        self.last_detent = 0
+        self.decoder = None
+        self.encoder = None
+        if rotaryio is not None:
+            self.encoder = rotaryio.IncrementalEncoder(pin_a, pin_b, divisor=1)
+        else:
+            from RotaryDecoder import RotaryDecoder
+            self.decoder = RotaryDecoder(pin_a, pin_b, pulses_per_detent=pulses_per_detent)
+
+    def update(self):
+        """Detents turned since the last call (positive = clockwise)"""
+        if self.encoder is None:
+            return self.decoder.update()
+        detent = self.encoder.position // self.pulses_per_detent
+        delta = detent - self.last_detent
+        self.last_detent = detent
+        return delta
+
+    def drain(self):
+        """Forget the detents turned since the last call (e.g. during a dialogue)"""
+        if self.encoder is None:
+            self.decoder.update()
+        else:
+            self.last_detent = self.encoder.position // self.pulses_per_detent
+
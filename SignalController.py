@@ -1,10 +1,56 @@
 # signal.py
+OFF = (0, 0, 0)
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+PULSE_STEPS = 8  # Brightness levels of a pulse; fewer levels = fewer pixel writes
+
+
 class SignalController:
     def __init__(self, pixel):
+        """
+        pixel: NeoPixel strip of one LED created with auto_write=False.
+        set()/stop() only change the desired state; render() pushes it to the
+        LED once per frame and only when the shown color actually changes.
+        """
         self.pixel = pixel
+        self.color = OFF
+        self.effect = None    # None, "blink" or "pulse"
+        self.period = 0.5     # Seconds per blink/pulse cycle
+        self.shown = None     # Color currently on the LED (None = unknown)
+
+    def set(self, color, effect=None, period=0.5):
+        self.color = color
+        self.effect = effect
+        self.period = period
 
     def stop(self):
-        self.pixel.fill((0, 0, 0))  # Turn off the light
+        self.set(OFF)  # Turn off the light
+
+    def render(self, now):
+        """Compute this frame's color from the frame clock and write it if it changed"""
+        color = self.color
+        if self.effect == "blink":
+            if now % self.period >= self.period / 2:
+                color = OFF
+        elif self.effect == "pulse":
+            # Triangle wave 1/PULSE_STEPS .. 1, quantized so most frames write nothing
+            phase = (now % self.period) / self.period
+            level = int((1 - abs(2 * phase - 1)) * (PULSE_STEPS - 1)) + 1
+            r, g, b = color
+            color = (r * level // PULSE_STEPS, g * level // PULSE_STEPS, b * level // PULSE_STEPS)
+
+        if color != self.shown:
+            self.pixel[0] = color
+            self.pixel.show()
+            self.shown = color
+
+    @staticmethod
+    def render_all(controllers, now):
+        for ctrl in controllers.values():
+            ctrl.render(now)
 
     @staticmethod
     def direction_signal(food_dirs, enemy_dirs, controllers):
@@ -13,42 +59,32 @@ class SignalController:
         enemy_dirs: List of directions with the most enemies (e.g., ["LEFT", "RIGHT"])
         controllers: dict mapping direction -> SignalController object
         """
-
-        # Turn off all lights
-        for ctrl in controllers.values():
-            ctrl.stop()
-
         # Iterate through each direction and set color
         for direction, ctrl in controllers.items():
             food_max = direction in food_dirs
             enemy_max = direction in enemy_dirs
 
             if food_max and enemy_max:
-                ctrl.pixel.fill((255, 255, 0))  # Yellow light
-                print(f"{direction}: Most food + enemies → Yellow")
+                ctrl.set(YELLOW)   # Most food + enemies
             elif food_max:
-                ctrl.pixel.fill((0, 255, 0))    # Green light
-                print(f"{direction}: Most food → Green")
+                ctrl.set(GREEN)    # Most food
             elif enemy_max:
-                ctrl.pixel.fill((255, 0, 0))    # Red light
-                print(f"{direction}: Most enemies → Red")
+                ctrl.set(RED)      # Most enemies
             else:
-                ctrl.pixel.fill((0, 0, 0))      # Light off
-                print(f"{direction}: None → Off")
-    
+                ctrl.stop()
+
+    @staticmethod
     def update_lights_by_lives(lives, controllers):
         """
         Light color based on remaining lives:
-        >=5 white, <5 yellow, <3 red
+        >=5 white, <5 yellow, <3 pulsing red
         """
-
         if lives < 3:
-            color = (255, 0, 0)   # Red
+            color, effect = RED, "pulse"
         elif lives < 5:
-            color = (255, 255, 0) # Yellow
+            color, effect = YELLOW, None
         else:
-            color = (255, 255, 255)  # White
+            color, effect = WHITE, None
 
         for ctrl in controllers.values():
-            ctrl.pixel.fill(color)
-
+            ctrl.set(color, effect, 1.0)
@@ -0,0 +1,80 @@
+# SpawnSampler.py
+class SpawnSampler:
+    def __init__(self, x_min, y_min, x_max, y_max, size, jitter=3, gap=1, cache_size=8):
+        """
+        Stratified spawn sampler for size x size sprites: the field is cut into
+        cells of size + gap + jitter pixels and each cell holds at most one
+        spawn, so spawns of one sampler never overlap and stay `gap` apart.
+        x_min..x_max, y_min..y_max: inclusive range for the top-left corner
+        jitter: offset range of a spawn inside its cell
+        cache_size: exclusion boxes whose valid cells are kept
+        """
+        self.size = size
+        self.jitter = jitter
+        self.gap = gap
+        self.cell = cell = size + gap + jitter
+        self.x_min = x_min
+        self.y_min = y_min
+
+        # Cells of the whole field, computed once
+        self.cells = tuple(
+            (cx, cy)
+            for cy in range(y_min, y_max - jitter + 1, cell)
+            for cx in range(x_min, x_max - jitter + 1, cell)
+        )
+        self.cache = {}   # exclusion box -> cells outside it
+        self.cache_size = cache_size
+
+    def cells_outside(self, box):
+        """
+        Cells whose every spawn position lies outside box = (x0, y0, x1, y1),
+        the open range of top-left corners to keep clear. Computed once per box.
+        """
+        cells = self.cache.get(box)
+        if cells is None:
+            x0, y0, x1, y1 = box
+            j = self.jitter
+            cells = tuple(
+                c for c in self.cells
+                if not (x0 < c[0] + j and c[0] < x1 and y0 < c[1] + j and c[1] < y1)
+            )
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[box] = cells
+        return cells
+
+    def blocked(self, rects):
+        """Cells a spawn could touch one of rects (x, y, w, h) from, gap included"""
+        cells = set()
+        cell = self.cell
+        reach = self.jitter + self.size + self.gap
+        for x, y, w, h in rects:
+            x_start = self.x_min + ((x - reach - self.x_min) // cell + 1) * cell
+            y_start = self.y_min + ((y - reach - self.y_min) // cell + 1) * cell
+            for cy in range(y_start, y + h + self.gap, cell):
+                for cx in range(x_start, x + w + self.gap, cell):
+                    cells.add((cx, cy))
+        return cells
+
+    def sample(self, n, rng, box, avoid=()):
+        """
+        Draw up to n spawn positions without replacement from the cells
+        outside `box`; each draw is one swap-remove, so this is O(n).
+        avoid: (x, y, w, h) of sprites already placed (e.g. enemies); their
+            cells are skipped when drawn
+        """
+        pool = list(self.cells_outside(box))
+        blocked = self.blocked(avoid) if avoid else ()
+        free = len(pool)
+        j = self.jitter
+        positions = []
+        while len(positions) < n and free:
+            i = rng.randrange(free)
+            cx, cy = pool[i]
+            # Swap-remove: move the chosen cell behind the free region
+            free -= 1
+            pool[i] = pool[free]
+            if (cx, cy) in blocked:
+                continue
+            positions.append((cx + rng.randrange(j + 1), cy + rng.randrange(j + 1)))
+        return positions
@@ -0,0 +1,74 @@
+import struct
+
+# Story.py
+# Reader for story.bin, built from story.txt by tools/build_story.py:
+#   b"STY1" + <H>  section count
+#   index:  <B> key length + key + <IB> body offset, line count (per section)
+#   body:   <B> length + utf-8 bytes, per line
+# Only the small index stays in RAM; a section's lines are read from flash
+# when it is played.
+MAGIC = b"STY1"
+
+
+class Story:
+    def __init__(self, path="/story.bin"):
+        self.path = path
+        self.index = {}   # key -> (offset, line count)
+        with open(path, "rb") as f:
+            header = f.read(6)
+            if header[:4] != MAGIC:
+                raise ValueError("not a story file: " + path)
+            count = struct.unpack("<H", header[4:])[0]
+            for _ in range(count):
+                n = f.read(1)[0]
+                key = f.read(n).decode()
+                self.index[key] = struct.unpack("<IB", f.read(5))
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def lines(self, key):
+        """All lines of one section, read from flash"""
+        offset, count = self.index[key]
+        lines = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for _ in range(count):
+                n = f.read(1)[0]
+                lines.append(f.read(n).decode())
+        return lines
+
+
+def parse_story(text):
+    """story.txt -> list of (key, lines); used by the host build tool"""
+    sections = []
+    lines = None
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            lines = []
+            sections.append((line[1:-1], lines))
+        elif lines is None:
+            raise ValueError("line outside a section: " + line)
+        else:
+            lines.append(line)
+    return sections
+
+
+def pack_story(sections):
+    """list of (key, lines) -> story.bin bytes"""
+    index_size = 6 + sum(1 + len(key.encode()) + 5 for key, _ in sections)
+    index = bytearray(MAGIC + struct.pack("<H", len(sections)))
+    body = bytearray()
+    for key, lines in sections:
+        data = key.encode()
+        index += bytes([len(data)]) + data
+        index += struct.pack("<IB", index_size + len(body), len(lines))
+        for line in lines:
+            data = line.encode()
+            if len(data) > 255:
+                raise ValueError("line too long: " + line)
+            body += bytes([len(data)]) + data
+    return bytes(index + body)
@@ -0,0 +1,114 @@
+import os
+import struct
+import time
+
+import Log
+
+# Telemetry.py
+# One fixed-size record per finished level, collected in a RAM ring during
+# play and appended to flash in one write at a safe point (menu, end screen)
+# so no level frame waits on the filesystem. File layout:
+#   b"TLM1"
+#   records: <HIBBBBBBHHHH> (RECORD_FMT below), oldest first
+# tools/telemetry_report.py turns the file into a summary table.
+MAGIC = b"TLM1"
+RECORD_FMT = "<HIBBBBBBHHHH"
+RECORD_SIZE = struct.calcsize(RECORD_FMT)   # 20 bytes
+#   session     boot number, counted on in the file
+#   t           ms since boot when the level ended
+#   level       index in LEVELS
+#   outcome     index in OUTCOMES
+#   mode        difficulty 0-2 (NONE for tutorial/boss)
+#   times       levels passed before this one (NONE if not a normal level)
+#   lives_lost
+#   (padding)
+#   score
+#   survived    tenths of a second
+#   frame_avg   tenths of a ms
+#   frame_worst ms
+LEVELS = ("tutorial", "normal", "boss")
+OUTCOMES = ("win", "timeout", "dead")
+NONE = 0xFF
+
+
+def _u16(v):
+    return max(0, min(0xFFFF, int(v)))
+
+
+class Telemetry:
+    def __init__(self, path, capacity=16):
+        """
+        path: record file on flash, appended to across boots
+        capacity: records held in RAM between flushes; the oldest is
+            overwritten (and counted in dropped) if no flush comes in time
+        """
+        self.path = path
+        self.capacity = capacity
+        self.buf = bytearray(RECORD_SIZE * capacity)
+        self.pos = 0         # Next slot
+        self.count = 0       # Records waiting for flush()
+        self.dropped = 0
+        self.t0 = time.monotonic()
+        self.session = self._next_session()
+
+    def _next_session(self):
+        """One more than the session of the last record on flash"""
+        try:
+            size = os.stat(self.path)[6]
+            if size < len(MAGIC) + RECORD_SIZE:
+                return 1
+            with open(self.path, "rb") as f:
+                f.seek(size - RECORD_SIZE)
+                return (struct.unpack("<H", f.read(2))[0] + 1) & 0xFFFF
+        except OSError:
+            return 1
+
+    def level(self, name, outcome, mode, times, lives_lost, score, survived,
+              frame_avg_ms, frame_worst_ms):
+        """Queue the record of one finished level (no flash access)"""
+        struct.pack_into(
+            RECORD_FMT, self.buf, self.pos * RECORD_SIZE,
+            self.session,
+            int((time.monotonic() - self.t0) * 1000) & 0xFFFFFFFF,
+            LEVELS.index(name), OUTCOMES.index(outcome),
+            NONE if mode is None else mode,
+            NONE if times is None else min(times, 0xFE),
+            min(max(lives_lost, 0), 0xFF), 0,
+            _u16(score), _u16(survived * 10),
+            _u16(frame_avg_ms * 10), _u16(frame_worst_ms)
+        )
+        self.pos = (self.pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.dropped += 1
+
+    def flush(self):
+        """Append every queued record to the file in one write"""
+        if not self.count:
+            return
+        first = (self.pos - self.count) % self.capacity
+        view = memoryview(self.buf)
+        try:
+            try:
+                new = os.stat(self.path)[6] == 0
+            except OSError:
+                new = True
+            with open(self.path, "ab") as f:
+                if new:
+                    f.write(MAGIC)
+                end = first + self.count
+                if end <= self.capacity:
+                    f.write(view[first * RECORD_SIZE:end * RECORD_SIZE])
+                else:
+                    f.write(view[first * RECORD_SIZE:])
+                    f.write(view[:(end - self.capacity) * RECORD_SIZE])
+        except OSError as e:
+            # Read-only flash (USB mounted): keep the records for the next try
+            Log.warn("telemetry not saved: %s", e)
+            return
+        Log.debug("Telemetry: %d records saved", self.count)
+        if self.dropped:
+            Log.warn("Telemetry: %d records dropped before a flush", self.dropped)
+            self.dropped = 0
+        self.count = 0
@@ -0,0 +1,135 @@
+import gc
+import time
+import displayio
+import terminalio
+from adafruit_display_text import bitmap_label
+
+import DirtyPages
+
+# Text.py
+# Text helpers for the HUD and dialogues.
+# - make_label(): bitmap_label.Label, one bitmap per label instead of one
+#   TileGrid per glyph (label.Label)
+# - TextField: fixed number of character cells drawn straight from the
+#   font's glyph sheet; changing a character only swaps a tile index, and
+#   set_number() writes digits without building a string.
+FONT = terminalio.FONT
+GLYPH_W, GLYPH_H = FONT.get_bounding_box()[:2]
+
+# Shared by every TextField: character code -> tile index in FONT.bitmap
+_glyphs = {}
+
+PALETTE = displayio.Palette(2)
+PALETTE[0] = 0x000000
+PALETTE[1] = 0xFFFFFF
+PALETTE.make_transparent(0)
+
+
+def glyph_index(code):
+    index = _glyphs.get(code)
+    if index is None:
+        glyph = FONT.get_glyph(code)
+        if glyph is None:
+            glyph = FONT.get_glyph(ord("?"))
+        index = glyph.tile_index
+        _glyphs[code] = index
+    return index
+
+
+def make_label(text="", **kwargs):
+    """bitmap_label with the game's font; same keywords as label.Label"""
+    return bitmap_label.Label(FONT, text=text, **kwargs)
+
+
+class TextField:
+    def __init__(self, cells, x=0, y=0, text=""):
+        """
+        cells: characters the field can hold (fixed width, padded with spaces)
+        x, y: top-left corner in pixels
+        """
+        self.cells = cells
+        self.chars = bytearray(b" " * cells)   # Character shown in each cell
+        self.tile = displayio.TileGrid(
+            FONT.bitmap, pixel_shader=PALETTE,
+            width=cells, height=1, tile_width=GLYPH_W, tile_height=GLYPH_H,
+            default_tile=glyph_index(32), x=x, y=y
+        )
+        if text:
+            self.set_text(text)
+
+    @property
+    def width(self):
+        return self.cells * GLYPH_W
+
+    def _put(self, i, code):
+        if self.chars[i] != code:
+            self.chars[i] = code
+            self.tile[i] = glyph_index(code)
+            DirtyPages.mark(self.tile.x + i * GLYPH_W, self.tile.y, GLYPH_W, GLYPH_H)
+
+    def set_text(self, text, start=0):
+        """Write text from cell `start`, clearing the rest of the field"""
+        i = start
+        for ch in text:
+            if i >= self.cells:
+                break
+            self._put(i, ord(ch))
+            i += 1
+        while i < self.cells:
+            self._put(i, 32)
+            i += 1
+
+    def set_number(self, value, start=0, digits=None):
+        """Right-align a non-negative integer in cells start..start+digits"""
+        if digits is None:
+            digits = self.cells - start
+        i = start + digits - 1
+        value = int(value)
+        while i >= start:
+            if value or i == start + digits - 1:
+                self._put(i, 48 + value % 10)
+                value //= 10
+            else:
+                self._put(i, 32)
+            i -= 1
+
+
+# ================================
+# Benchmark (run on the board: import Text; Text.benchmark())
+# ================================
+def benchmark(updates=200):
+    """Time and heap cost of updating a counter with each text type"""
+    from adafruit_display_text import label
+
+    group = displayio.Group()
+    results = []
+    for name in ("label", "bitmap_label", "TextField"):
+        gc.collect()
+        free_before = gc.mem_free()
+        if name == "label":
+            obj = label.Label(FONT, text="0000")
+        elif name == "bitmap_label":
+            obj = make_label("0000")
+        else:
+            obj = TextField(4)
+        group.append(obj.tile if name == "TextField" else obj)
+        gc.collect()
+        created = free_before - gc.mem_free()
+
+        start = time.monotonic_ns()
+        for n in range(updates):
+            if name == "TextField":
+                obj.set_number(n)
+            else:
+                obj.text = str(n)
+        per_update_us = (time.monotonic_ns() - start) // 1000 // updates
+        group.pop()
+        results.append((name, created, per_update_us))
+
+    for name, created, us in results:
+        print("{:<14}{:>8} bytes{:>8} us/update".format(name, created, us))
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
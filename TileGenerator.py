@@ -0,0 +1,221 @@
+import random
+
+from SpawnSampler import SpawnSampler
+from Profiler import trace
+from GameRules import SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, ENEMY_SIZE, FOOD_SIZE, WALL_OFFSET
+
+DIRECTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
+OPPOSITE = {
+    "UP": "DOWN",
+    "DOWN": "UP",
+    "LEFT": "RIGHT",
+    "RIGHT": "LEFT"
+}
+
+
+# ================================
+# Random Positions & Tile Data
+# ================================
+# Spawn cells of the whole field, shared by every tile: one grid per sprite
+# size, so an 8 px enemy gets a cell as large as itself
+SPAWN_FIELD = (
+    WALL_OFFSET + ENEMY_SIZE, WALL_OFFSET + ENEMY_SIZE,
+    SCREEN_WIDTH - WALL_OFFSET - ENEMY_SIZE, SCREEN_HEIGHT - WALL_OFFSET - ENEMY_SIZE
+)
+FOOD_SAMPLER = SpawnSampler(*SPAWN_FIELD, size=FOOD_SIZE)
+ENEMY_SAMPLER = SpawnSampler(*SPAWN_FIELD, size=ENEMY_SIZE)
+SAMPLERS = {FOOD_SIZE: FOOD_SAMPLER, ENEMY_SIZE: ENEMY_SAMPLER}
+
+
+def player_box(player_x, player_y, margin):
+    """Spawn corners closer than `margin` to the player on both axes"""
+    return (player_x - margin, player_y - margin, player_x + margin, player_y + margin)
+
+
+def entry_box(hit_dir, margin):
+    """
+    Spawn corners within `margin` of anywhere the player can appear after
+    crossing through hit_dir: the whole strip along the entry wall
+    """
+    lo_x, lo_y = WALL_OFFSET, WALL_OFFSET
+    hi_x = SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET
+    hi_y = SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET
+    if hit_dir in ("UP", "DOWN"):
+        _, y = enter_next_tile(hit_dir, 0, 0)
+        return (lo_x - margin, y - margin, hi_x + margin, y + margin)
+    x, _ = enter_next_tile(hit_dir, 0, 0)
+    return (x - margin, lo_y - margin, x + margin, hi_y + margin)
+
+
+def sprite_rects(positions, size):
+    return [(x, y, size, size) for x, y in positions]
+
+
+def generate_random_positions(player_x, player_y, n, margin=15, rng=random,
+                              size=FOOD_SIZE, avoid=()):
+    """
+    Generate n random coordinates ensuring:
+    1. Distance from player is at least `margin` pixels
+    2. Distance from wall is at least WALL_OFFSET pixels
+    3. No two positions overlap, nor any of the `avoid` rects (x, y, w, h)
+    size: FOOD_SIZE or ENEMY_SIZE, the sprite being placed
+    rng: random source (the random module or a seeded Rng)
+    """
+    return SAMPLERS[size].sample(n, rng, player_box(player_x, player_y, margin), avoid)
+
+
+def roll_tile_counts(rng=random):
+    """Food and enemy count of one tile: Food 5~20, Enemy 0~3"""
+    return rng.randint(5, 20), rng.randint(0, 3)
+
+
+def summarize_tile_data(data, allow_dir):
+    """Return direction(s) with most food and direction(s) with most enemies"""
+    max_food = max(data[d]["food"] for d in allow_dir)
+    max_enemy = max(data[d]["enemy"] for d in allow_dir)
+
+    food_max_dirs = [d for d in allow_dir if data[d]["food"] == max_food]
+    enemy_max_dirs = [d for d in allow_dir if data[d]["enemy"] == max_enemy]
+
+    return food_max_dirs, enemy_max_dirs
+
+
+def generate_tile_data(allow_dir, rng=random):
+    """
+    Generate enemy and food counts for four directions:
+    Food: 5~20, Enemy: 0~3
+    Also returns: direction(s) with most food and direction(s) with most enemies
+    """
+    data = {}
+
+    # Generate data
+    for d in allow_dir:
+        food, enemy = roll_tile_counts(rng)
+        data[d] = {"food": food, "enemy": enemy}
+
+    # ---- Find directions with maximum values ----
+    food_max_dirs, enemy_max_dirs = summarize_tile_data(data, allow_dir)
+
+    return data, food_max_dirs, enemy_max_dirs
+
+
+# ================================
+# Generate random directions
+# ================================
+def simple_sample(pool, k, rng=random):
+    pool_copy = list(pool)
+    result = []
+    for _ in range(k):
+        idx = rng.randrange(len(pool_copy))
+        result.append(pool_copy.pop(idx))
+    return result
+
+
+def generate_random_directions(last_dir, rng=random):
+    must_include = OPPOSITE[last_dir]  # Opposite direction must appear
+    pool = [d for d in DIRECTIONS if d != must_include]  # Exclude the direction the player hit
+    r = rng.random()
+    
+    if r < 0.33:
+        dirs = []
+    elif r < 0.7:
+        dirs = simple_sample(pool, 1, rng)
+    else:
+        dirs = simple_sample(pool, 2, rng)
+
+    dirs.append(must_include)
+    return dirs
+
+
+def enter_next_tile(hit_dir, x, y):
+    """Teleport the ball to the opposite side based on collision direction"""
+    if hit_dir == "UP":
+        y = SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET - BALL_SIZE/2
+    elif hit_dir == "DOWN":
+        y = WALL_OFFSET + BALL_SIZE/2
+    elif hit_dir == "LEFT":
+        x = SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET - BALL_SIZE/2
+    elif hit_dir == "RIGHT":
+        x = WALL_OFFSET + BALL_SIZE/2
+    
+    return x, y
+
+
+# ================================
+# Lookahead tile generator
+# ================================
+class TileGenerator:
+    def __init__(self, world, food_margin=10, enemy_margin=15,
+                 spawn_food=True, fixed_enemies=None):
+        """
+        world: WorldGenerator providing the seeded content of every tile
+        food_margin / enemy_margin: minimum distance from the player on entry
+        spawn_food: False for modes without food (boss)
+        fixed_enemies: if set, overrides the per-direction enemy count
+        """
+        self.world = world
+        self.food_margin = food_margin
+        self.enemy_margin = enemy_margin
+        self.spawn_food = spawn_food
+        self.fixed_enemies = fixed_enemies
+
+        self.tile_index = 0
+        self.pending = []   # Exits whose layout has not been built yet
+        self.ready = {}     # direction -> prebuilt layout
+
+    def first(self, player_x, player_y, num_foods, num_enemies):
+        """Layout of the starting tile (index 0)"""
+        self.tile_index = 0
+        layout = self._build(0, "UP",
+                             player_box(player_x, player_y, self.food_margin),
+                             player_box(player_x, player_y, self.enemy_margin),
+                             num_foods, num_enemies)
+        self.plan(layout["allowed_dirs"])
+        return layout
+
+    def plan(self, allowed_dirs):
+        """Start prefetching the neighbours of a freshly entered tile"""
+        self.pending = list(allowed_dirs)
+        self.ready = {}
+
+    def prefetch_step(self):
+        """
+        Build the layout of one pending exit. Call once per idle frame.
+        Returns True if any work was done.
+        """
+        if not self.pending:
+            return False
+        d = self.pending.pop()
+        with trace("tile_prefetch"):
+            self.ready[d] = self._build_exit(d)
+        return True
+
+    def take(self, hit_dir):
+        """
+        Return the layout for the tile behind hit_dir and make it current.
+        Falls back to building it now if prefetch has not reached it yet.
+        Prebuilt layouts keep the whole entry strip clear, so they are used
+        as they are wherever along the wall the player crossed.
+        """
+        layout = self.ready.get(hit_dir)
+        if layout is None:
+            with trace("tile_miss"):
+                layout = self._build_exit(hit_dir)
+
+        self.tile_index += 1
+        self.plan(layout["allowed_dirs"])
+        return layout
+
+    def _build_exit(self, hit_dir):
+        # The entry wall is known, the position along it is not
+        return self._build(self.tile_index + 1, hit_dir,
+                           entry_box(hit_dir, self.food_margin),
+                           entry_box(hit_dir, self.enemy_margin),
+                           None, self.fixed_enemies)
+
+    def _build(self, tile_index, hit_dir, food_box, enemy_box, num_foods, num_enemies):
+        return self.world.build_tile(
+            tile_index, hit_dir, food_box, enemy_box,
+            num_foods=num_foods if self.spawn_food else 0,
+            num_enemies=num_enemies
+        )
@@ -1,18 +1,16 @@
 import displayio
 import random
-from adafruit_display_text import label
-import terminalio
+from Text import TextField, GLYPH_H
+from TileGenerator import DIRECTIONS, simple_sample, generate_random_directions
+from GameRules import SHIELD_ORDER, shield_rect
 
 SCREEN_WIDTH = 128
 SCREEN_HEIGHT = 64
-
-DIRECTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
-OPPOSITE = {
-    "UP": "DOWN",
-    "DOWN": "UP",
-    "LEFT": "RIGHT",
-    "RIGHT": "LEFT"
-}
+SCORE_PREFIX_LEN = 7   # "score: "
+SCORE_DIGITS = 5
+COUNTDOWN_DIGITS = 4   # Up to 1000 s in the endless level
+LIVES_Y = SCREEN_HEIGHT - 17   # Row of 4x4 hearts, right-aligned; up to 10 in the boss level
+PERF_Y = LIVES_Y - 1 - GLYPH_H  # Perf overlay sits above the hearts, never on them
 
 
 class WallUtils:
@@ -20,13 +18,12 @@ class WallUtils:
     def __init__(self):
         self.walls_list = []
         self.shield_list = []
+        self.wall_cache = {}  # direction -> prebuilt wall TileGrid
 
     def draw_wall(self, group, x, y, w, h, color=1):
         """Draw a single wall"""
         bitmap = displayio.Bitmap(w, h, 2)
-        for i in range(w):
-            for j in range(h):
-                bitmap[i, j] = color
+        bitmap.fill(color)
         palette = displayio.Palette(2)
         palette[0] = 0x000000
         palette[1] = 0xFFFFFF
@@ -66,7 +63,7 @@ class WallUtils:
             tile = displayio.TileGrid(bmp, pixel_shader=pal)
 
             tile.x = SCREEN_WIDTH - 10 - i * 6
-            tile.y = SCREEN_HEIGHT - 17
+            tile.y = LIVES_Y
             self.life_group.append(tile)
 
 
@@ -74,28 +71,12 @@ class WallUtils:
     # ================================
     # Generate random directions
     # ================================
-    def simple_sample(self, pool, k):
-        pool_copy = list(pool)
-        result = []
-        for _ in range(k):
-            idx = random.randrange(len(pool_copy))
-            result.append(pool_copy.pop(idx))
-        return result
-
-    def generate_random_directions(self, last_dir):
-        must_include = OPPOSITE[last_dir]  # Opposite direction must appear
-        pool = [d for d in DIRECTIONS if d != must_include]  # Exclude the direction the player hit
-        r = random.random()
-        
-        if r < 0.33:
-            dirs = []
-        elif r < 0.7:
-            dirs = self.simple_sample(pool, 1)
-        else:
-            dirs = self.simple_sample(pool, 2)
+    def simple_sample(self, pool, k, rng=random):
+        return simple_sample(pool, k, rng)
 
-        dirs.append(must_include)
-        return dirs
+    def generate_random_directions(self, last_dir, rng=random):
+        """rng: random source (the random module or a seeded Rng)"""
+        return generate_random_directions(last_dir, rng)
 
     # ================================
     # Draw blocking walls
@@ -146,8 +127,14 @@ class WallUtils:
         }
 
         for d in blocked:
-            x, y, w, h = walls[d]
-            wall_obj = self.draw_wall(group, x, y, w, h)
+            # Walls never move, so each one is built once and reused on every tile
+            wall_obj = self.wall_cache.get(d)
+            if wall_obj is None:
+                x, y, w, h = walls[d]
+                wall_obj = self.draw_wall(group, x, y, w, h)
+                self.wall_cache[d] = wall_obj
+            else:
+                group.append(wall_obj)
             self.walls_list.append(wall_obj)
 
     # ================================
@@ -155,63 +142,27 @@ class WallUtils:
     # ================================
     def update_shields_position(self, player_x, player_y):
         """Move existing shields based on player's current position"""
-        if not hasattr(self, "shield_list"):
-            return
-
-        length = 20
-        thickness = 2
-        padding = 2  # Distance from player
-
-        for shield in self.shield_list:
-            tile = shield["tile"]
-            d = shield["dir"]
-            if d == "UP":
-                tile.x = int(player_x - length // 2)
-                tile.y = int(player_y - length // 2 - padding)
-            elif d == "DOWN":
-                tile.x = int(player_x - length // 2)
-                tile.y = int(player_y + length // 2 + padding)
-            elif d == "LEFT":
-                tile.x = int(player_x - length // 2 - padding)
-                tile.y = int(player_y - length // 2)
-            elif d == "RIGHT":
-                tile.x = int(player_x + length // 2 + padding)
-                tile.y = int(player_y - length // 2)
+        for tile, d, _, _ in self.shield_list:
+            tile.x, tile.y, _, _ = shield_rect(d, player_x, player_y)
 
     def draw_player_shields(self, group, player_x, player_y, dirs):
         """
         dirs: ["UP", "LEFT", "RIGHT", "DOWN"]
         Each white line is 20px long, 2px thick, close to the player
+        shield_list holds (tile, dir, w, h) tuples
         """
-
-        if not hasattr(self, "shield_list"):
-            self.shield_list = []
-
         # Remove old shields
         for s in self.shield_list:
-            if s["tile"] in group:
-                group.remove(s["tile"])
+            if s[0] in group:
+                group.remove(s[0])
         self.shield_list.clear()
 
-        length = 20
-        thickness = 2
-        padding = 2  # Close to the player
-        px = int(player_x)
-        py = int(player_y)
-
-        offsets = {
-            "UP":    (px - length // 2, py - length // 2 - padding, length, thickness),
-            "DOWN":  (px - length // 2, py + length // 2 + padding, length, thickness),
-            "LEFT":  (px - length // 2 - padding, py - length // 2, thickness, length),
-            "RIGHT": (px + length // 2 + padding, py - length // 2, thickness, length)
-        }
-
         for d in dirs:
-            if d not in offsets:
+            if d not in SHIELD_ORDER:
                 continue
-            x, y, w, h = offsets[d]
-            tile = self.draw_wall(group, int(x), int(y), int(w), int(h), color=1)
-            self.shield_list.append({"tile": tile, "dir": d})
+            x, y, w, h = shield_rect(d, player_x, player_y)
+            tile = self.draw_wall(group, x, y, w, h, color=1)
+            self.shield_list.append((tile, d, w, h))
             
     def draw_score(self, parent_group, initial_score=0):
         """Draw score in the top-left corner"""
@@ -224,19 +175,15 @@ class WallUtils:
             self.score_group.pop()
 
         self.score = initial_score
-        self.score_label = label.Label(
-            terminalio.FONT,
-            text=f"score: {self.score}",
-            color=0xFFFFFF,
-            anchored_position=(5, 5),  # Top-left corner
-            anchor_point=(0, 0)
-        )
-        self.score_group.append(self.score_label)
+        # "score: " is written once, the digits after it are a fixed-width field
+        self.score_field = TextField(SCORE_PREFIX_LEN + SCORE_DIGITS, x=5, y=5, text="score:")
+        self.score_field.set_number(self.score, SCORE_PREFIX_LEN)
+        self.score_group.append(self.score_field.tile)
 
     def update_score(self, new_score):
         """Update score display"""
         self.score = new_score
-        self.score_label.text = f"score: {self.score}"
+        self.score_field.set_number(new_score, SCORE_PREFIX_LEN)
         
         
     def draw_countdown(self, parent_group, countdown_value):
@@ -250,17 +197,58 @@ class WallUtils:
             self.countdown_group.pop()
 
         self.countdown = countdown_value
-        self.countdown_label = label.Label(
-            terminalio.FONT,
-            text=f"{self.countdown}",
-            color=0xFFFFFF,
-            anchored_position=(SCREEN_WIDTH - 8, 8),  # Top-right corner
-            anchor_point=(1, 0)  # Right aligned
-        )
-        self.countdown_group.append(self.countdown_label)
+        # Right aligned against the top-right corner
+        self.countdown_field = TextField(COUNTDOWN_DIGITS, y=8)
+        self.countdown_field.tile.x = SCREEN_WIDTH - 8 - self.countdown_field.width
+        self.countdown_field.set_number(countdown_value)
+        self.countdown_group.append(self.countdown_field.tile)
 
     def update_countdown(self, new_value):
         """Update countdown display"""
         self.countdown = new_value
-        self.countdown_label.text = f"{self.countdown}"
+        self.countdown_field.set_number(new_value)
 
+    # ================================
+    # Performance overlay
+    # ================================
+    def draw_perf(self, parent_group, visible=False, i2c=False):
+        """
+        FPS / worst frame / free heap line just above the hearts, hidden by default.
+        i2c: add a line above it for the display bytes per frame (DirtyPages)
+        """
+        if not hasattr(self, "perf_group"):
+            self.perf_group = displayio.Group()
+            parent_group.append(self.perf_group)
+
+        # Clear old content
+        while len(self.perf_group) > 0:
+            self.perf_group.pop()
+
+        # Layout "fps ms k" with fixed digit cells: "123fps 123ms 123k"
+        self.perf_field = TextField(17, x=5, y=PERF_Y,
+                                    text="   fps    ms    k")
+        self.perf_group.append(self.perf_field.tile)
+        self.i2c_field = None
+        if i2c:
+            # "1034B/f 100%": average bytes per frame, share of a full frame
+            self.i2c_field = TextField(12, x=5, y=PERF_Y - GLYPH_H,
+                                       text="    B/f    %")
+            self.perf_group.append(self.i2c_field.tile)
+        self.perf_group.hidden = not visible
+
+    def show_perf(self, visible):
+        self.perf_group.hidden = not visible
+
+    def update_perf(self, fps, worst_ms, free_kb):
+        """Update overlay digits, e.g.: 58fps 21ms 84k"""
+        field = self.perf_field
+        field.set_number(min(fps, 999), 0, 3)
+        field.set_number(min(worst_ms, 999), 7, 3)
+        field.set_number(min(free_kb, 999), 13, 3)
+
+    def update_i2c(self, bytes_per_frame, percent):
+        """Update the display traffic line, e.g.: 52B/f 5%"""
+        field = self.i2c_field
+        if field is not None:
+            field.set_number(min(bytes_per_frame, 9999), 0, 4)
+            field.set_number(min(percent, 999), 8, 3)
@@ -0,0 +1,131 @@
+import random
+
+from GameRules import ENEMY_SIZE
+from TileGenerator import (
+    DIRECTIONS,
+    FOOD_SAMPLER,
+    ENEMY_SAMPLER,
+    generate_random_directions,
+    roll_tile_counts,
+    sprite_rects,
+    summarize_tile_data,
+)
+
+# WorldGenerator.py
+
+
+# ================================
+# Portable random source
+# ================================
+class Rng:
+    """
+    Small xorshift32 generator with the subset of the random module API
+    the game uses. Gives the same sequence on the board and on the host.
+    """
+
+    def __init__(self, seed):
+        self.state = (seed & 0xFFFFFFFF) or 0x9E3779B9  # state must not be zero
+
+    def next(self):
+        x = self.state
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFFFFFF
+        self.state = x
+        return x
+
+    def random(self):
+        return self.next() / 4294967296
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            start, stop = 0, start
+        return start + self.next() % (stop - start)
+
+    def randint(self, a, b):
+        return a + self.next() % (b - a + 1)
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[self.next() % len(seq)]
+
+
+def mix32(h):
+    """Scramble a 32-bit integer (murmur3 finalizer)"""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & 0xFFFFFFFF
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & 0xFFFFFFFF
+    h ^= h >> 16
+    return h
+
+
+# ================================
+# Seeded world
+# ================================
+class WorldGenerator:
+    def __init__(self, seed=None):
+        """
+        seed: 32-bit world seed; a random one is picked if None.
+        Every tile is derived from (seed, tile index, entry direction),
+        so any tile can be rebuilt on demand without storing it.
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed & 0xFFFFFFFF
+
+    def tile_seed(self, tile_index, direction):
+        """Seed of the tile entered through `direction` as the tile_index-th tile"""
+        h = mix32(self.seed ^ ((tile_index * 0x9E3779B1) & 0xFFFFFFFF))
+        return mix32(h ^ (DIRECTIONS.index(direction) + 1))
+
+    def tile_rng(self, tile_index, direction):
+        return Rng(self.tile_seed(tile_index, direction))
+
+    def tile_data(self, tile_index, allowed_dirs):
+        """
+        Food/enemy counts of the neighbours of tile tile_index - 1.
+        Same return value as generate_tile_data(); each count comes from the
+        neighbour's own seed so it matches what build_tile() will spawn.
+        """
+        data = {}
+        for d in allowed_dirs:
+            food, enemy = roll_tile_counts(self.tile_rng(tile_index, d))
+            data[d] = {"food": food, "enemy": enemy}
+        food_max_dirs, enemy_max_dirs = summarize_tile_data(data, allowed_dirs)
+        return data, food_max_dirs, enemy_max_dirs
+
+    def build_tile(self, tile_index, hit_dir, food_box, enemy_box,
+                   num_foods=None, num_enemies=None):
+        """
+        Build the full layout of one tile.
+        food_box / enemy_box: spawn corners kept clear around the player
+            (TileGenerator.player_box() or entry_box())
+        num_foods / num_enemies: override the seeded counts (None keeps them)
+        Returns a dict with foods, enemies, allowed_dirs, tile_data,
+        food_max_dirs and enemy_max_dirs.
+        """
+        rng = self.tile_rng(tile_index, hit_dir)
+        food, enemy = roll_tile_counts(rng)
+        if num_foods is None:
+            num_foods = food
+        if num_enemies is None:
+            num_enemies = enemy
+
+        # Enemies first on their own grid; food skips the cells under them
+        enemies = ENEMY_SAMPLER.sample(num_enemies, rng, enemy_box)
+        foods = FOOD_SAMPLER.sample(num_foods, rng, food_box, sprite_rects(enemies, ENEMY_SIZE))
+
+        allowed_dirs = generate_random_directions(hit_dir, rng)
+        tile_data, food_max_dirs, enemy_max_dirs = self.tile_data(tile_index + 1, allowed_dirs)
+
+        return {
+            "foods": foods,
+            "enemies": enemies,
+            "allowed_dirs": allowed_dirs,
+            "tile_data": tile_data,
+            "food_max_dirs": food_max_dirs,
+            "enemy_max_dirs": enemy_max_dirs
+        }
@@ -1,59 +1,119 @@
 import os
 import json
 import time
-import math
 import board
 import busio
 import displayio
-import digitalio
 import neopixel
 import pwmio
 import random
 import terminalio
-from adafruit_display_text import label
+from adafruit_display_text import bitmap_label
 import i2cdisplaybus
 import adafruit_displayio_ssd1306
 import adafruit_adxl34x
-from filter import EMAFilterAccelerometer
+from filter import OneEuroFilterAccelerometer
 from rotary_encoder import RotaryEncoder
-from adafruit_debouncer import Debouncer
-from Enemy import Enemy
-from Food import Food
 from SignalController import SignalController
-from RotaryDecoder import RotaryDecoder
-from WallUtils import WallUtils
+from RotaryInput import RotaryInput
+from ButtonInput import ButtonInput
+from Dialogue import DialogueWidget
+from Story import Story
+from Leaderboard import Leaderboard
+from GameRules import FOOD_SIZE, ENEMY_SIZE, TILT_FILTER, tutorial_rules, normal_rules, boss_rules
+from Level import Level, Machine, clear
+from TileGenerator import generate_random_positions, sprite_rects
+from MemoryMonitor import MemoryMonitor, GcPolicy
+import Profiler
+import DirtyPages
+from Profiler import traced
+from LatencyProbe import LatencyProbe
+from Telemetry import Telemetry
+from IdleManager import IdleManager
+import Log
+from InputTrace import (
+    TraceRecorder, TraceReplayer, ReplayFinished, GAME_NORMAL, GAME_BOSS,
+    RecordingAccelerometer, RecordingRotary, RecordingButton,
+    ReplayAccelerometer, ReplayRotary, ReplayButton
+)
 
 
 # ================================
-# Screen parameters
+# Files & replay
 # ================================
-SCREEN_WIDTH = 128
-SCREEN_HEIGHT = 64
-BALL_SIZE = 5
-ENEMY_SIZE = 8
-WALL_OFFSET = 5
-
-# ================================
-# Physics simulation parameters
-# ================================
-ACC_SCALE = 0.3
-FRICTION = 0.90
-MAX_SPEED = 2.5
+# Screen and physics parameters live in GameRules (shared with tools/simulate.py)
 BIT_FILE = "/bit.txt"
 TIME_FILE = "time_survived.txt"
+HIGH_SCORE_COUNT = 3  # Endless-level times kept in TIME_FILE
+TELEMETRY_FILE = "/telemetry.bin"  # One record per level, read with tools/telemetry_report.py; None = off
+STORY_FILE = "/story.bin"  # Built from story.txt by tools/build_story.py
+WORLD_SEED = None  # Set to an int to replay the same world (e.g. for benchmarks)
+RECORD_FILE = None  # e.g. "/trace.bin": record gameplay input of every level
+REPLAY_FILE = None  # e.g. "/trace.bin": replay a recorded level instead of playing
+MEM_REPORT = False  # Print heap/GC statistics over serial after every level
+GC_THRESHOLD = None  # e.g. 8192: bytes between automatic collections during gameplay
+TRACE_FILE = None  # e.g. "/spans.bin": time loop stages, dumped after every level
+PAGE_STATS = False  # Count display bytes per frame by dirty SSD1306 page; perf overlay + log per level
+LATENCY_PROBE = False  # Time tilt steps from sensor read to refresh, reported after every level
+LONG_PRESS_TIME = 1.0  # Holding D9 this long during a level toggles the perf overlay
+ACCEL_INT_PIN = None  # e.g. board.D6 if wired to ADXL345 INT1: a shake wakes the end screen; None wakes every 0.25 s to check
+MAX_FOODS = 20  # Most food a tile can hold (TileGenerator.roll_tile_counts)
+MAX_ENEMIES = 3  # Most enemies a tile can hold, pooled like the food
+LOG_LEVEL = Log.INFO  # Log.DEBUG also shows enemy activations and saved files
+LOG_DEFERRED = True  # Hold log output until a safe point instead of printing mid-frame
+
+Log.configure(LOG_LEVEL, LOG_DEFERRED)
+
+# Span tracing must be on before the @traced functions below are defined
+if TRACE_FILE:
+    Profiler.enable()
+
+# Text fields and blinking enemies report redrawn pixels once this is on
+if PAGE_STATS:
+    DirtyPages.enable()
+
+# Stage timestamps from an ADXL345 sample to the refresh that moves the ball
+latency = LatencyProbe() if LATENCY_PROBE else None
+
+# Level records kept in RAM until save_telemetry()
+telemetry = Telemetry(TELEMETRY_FILE) if TELEMETRY_FILE else None
+
+# Heap high-water marks, per-frame allocation and GC pauses
+mem = MemoryMonitor(MEM_REPORT)
+# Collections run at tile crossings and dialogue screens, not mid-frame
+gc_policy = GcPolicy(mem, GC_THRESHOLD)
+
+
+def save_telemetry():
+    """Menus, end screen and halt: the only places level records are written to flash"""
+    if telemetry is not None:
+        telemetry.flush()
+
+
+# One dialogue screen reused by every display_lines() call
+dialogue = DialogueWidget()
+ARROW_BLINK_INTERVAL = 0.5  # "continue" arrow blinks every 0.5s
+MENU_POLL = 0.03  # Longest nap between knob checks in menus; a press ends it early
+# Dialogue script: only the section index stays in RAM
+story = Story(STORY_FILE)
+# Read once here; the game-over path only touches the copy in RAM
+leaderboard = Leaderboard(TIME_FILE, HIGH_SCORE_COUNT)
+
+# Game clock; swapped for the trace's frame clock while recording/replaying
+clock = time.monotonic
 
 # ================================
 # Rotary Encoder Setup
 # ================================
-rotary = RotaryDecoder(board.D7, board.D8, pulses_per_detent=3)
+# Counted in the background by rotaryio; update() returns detents since the last call
+rotary = RotaryInput(board.D7, board.D8, pulses_per_detent=3)
 
 # ================================
 # Button Setup (using D9)
 # ================================
-pin = digitalio.DigitalInOut(board.D9)
-pin.direction = digitalio.Direction.INPUT
-pin.pull = digitalio.Pull.UP
-button = Debouncer(pin)
+# Scanned and debounced in the background by keypad; update() collects the
+# queued press / release / long-press events
+button = ButtonInput(board.D9, long_press=LONG_PRESS_TIME)
 
 # ================================
 # OLED Setup
@@ -70,10 +130,11 @@ pixel_up_pin = board.D10
 pixel_down_pin = board.D0
 pixel_left_pin = board.D1
 pixel_right_pin = board.D2
-pixels_up = neopixel.NeoPixel(pixel_up_pin, 1, brightness=0.3, auto_write=True)
-pixels_down = neopixel.NeoPixel(pixel_down_pin, 1, brightness=0.3, auto_write=True)
-pixels_left = neopixel.NeoPixel(pixel_left_pin, 1, brightness=0.3, auto_write=True)
-pixels_right = neopixel.NeoPixel(pixel_right_pin, 1, brightness=0.3, auto_write=True)
+pixels_up = neopixel.NeoPixel(pixel_up_pin, 1, brightness=0.3, auto_write=False)
+pixels_down = neopixel.NeoPixel(pixel_down_pin, 1, brightness=0.3, auto_write=False)
+pixels_left = neopixel.NeoPixel(pixel_left_pin, 1, brightness=0.3, auto_write=False)
+pixels_right = neopixel.NeoPixel(pixel_right_pin, 1, brightness=0.3, auto_write=False)
+pixels = {"UP": pixels_up, "LEFT": pixels_left, "RIGHT": pixels_right, "DOWN": pixels_down}
 
 
 # ================================
@@ -84,8 +145,25 @@ BUZZER_PIN = board.D3
 # ================================
 # accelerometer Setup
 # ================================
-accel = EMAFilterAccelerometer(adafruit_adxl34x.ADXL345(i2c), alpha=0.3)
+# One-Euro: smooth while the board is held still, little lag on quick tilts.
+# Each level sets its own response from LevelRules.tilt_filter
+adxl = adafruit_adxl34x.ADXL345(i2c)
+sensor = adxl if latency is None else latency.wrap(adxl)
+accel = OneEuroFilterAccelerometer(sensor, *TILT_FILTER)
+
+# ================================
+# Idle: light sleep on static screens, deep sleep after the boss
+# ================================
+idle = IdleManager(display, button, adxl, ACCEL_INT_PIN)
 
+# ================================
+# Level engine (Level.py): everything a level reads and drives
+# ================================
+machine = Machine(display, pixels, accel, rotary, button, mem, gc_policy, clock,
+                  telemetry=telemetry, latency=latency,
+                  max_foods=MAX_FOODS, max_enemies=MAX_ENEMIES)
+
+@traced()
 def play_intro_animation():
     width = display.width
     height = display.height
@@ -94,7 +172,7 @@ def play_intro_animation():
     group = displayio.Group()
     display.root_group = group
 
-    title_text = label.Label(terminalio.FONT, text="The Devour", color=0xFFFFFF)
+    title_text = bitmap_label.Label(terminalio.FONT, text="The Devour", color=0xFFFFFF)
     title_text.anchor_point = (0.5, 0.5)
     title_text.anchored_position = (width // 2, height // 2)
     group.append(title_text)
@@ -157,7 +235,7 @@ def play_intro_animation():
     display.refresh(minimum_frames_per_second=0)
 
     # --- Stage 4: Draw black smiley face on white background ---
-    face_text = label.Label(terminalio.FONT, text="=)", color=0x000000)
+    face_text = bitmap_label.Label(terminalio.FONT, text="=)", color=0x000000)
     face_text.anchor_point = (0.5, 0.5)
     face_text.anchored_position = (width // 2, height // 2)
     group.append(face_text)
@@ -191,10 +269,11 @@ def load_game_data():
         # File does not exist
         return default_data
     except Exception as e:
-        print("read bit.txt error:", e)
+        Log.error("read bit.txt error: %s", e)
         return default_data
 
 
+@traced()
 def save_game_data(times, easyleft, mediumleft, hardleft, success):
     """Save current game data to bit.txt (overwrite file)."""
     data = {
@@ -215,67 +294,7 @@ def save_game_data(times, easyleft, mediumleft, hardleft, success):
     with open(BIT_FILE, "w") as f:
         json.dump(data, f)
         f.flush()
-    
-    # Optional: print saved content
-    with open(BIT_FILE, "r") as f:
-        print("Saved content:", f.read())
-
-
-# ================================
-# High Score Management
-# ================================
-def load_high_scores():
-    """Load high scores from TIME_FILE. Return default top-3 if file doesn't exist."""
-    default_scores = [
-        {"name": "__", "time": 0},
-        {"name": "__", "time": 0},
-        {"name": "__", "time": 0}
-    ]
-    try:
-        with open(TIME_FILE, "r") as f:
-            data = json.load(f)
-            # Ensure we have exactly 3 entries
-            for i in range(3):
-                if i >= len(data):
-                    data.append({"name": "__", "time": 0})
-                else:
-                    if "name" not in data[i]: data[i]["name"] = "__"
-                    if "time" not in data[i]: data[i]["time"] = 0
-            return data[:3]
-    except OSError:
-        return default_scores
-    except Exception as e:
-        print("read time_survived.txt error:", e)
-        return default_scores
-
-
-def save_high_scores(high_scores):
-    """Save high scores to TIME_FILE (overwrite file)."""
-    try:
-        # Remove existing file
-        try: os.remove(TIME_FILE)
-        except OSError: pass
-
-        with open(TIME_FILE, "w") as f:
-            json.dump(high_scores, f)
-            f.flush()
-        # Optional: print saved content
-        with open(TIME_FILE, "r") as f:
-            print("Saved high_scores:", f.read())
-    except Exception as e:
-        print("save high_scores error:", e)
-
-
-def update_high_scores(new_name, survived_time):
-    """Update high scores. Insert new score if it enters Top 3."""
-    high_scores = load_high_scores()
-    high_scores.append({"name": new_name, "time": survived_time})
-    # Sort descending by survived time
-    high_scores = sorted(high_scores, key=lambda x: x["time"], reverse=True)
-    # Keep top 3
-    high_scores = high_scores[:3]
-    save_high_scores(high_scores)
-    return high_scores
+    Log.debug("Saved content: %s", data)
 
 
 # ================================
@@ -294,7 +313,7 @@ def enter_name(group, font=terminalio.FONT):
     letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 
     # Display label
-    label_obj = label.Label(
+    label_obj = bitmap_label.Label(
         font,
         text=f"{letters[idx[0]]} {letters[idx[1]]}",
         color=0xFFFFFF,
@@ -302,24 +321,25 @@ def enter_name(group, font=terminalio.FONT):
     )
     group.append(label_obj)
 
-    while True:
-        step = rotary.update()
-        if step != 0:
-            idx[cur] = (idx[cur] + step) % 26
-            label_obj.text = f"{letters[idx[0]]} {letters[idx[1]]}"
+    with idle.static_screen():
+        while True:
+            step = rotary.update()
+            if step != 0:
+                idx[cur] = (idx[cur] + step) % 26
+                label_obj.text = f"{letters[idx[0]]} {letters[idx[1]]}"
+                idle.refresh()
 
-        display.refresh(minimum_frames_per_second=0)
-        
-        button.update()
-        if button.fell:
-            time.sleep(0.2)
-            if cur == 0:
-                cur = 1
-            else:
-                # Finished input
-                name = letters[idx[0]] + letters[idx[1]]
-                group.remove(label_obj)
-                return name
+            button.update()
+            if button.fell:
+                if cur == 0:
+                    cur = 1
+                else:
+                    # Finished input
+                    name = letters[idx[0]] + letters[idx[1]]
+                    group.remove(label_obj)
+                    return name
+
+            idle.nap(MENU_POLL)
 
 
 # ================================
@@ -350,117 +370,10 @@ def typing_sound(num_taps=20):
         play_tone(freq, duration)
 
 
-# ================================
-# Shake Detection
-# ================================
-SHAKE_THRESHOLD = 1.5  # g units
-SHAKE_COOLDOWN = 0.5   # seconds
-last_shake_time = 0
-
-def detect_shake(ax, ay, az):
-    """
-    Detect shake motion from accelerometer readings.
-    Returns True if shake detected.
-    """
-    global last_shake_time
-    now = time.monotonic()
-    accel_magnitude = math.sqrt(ax*ax + ay*ay + az*az)
-
-    if accel_magnitude > SHAKE_THRESHOLD and (now - last_shake_time) > SHAKE_COOLDOWN:
-        last_shake_time = now
-        return True
-    return False
-
-
-# ================================
-# Random Positions & Collision
-# ================================
-def generate_random_positions(player_x, player_y, n, margin=15):
-    """
-    Generate n random coordinates ensuring:
-    1. Distance from player is at least `margin` pixels
-    2. Distance from wall is at least WALL_OFFSET pixels
-    """
-    positions = []
-    attempts = 0
-    max_attempts = n * 20  # prevent infinite loop
-
-    while len(positions) < n and attempts < max_attempts:
-        attempts += 1
-        x = random.randint(WALL_OFFSET + ENEMY_SIZE, SCREEN_WIDTH - WALL_OFFSET - ENEMY_SIZE)
-        y = random.randint(WALL_OFFSET + ENEMY_SIZE, SCREEN_HEIGHT - WALL_OFFSET - ENEMY_SIZE)
-
-        # Skip if too close to player
-        if abs(x - player_x) < margin and abs(y - player_y) < margin:
-            continue
-
-        # Acceptable, add to list
-        positions.append((x, y))
-
-    if len(positions) < n:
-        print("Warning: not enough food")
-    
-    return positions
-
-
-def check_direction_collision(x, y):
-    """Check if the ball hits UP / DOWN / LEFT / RIGHT wall based on its position"""
-    if y <= WALL_OFFSET:
-        return "UP"
-    if y >= SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET:
-        return "DOWN"
-    if x <= WALL_OFFSET:
-        return "LEFT"
-    if x >= SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET:
-        return "RIGHT"
-    return None
-
-
-def enter_next_tile(hit_dir, x, y):
-    """Teleport the ball to the opposite side based on collision direction"""
-    if hit_dir == "UP":
-        y = SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET - BALL_SIZE/2
-    elif hit_dir == "DOWN":
-        y = WALL_OFFSET + BALL_SIZE/2
-    elif hit_dir == "LEFT":
-        x = SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET - BALL_SIZE/2
-    elif hit_dir == "RIGHT":
-        x = WALL_OFFSET + BALL_SIZE/2
-    
-    return x, y
-
-
 # ================================
 # Menu / Text Display
 # ================================
-def split_text_to_lines(text, max_chars_per_line=16):
-    """Split long text into multiple lines, each line <= max_chars_per_line"""
-    words = text.split(' ')
-    lines = []
-    current_line = ""
-    for word in words:
-        if len(current_line + ' ' + word) <= max_chars_per_line:
-            if current_line:
-                current_line += ' ' + word
-            else:
-                current_line = word
-        else:
-            lines.append(current_line)
-            current_line = word
-    if current_line:
-        lines.append(current_line)
-    return lines
-
-
-def refresh_display(option_labels, options, selection):
-    """Update menu display to highlight the current selection"""
-    for idx, lbl in enumerate(option_labels):
-        if idx == selection:
-            lbl.text = "> " + options[idx] + " <"
-        else:
-            lbl.text = "  " + options[idx] + "  "
-            
-
+@traced()
 def display_lines(num_lines, options, with_typing_sound=False):
     """
     Display menu or dialogue options.
@@ -469,115 +382,76 @@ def display_lines(num_lines, options, with_typing_sound=False):
 
     Returns: selected line index (0-based)
     """
-    group = displayio.Group()
-    option_labels = []
-
-    # vertical positioning
-    y_start = 22
-    line_height = 12
-    current_y = y_start
-
-    for i, text in enumerate(options):
-        # split lines if too long
-        lines = split_text_to_lines(text, max_chars_per_line=16)
-        for j, line_text in enumerate(lines):
-            lbl = label.Label(
-                terminalio.FONT,
-                text=line_text,
-                anchored_position=(64, current_y),
-                anchor_point=(0.5, 0.5)
-            )
-            option_labels.append(lbl)
-            group.append(lbl)
-            current_y += line_height
-
-        if num_lines == 1 and i == 0:
-            arrow_label = label.Label(
-                terminalio.FONT,
-                text="v",
-                anchored_position=(110, current_y),
-                anchor_point=(0.5, 0.5)
-            )
-            group.append(arrow_label)
-
-            arrow_last_toggle = time.monotonic()
-            arrow_visible = True
-            ARROW_BLINK_INTERVAL = 0.5  # blink every 0.5s
-
-    display.root_group = group
+    line_text = dialogue.show(options, arrow=num_lines == 1)
+    display.root_group = dialogue.group
 
     if with_typing_sound:
         num_words = len(line_text.split())
         taps = max(1, num_words)
         typing_sound(taps)
 
-    # single line logic: wait for button press
+    # The screen is static until the player reacts: a good time to collect
+    machine.safe_point()
+
+    # single line logic: sleep until the button or the next arrow blink
     if num_lines == 1:
-        while True:
-            now = time.monotonic()
-            if now - arrow_last_toggle > ARROW_BLINK_INTERVAL:
-                arrow_last_toggle = now
-                arrow_visible = not arrow_visible
-                arrow_label.text = "v" if arrow_visible else ""
-            button.update()
-            if button.fell:
-                return 0
-            time.sleep(0.01)
+        arrow = dialogue.arrow
+        arrow_last_toggle = time.monotonic()
+        with idle.static_screen():
+            while True:
+                button.update()
+                if button.fell:
+                    return 0
+                now = time.monotonic()
+                if now - arrow_last_toggle >= ARROW_BLINK_INTERVAL:
+                    arrow_last_toggle = now
+                    arrow.hidden = not arrow.hidden
+                    idle.refresh()
+                idle.nap(arrow_last_toggle + ARROW_BLINK_INTERVAL - now)
 
     # multi-line logic: use rotary to select
+    rotary.drain()  # Drop turns made before the menu appeared
     selection = 0
-    refresh_display(option_labels, options, selection)  # initialize display
+    dialogue.select(options, selection)  # initialize display
 
-    while True:
-        move = rotary.update()
-        if move != 0:
-            selection = (selection + move) % num_lines
-            refresh_display(option_labels, options, selection)
+    with idle.static_screen():
+        while True:
+            move = rotary.update()
+            if move != 0:
+                selection = (selection + move) % num_lines
+                dialogue.select(options, selection)
+                idle.refresh()
 
-        button.update()
-        if button.fell:
-            time.sleep(0.2)
-            return selection
+            button.update()
+            if button.fell:
+                return selection
 
-        time.sleep(0.01)
+            idle.nap(MENU_POLL)
 
 
-def clear(group):
-    """Clear all items from a display group"""
-    for i in range(len(group)):
-        group.pop()
-    return
+def tell(key, sound=False, *args):
+    """
+    Play one section of the story, one screen per line.
+    args: values for %d / %s placeholders in the section
+    Returns the typing sound flag (a section can switch it on with @sound).
+    """
+    for line in story.lines(key):
+        if line == "@sound":
+            sound = True
+        elif line == "@boss":
+            run_game("Boss", 0, 0, sound)
+        else:
+            if args and "%" in line:
+                line = line % args
+            display_lines(1, [line], sound)
+    return sound
 
 
 def turn_off_all_lights(controllers):
     """Turn off all light controllers"""
     for ctrl in controllers.values():
         ctrl.stop()
-
-
-def generate_tile_data(allow_dir):
-    """
-    Generate enemy and food counts for four directions:
-    Food: 5~20, Enemy: 0~3
-    Also returns: direction(s) with most food and direction(s) with most enemies
-    """
-    data = {}
-
-    # Generate data
-    for d in allow_dir:
-        data[d] = {   
-            "food": random.randint(5, 20),
-            "enemy": random.randint(0, 3)
-        }
-
-    # ---- Find directions with maximum values ----
-    max_food = max(data[d]["food"] for d in allow_dir)
-    max_enemy = max(data[d]["enemy"] for d in allow_dir)
-
-    food_max_dirs = [d for d in allow_dir if data[d]["food"] == max_food]
-    enemy_max_dirs = [d for d in allow_dir if data[d]["enemy"] == max_enemy]
-
-    return data, food_max_dirs, enemy_max_dirs
+    SignalController.render_all(controllers, clock())
 
 
 def choose_difficulty(Easy_left, Medium_left, Hard_left, sound):
@@ -625,9 +499,11 @@ def end_game(sound):
     """
     Handle game over:
     1. Display options: Continue or End Game
-    2. If End Game is selected, clear OLED and enter shake detection loop
+    2. If End Game is selected, turn the OLED off and sleep until a shake
     3. If shake is detected, return True to indicate game can restart
     """
+    save_telemetry()
+
     # Display menu options
     choice = display_lines(2, ["Continue", "End Game"], sound)
     
@@ -640,724 +516,233 @@ def end_game(sound):
         display.root_group = displayio.Group()  # Clear screen
         display.refresh()
         
-        # Continuous shake detection
-        while True:
-            ax, ay, az = accel.read_filtered()
-            if accel.detect_shake(x=ax, y=ay, z=az):
-                choice = display_lines(1, ["Hey you're back! Let's continue :D"], sound)
-                return 
-            time.sleep(0.05)  # Prevent high CPU usage
+        # Light sleep until the ADXL345 reports activity (or D9 is pressed)
+        idle.wait_motion()
+        choice = display_lines(1, ["Hey you're back! Let's continue :D"], sound)
+        return
 
         
 
 def run_game(mode, choice, times, sound):
     """Main game entry point. """
     if mode == "Tutorial":
-        return tutorial_game()
+        result = tutorial_game()
+    elif RECORD_FILE:
+        result = record_game(mode, choice, times, sound, RECORD_FILE)
     elif mode == "Boss":
-        return boss_game()
-    else:
-        return normal_game(choice, times, sound)
-         
-
-def tutorial_game(): 
-    group = displayio.Group()
-    wall_utils = WallUtils()
-    
-    lives = 3
-    wall_utils.draw_lives(group, lives)
-    current_dir = "UP"
-    shield_dirs = ["UP", "LEFT", "RIGHT", "DOWN"]
-    protected = False  # Whether player is protected
-    
-    foods = []          # List of food items currently on screen
-    score = 0           # Player score
-
-    # Create ball bitmap
-    bitmap = displayio.Bitmap(BALL_SIZE, BALL_SIZE, 1)
-    palette = displayio.Palette(1)
-    palette[0] = 0xFFFFFF
-    ball_tile = displayio.TileGrid(bitmap, pixel_shader=palette)
-
-    group.append(ball_tile)
-    display.root_group = group
-
-    # Initial ball state
-    x = SCREEN_WIDTH // 2
-    y = SCREEN_HEIGHT // 2
-    vx = 0.0
-    vy = 0.0
-
-    # Generate allowed directions for the first tile
-    allowed_dirs = wall_utils.generate_random_directions("UP")
-    wall_utils.draw_block_walls(group, allowed_dirs)
-    wall_utils.draw_score(group, initial_score=0)
-    
-    tile_count = 0
-    enemy = []   # List of enemies not yet spawned
-    
-    while True:
-        # --- Update speed & position ---
-        ax, ay, az = accel.read_filtered()
-        vx += ax * ACC_SCALE
-        vy -= ay * ACC_SCALE
-
-        vx = max(-MAX_SPEED, min(MAX_SPEED, vx))
-        vy = max(-MAX_SPEED, min(MAX_SPEED, vy))
-        vx *= FRICTION
-        vy *= FRICTION
-
-        x += vx
-        y += vy
-
-        # Boundary hard limits
-        x = max(WALL_OFFSET, min(SCREEN_WIDTH - BALL_SIZE-WALL_OFFSET, x))
-        y = max(WALL_OFFSET, min(SCREEN_HEIGHT - BALL_SIZE-WALL_OFFSET, y))
-
-        # Update ball position
-        ball_tile.x = int(x)
-        ball_tile.y = int(y)
-
-        # --- Check for collisions with walls ---
-        hit_dir = check_direction_collision(x, y)
-
-        if hit_dir:
-            if hit_dir in allowed_dirs:
-                # Allowed direction: move to next tile
-                x, y = enter_next_tile(hit_dir, x, y)
-                ball_tile.x = int(x)
-                ball_tile.y = int(y)
-                
-                tile_count += 1
-                
-                # Remove existing food objects from display
-                if len(foods) > 0:
-                    for food_obj in foods:
-                        if food_obj.tile in group:
-                            group.remove(food_obj.tile)
-                
-                # Generate food after passing 2 tiles
-                if tile_count >= 2:
-                    if tile_count == 2:
-                        display_lines(1, ["Get some scores"])
-                        display.root_group = group
-                    num_foods = random.randint(1, 5)  # Random number 1~5
-                    rand_positions = generate_random_positions(x, y, num_foods, margin=10)
-                    foods = [Food(group, SCREEN_WIDTH, SCREEN_HEIGHT) for _ in range(num_foods)]
-                    # Assign positions to food objects
-                    for food_obj, (fx, fy) in zip(foods, rand_positions):
-                        food_obj.x = fx
-                        food_obj.y = fy
-                        food_obj.tile.x = fx
-                        food_obj.tile.y = fy
-                        if food_obj.tile not in group:
-                            group.append(food_obj.tile)
-                
-                # Remove existing enemies from display
-                if len(enemy) > 0:
-                    for e in enemy:
-                        if e.tile in group:
-                            group.remove(e.tile)
-                    enemy = []
-                
-                # Spawn enemies after 4 tiles
-                if tile_count == 6:
-                    display_lines(1, ["Be careful"])
-                    display.root_group = group
-                    rand_positions = generate_random_positions(x, y, 1)
-                    enemy = [Enemy(group, px, py, size=8, style="spiky_circle", teeth_count=12) for px, py in rand_positions]
-                
-                # Spawn random enemies after 6 tiles
-                if tile_count > 6:
-                    num_enemies = random.randint(0, 3)
-                    rand_positions = generate_random_positions(x, y, num_enemies)
-                    enemy = [Enemy(group, px, py, size=8, style="spiky_circle", teeth_count=12) for px, py in rand_positions]
-
-                # Tutorial messages and level completion
-                if tile_count == 8:
-                    display_lines(1, ["Get specific scores to beat the level"])
-                    display_lines(1, ["10 will be enough"])
-                    display.root_group = group
-                    if score >= 10:
-                        # Clear screen
-                        for i in range(len(group)):
-                            group.pop()
-                        display_lines(1, ["Actually you've achieved it"])
-                        display_lines(1, ["You did a great job :)"])
-                        return
-                if tile_count > 8 and score >= 10:
-                    for i in range(len(group)):
-                        group.pop()
-                    display_lines(1, ["Congratulations"])
-                    return
-                
-                # Generate allowed directions for next tile
-                allowed_dirs = wall_utils.generate_random_directions(hit_dir)
-                wall_utils.draw_block_walls(group, allowed_dirs)
-        
-        # Check if player collects food
-        for food_obj in foods[:]:
-            if food_obj.check_collision(x, y, BALL_SIZE):
-                score += food_obj.points
-                wall_utils.update_score(score)
-                foods.remove(food_obj)
-        
-        # Player shield logic
-        if protected:
-            move = rotary.update()  # Only returns 0 or 1
-            if move != 0:
-                dirs = ["UP", "RIGHT", "DOWN", "LEFT"]
-                idx = dirs.index(current_dir)
-                current_dir = dirs[(idx + 1) % 4]  # Rotate clockwise by 1
-                shield_dirs = [current_dir]
-                wall_utils.draw_player_shields(group, x, y, shield_dirs)
-            wall_utils.update_shields_position(x, y)
-
-        # Enemy behavior
-        if len(enemy) > 0:
-            for e in enemy:
-                e.check_activation(x, y)
-                e.update(x, y)
-                # Check if enemy hits shield
-                if e.check_hit_shield(wall_utils.shield_list):
-                    group.remove(e.tile)
-                    enemy.remove(e)
-                    continue
-                # Check collision with player
-                if e.has_collision(x, y, BALL_SIZE) and not protected:
-                    wall_utils.draw_lives(group, lives)
-                    display_lines(1, ["If life gets zero, the game is over."])
-                    display_lines(1, ["It's just a simulation. They are not harmful."])
-                    display_lines(1, ["Use my weapon to eliminate them"])
-                    display_lines(1, ["Spin the button to change direction"])
-                    display.root_group = group 
-                    shield_dirs = [current_dir]
-                    wall_utils.draw_player_shields(group, x, y, shield_dirs)
-                    protected = True
-                
-        time.sleep(0.015)
-
-
-
-def normal_game(mode, times, sound):
-    # Initialize parameters
-    if mode == 0:
-        time_limit = 60
-        lives = 5
-    elif mode == 1:
-        time_limit = 40
-        lives = 3
+        result = boss_game()
     else:
-        time_limit = 30
-        lives = 1
-    
-    target_score = 1
-    if times == 20:
-        time_limit = 1000
-        target_score = 1000
-        display_lines(1, ["RUN! =D"], sound)
-    
-    start_time = time.monotonic()
-
-    group = displayio.Group()
-    wall_utils = WallUtils()
+        result = normal_game(choice, times, sound)
+    mem.report()
+    if TRACE_FILE:
+        Profiler.dump(TRACE_FILE)
+    if latency is not None:
+        latency.report()
+    if DirtyPages.tracker is not None:
+        DirtyPages.tracker.report()
+    Log.flush()
+    return result
 
-    wall_utils.draw_lives(group, lives)
-    # Initialize countdown display
-    wall_utils.draw_countdown(group, time_limit)
-    
-    current_dir = "UP"
-    shield_dirs = ["UP", "LEFT", "RIGHT", "DOWN"]
-    
-    foods = []          # List of food items currently on screen
-    score = 0           # Player score
 
-    # Create ball bitmap
-    bitmap = displayio.Bitmap(BALL_SIZE, BALL_SIZE, 1)
-    palette = displayio.Palette(1)
-    palette[0] = 0xFFFFFF
-    ball_tile = displayio.TileGrid(bitmap, pixel_shader=palette)
-
-    group.append(ball_tile)
-    display.root_group = group
-
-    # Initial ball state
-    x = SCREEN_WIDTH // 2
-    y = SCREEN_HEIGHT // 2
-    vx = 0.0
-    vy = 0.0
-    
-    allowed_dirs = wall_utils.generate_random_directions("UP")
-    wall_utils.draw_block_walls(group, allowed_dirs)
-    wall_utils.draw_score(group, initial_score=0)
-    
-    if times > 6:
-        wall_utils.draw_player_shields(group, x, y, [current_dir])
-    
-    tile_count = 0
-    enemy = []   # List of enemies not yet spawned
-    invincible = False
-    invincible_end_time = 0
-    blink_state = True
-    blink_timer = 0
-    # Light controllers initialization
-    controllers = {
-        "UP": SignalController(pixels_up),
-        "LEFT": SignalController(pixels_left),
-        "RIGHT": SignalController(pixels_right),
-        "DOWN": SignalController(pixels_down)
-    }
-    # ======== Generate random number of enemies/food for four directions ========
-    num_foods = 10 # init
-    rand_positions = generate_random_positions(x, y, num_foods, margin=10)
-    foods = [Food(group, SCREEN_WIDTH, SCREEN_HEIGHT) for _ in range(num_foods)]
-    # Assign generated positions to each Food object
-    for food_obj, (fx, fy) in zip(foods, rand_positions):
-        food_obj.x = fx
-        food_obj.y = fy
-        food_obj.tile.x = fx
-        food_obj.tile.y = fy
-        if food_obj.tile not in group:
-            group.append(food_obj.tile)
-    
-    if len(enemy) > 0:  # Remove existing enemies from display
-        for e in enemy:
-            if e.tile in group:
-                group.remove(e.tile)
-        enemy = []  # Clear list
-        
-    # Spawn enemies
-    num_enemies = 1
-    rand_positions = generate_random_positions(x, y, num_enemies)
-    # Create enemy list
-    enemy = [Enemy(group, px, py, size=8, speed=0.1 + times*0.1 , activate_dist=10 + 2 * times, style="spiky_circle", teeth_count=12) for px, py in rand_positions]
-    
-    tile_data, food_max_dirs, enemy_max_dirs  = generate_tile_data(allowed_dirs)
-    # Light indicators
-    if times > 3:
-        SignalController.direction_signal(food_max_dirs, enemy_max_dirs, controllers)
+# ================================
+# Input Recording & Replay
+# ================================
+recorder = None  # Active TraceRecorder, if any
+
+
+def use_inputs(new_accel, new_rotary, new_button, new_clock):
+    """Swap the input sources read by the game loops; returns the old ones"""
+    global accel, rotary, button, clock
+    old = (accel, rotary, button, clock)
+    accel, rotary, button, clock = new_accel, new_rotary, new_button, new_clock
+    machine.accel = new_accel
+    machine.rotary = new_rotary
+    machine.button = new_button
+    machine.clock = new_clock
+    return old
+
+
+def record_game(mode, choice, times, sound, path):
+    """Play one level while logging its input and seed to a trace file"""
+    global recorder
+    seed = WORLD_SEED if WORLD_SEED is not None else random.getrandbits(32)
+    game = GAME_BOSS if mode == "Boss" else GAME_NORMAL
+    recorder = TraceRecorder(path, seed, choice, times, game)
+    old = use_inputs(
+        RecordingAccelerometer(accel, recorder),
+        RecordingRotary(rotary, recorder),
+        RecordingButton(button, recorder),
+        recorder.clock
+    )
+    try:
+        if game == GAME_BOSS:
+            return boss_game(seed)
+        return normal_game(choice, times, sound, seed)
+    finally:
+        use_inputs(*old)
+        recorder.close()
+        recorder = None
+
+
+def replay_game(path):
+    """Feed a recorded trace back into normal_game/boss_game and report frame times"""
+    replayer = TraceReplayer(path)
+    napping = idle.enabled
+    idle.enabled = False   # Recorded presses come from the trace, not the pin
+    old = use_inputs(
+        ReplayAccelerometer(replayer),
+        ReplayRotary(replayer),
+        ReplayButton(replayer),
+        replayer.clock
+    )
+    result = None
+    try:
+        if replayer.game == GAME_BOSS:
+            result = boss_game(replayer.seed)
+        else:
+            result = normal_game(replayer.mode, replayer.times, False, replayer.seed)
+    except ReplayFinished:
+        Log.warn("Trace ended before the level did")
+    finally:
+        use_inputs(*old)
+        idle.enabled = napping
+    replayer.report()
+    return result
+
+
+def halt():
+    """Stop here for good (boss endings): deep sleep until D9 restarts the game"""
+    if recorder is not None:
+        recorder.close()
+    mem.report()
+    if TRACE_FILE:
+        Profiler.dump(TRACE_FILE)
+    save_telemetry()
+    Log.flush()
+    idle.power_off()
+         
 
-    while True:
-        # --- Update countdown ---
-        elapsed = time.monotonic() - start_time
-        remaining_time = max(0, int(time_limit - elapsed))
-        wall_utils.update_countdown(remaining_time)
-        
-        if remaining_time <= 0:
-            clear(group)
-            if times == 20:
-                display_lines(1, ["That's..unexpected....:o"], sound)
-            else:
-                display_lines(1, ["Time's up!"], sound)
-                display_lines(1, ["Try again, I believe in you"], sound)
-            turn_off_all_lights(controllers)
-            return False
-        
-        # --- Invincibility blink logic ---
-        if invincible:
-            now = time.monotonic()
-            # End invincibility after timeout
-            if now >= invincible_end_time:
-                invincible = False
-                ball_tile.hidden = False  # Restore visibility
-            else:
-                # Toggle blink state every 0.15 seconds
-                if now - blink_timer > 0.15:
-                    blink_timer = now
-                    blink_state = not blink_state
-                    ball_tile.hidden = blink_state
-
-        # --- Update speed & position ---
-        ax, ay, az = accel.read_filtered()
-        vx += ax * ACC_SCALE
-        vy -= ay * ACC_SCALE
-
-        vx = max(-MAX_SPEED, min(MAX_SPEED, vx))
-        vy = max(-MAX_SPEED, min(MAX_SPEED, vy))
-        vx *= FRICTION
-        vy *= FRICTION
-
-        x += vx
-        y += vy
-
-        # Boundary hard limits
-        x = max(WALL_OFFSET, min(SCREEN_WIDTH - BALL_SIZE-WALL_OFFSET, x))
-        y = max(WALL_OFFSET, min(SCREEN_HEIGHT - BALL_SIZE-WALL_OFFSET, y))
-
-        # Update ball position
-        ball_tile.x = int(x)
-        ball_tile.y = int(y)
-
-        # --- Check for collisions with walls ---
-        hit_dir = check_direction_collision(x, y)
-        
-        if hit_dir:
-            if hit_dir in allowed_dirs:
-                # Allowed direction: move to next tile
-                x, y = enter_next_tile(hit_dir, x, y)
-                ball_tile.x = int(x)
-                ball_tile.y = int(y)
-
-                # Food handling
-                if len(foods) > 0:
-                    for food_obj in foods:
-                        if food_obj.tile in group:
-                            group.remove(food_obj.tile)
-                
-                num_foods = tile_data[hit_dir]["food"]
-                rand_positions = generate_random_positions(x, y, num_foods, margin=10)
-                foods = [Food(group, SCREEN_WIDTH, SCREEN_HEIGHT) for _ in range(num_foods)]
-                for food_obj, (fx, fy) in zip(foods, rand_positions):
-                    food_obj.x = fx
-                    food_obj.y = fy
-                    food_obj.tile.x = fx
-                    food_obj.tile.y = fy
-                    if food_obj.tile not in group:
-                        group.append(food_obj.tile)
-                
-                # Remove existing enemies from display
-                if len(enemy) > 0:
-                    for e in enemy:
-                        if e.tile in group:
-                            group.remove(e.tile)
-                    enemy = []
-                    
-                # Enemy handling
-                num_enemies = tile_data[hit_dir]["enemy"]
-                if times == 20:
-                    num_enemies = 1
-                rand_positions = generate_random_positions(x, y, num_enemies)
-                enemy = [Enemy(group, px, py, size=8, speed=0.1 + times*0.1 , activate_dist=10 + 2 * times, style="spiky_circle", teeth_count=12) for px, py in rand_positions]
-                
-                # Generate allowed directions for next tile
-                allowed_dirs = wall_utils.generate_random_directions(hit_dir)
-                wall_utils.draw_block_walls(group, allowed_dirs)
-                # ======== Generate random number of enemies/food for four directions ========
-                tile_data, food_max_dirs, enemy_max_dirs  = generate_tile_data(allowed_dirs)
-                # Light indicators for new tile
-                if times > 3:
-                    SignalController.direction_signal(food_max_dirs, enemy_max_dirs, controllers)
-        
-        # Check target score reached
-        if score >= target_score:
+# ================================
+# Game Modes
+# ================================
+def tutorial_enemies(level, n):
+    """Enemy spawns kept off the food already on the tile"""
+    foods = sprite_rects([(f.x, f.y) for f in level.foods], FOOD_SIZE)
+    return generate_random_positions(level.x, level.y, n, size=ENEMY_SIZE, avoid=foods)
+
+
+def tutorial_tile(level, tile_count):
+    """Scripted spawns and lessons of the tutorial; True ends it"""
+    group = level.group
+
+    # Generate food after passing 2 tiles
+    if tile_count >= 2:
+        if tile_count == 2:
+            tell("tutorial_food")
+            display.root_group = group
+        num_foods = random.randint(1, 5)  # Random number 1~5
+        level.spawn_foods(generate_random_positions(level.x, level.y, num_foods, margin=10))
+
+    # Spawn enemies after 4 tiles
+    if tile_count == 6:
+        tell("tutorial_enemy")
+        display.root_group = group
+        level.spawn_enemies(tutorial_enemies(level, 1))
+
+    # Spawn random enemies after 6 tiles
+    if tile_count > 6:
+        num_enemies = random.randint(0, 3)
+        level.spawn_enemies(tutorial_enemies(level, num_enemies))
+
+    # Tutorial messages and level completion
+    if tile_count == 8:
+        tell("tutorial_goal")
+        display.root_group = group
+        if level.score >= 10:
             clear(group)
-            if times == 20:
-                display_lines(1, ["That's..unexpected....:o"], sound)
-            else:
-                display_lines(1, ["Congratulations"], sound)
-                display_lines(1, [f"You still get {remaining_time} seconds left. Wonderful!"], sound)
-            turn_off_all_lights(controllers)
+            tell("tutorial_done_early")
             return True
-        
-        # Check if player collects food
-        for food_obj in foods[:]:
-            if food_obj.check_collision(x, y, BALL_SIZE):
-                score += food_obj.points
-                wall_utils.update_score(score)
-                foods.remove(food_obj)
-        
-        if times > 6:
-            move = rotary.update()  # Only returns 0 or 1
-            if move != 0:  # Rotate clockwise one step
-                dirs = ["UP", "RIGHT", "DOWN", "LEFT"]
-                idx = dirs.index(current_dir)
-                current_dir = dirs[(idx + 1) % 4]
-                shield_dirs = [current_dir]
-                wall_utils.draw_player_shields(group, x, y, shield_dirs)
-            wall_utils.update_shields_position(x, y)
-
-        # Enemy logic
-        if len(enemy) > 0:
-            for e in enemy:
-                e.check_activation(x, y)
-                e.update(x, y)
-
-                # Check if enemy hits shield
-                if e.check_hit_shield(wall_utils.shield_list):
-                    group.remove(e.tile)
-                    enemy.remove(e)
-                    continue
-
-                # Player invincible
-                if invincible:
-                    continue
-
-                # Enemy collides with player
-                if e.has_collision(x, y, BALL_SIZE):
-                    lives -= 1
-                    if lives == 0:
-                        clear(group)
-                        if times == 20:
-                            survived_time = time.monotonic() - start_time
-                            display_lines(1, ["I won XD"], sound)
-                            high_scores = load_high_scores()
-                            # Check if new high score
-                            if survived_time > min(h["time"] for h in high_scores):
-                                display_lines(1, ["Oh you survived the longest =)"], sound)
-                                display_lines(1, ["What's your name"], sound)
-                                display.root_group = group
-                                new_name = enter_name(group)
-                                high_scores = update_high_scores(new_name, survived_time)
-                                # Display leaderboard
-                                for i, entry in enumerate(high_scores):
-                                    display_lines(1, [f"{entry['name']}: {entry['time']}"], sound)
-                        else:
-                            display_lines(1, ["I'm out of strength"], sound)
-                            display_lines(1, ["Try again, I believe in you"], sound)
-                        turn_off_all_lights(controllers)
-                        return False
-                        
-                    wall_utils.draw_lives(group, lives)
-
-                    # Trigger 3-second invincibility
-                    invincible = True
-                    invincible_end_time = time.monotonic() + 3
-                    blink_timer = time.monotonic()
-                    blink_state = False
-                    ball_tile.hidden = True  # Start blinking immediately
-                    continue
-
-        time.sleep(0.015)
-
-
-def boss_game():
-    # ==============================
-    # Initialize boss game parameters
-    # ==============================
-    time_limit = 60
-    lives = 10
-    start_time = time.monotonic()
+    if tile_count > 8 and level.score >= 10:
+        clear(group)
+        tell("tutorial_done")
+        return True
+    return False
 
-    group = displayio.Group()
-    wall_utils = WallUtils()
-  
-    # Draw initial player lives
-    wall_utils.draw_lives(group, lives)
-    # Draw countdown timer
-    wall_utils.draw_countdown(group, time_limit)
-
-    # Create the player ball
-    bitmap = displayio.Bitmap(BALL_SIZE, BALL_SIZE, 1)
-    palette = displayio.Palette(1)
-    palette[0] = 0xFFFFFF
-    ball_tile = displayio.TileGrid(bitmap, pixel_shader=palette)
-
-    group.append(ball_tile)
-    display.root_group = group
 
-    # Initial ball position and velocity
-    x, y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-    vx, vy = 0.0, 0.0
-
-    # Generate allowed directions and draw walls
-    allowed_dirs = wall_utils.generate_random_directions("UP")
-    wall_utils.draw_block_walls(group, allowed_dirs)
-
-    tile_count = 0
-    enemy = []  # Regular enemies
-    chaser_enemy = Enemy(
-        group, 
-        20, 
-        20, 
-        size=8,
-        speed=1,
-        activate_dist=150,
-        style="blink_circle"
-    )
+def tutorial_hit(level):
+    """First touch of an enemy teaches the shield instead of costing a life"""
+    if level.shield_on:
+        return
+    level.wall_utils.draw_lives(level.group, level.lives)
+    tell("tutorial_hit")
+    display.root_group = level.group
+    level.wall_utils.draw_player_shields(level.group, level.x, level.y, [level.shield_dir])
+    level.shield_on = True
 
-    # Invincibility state variables
-    invincible = False
-    invincible_end_time = 0
-    blink_state = True
-    blink_timer = 0
-
-    # Initialize directional light controllers
-    controllers = {
-        "UP": SignalController(pixels_up),
-        "LEFT": SignalController(pixels_left),
-        "RIGHT": SignalController(pixels_right),
-        "DOWN": SignalController(pixels_down)
-    }
-    # Initial white blink for all directions
-    for ctrl in controllers.values():
-        ctrl.pixel.fill((255, 255, 255))
 
-    # Generate initial tile data for enemies/foods
-    tile_data, food_max_dirs, enemy_max_dirs = generate_tile_data(allowed_dirs)
+def tutorial_game():
+    Level(machine, tutorial_rules(), on_tile=tutorial_tile, on_hit=tutorial_hit).run()
 
-    display.root_group = group
 
-    # ==============================
-    # Main game loop
-    # ==============================
-    while True:
-        # --- Update countdown timer ---
-        elapsed = time.monotonic() - start_time
-        remaining_time = max(0, int(time_limit - elapsed))
-        wall_utils.update_countdown(remaining_time)
+def normal_game(mode, times, sound, seed=WORLD_SEED):
+    if times == 20:
+        tell("endless_start", sound)
 
-        if remaining_time <= 0:
-            # Player survived the boss area
-            clear(group)
-            display_lines(1, ["You run away :)"], True)
-            display_lines(1, ["Just for now :)"], True)
-            display_lines(1, ["I've been stuck in this box for so long"], True)
-            display_lines(1, ["It doesn't matter if I stay a little longer"], True)
-            display_lines(1, ["Waiting for your next visit."], True)
-            display_lines(1, ["Looking forward to playing with you :)"], True)
-            display_lines(1, ["AGAIN =)"], True)
-            save_game_data(10, 0, 0, 0, 1)  # success = 1
-            clear(group)
-            display.refresh()
+    level = Level(machine, normal_rules(mode, times), sound, seed)
+    outcome = level.run()
 
+    if outcome == "timeout":
+        if times == 20:
+            tell("endless_end", sound)
+        else:
+            tell("timeout", sound)
+        turn_off_all_lights(level.controllers)
+        return False
 
-            # Halt permanently
-            while True:
-                pass
+    if outcome == "win":
+        if times == 20:
+            tell("endless_end", sound)
+        else:
+            tell("win", sound, level.remaining_time)
+        turn_off_all_lights(level.controllers)
+        return True
 
-            return True
+    # Out of lives
+    if times == 20:
+        survived_time = level.survived
+        tell("endless_dead", sound)
+        # Check if new high score
+        if leaderboard.qualifies(survived_time):
+            tell("high_score", sound)
+            display.root_group = level.group
+            new_name = enter_name(level.group)
+            leaderboard.insert(new_name, survived_time)
+            # Display leaderboard
+            for entry in leaderboard.entries:
+                display_lines(1, [f"{entry['name']}: {entry['time']}"], sound)
+    else:
+        tell("dead", sound)
+    turn_off_all_lights(level.controllers)
+    return False
 
-        # --- Handle invincibility blinking ---
-        if invincible:
-            now = time.monotonic()
-            if now >= invincible_end_time:
-                invincible = False
-                ball_tile.hidden = False  # Show ball
-            elif now - blink_timer > 0.15:
-                blink_timer = now
-                blink_state = not blink_state
-                ball_tile.hidden = blink_state
-
-        # --- Update ball velocity and position ---
-        ax, ay, az = accel.read_filtered()
-        vx += ax * ACC_SCALE
-        vy -= ay * ACC_SCALE
-
-        vx = max(-MAX_SPEED, min(MAX_SPEED, vx)) * FRICTION
-        vy = max(-MAX_SPEED, min(MAX_SPEED, vy)) * FRICTION
-
-        x += vx
-        y += vy
-
-        # Clamp ball within screen boundaries
-        x = max(WALL_OFFSET, min(SCREEN_WIDTH - BALL_SIZE - WALL_OFFSET, x))
-        y = max(WALL_OFFSET, min(SCREEN_HEIGHT - BALL_SIZE - WALL_OFFSET, y))
-        ball_tile.x = int(x)
-        ball_tile.y = int(y)
-
-        # --- Check tile collisions ---
-        hit_dir = check_direction_collision(x, y)
-
-        if hit_dir and hit_dir in allowed_dirs:
-            # Move to next tile
-            x, y = enter_next_tile(hit_dir, x, y)
-            ball_tile.x = int(x)
-            ball_tile.y = int(y)
-            last_hit_dir = hit_dir
-
-            # Remove existing regular enemies
-            for e in enemy:
-                if e.tile in group:
-                    group.remove(e.tile)
-            enemy = []
-
-            # Remove existing chaser enemy
-            if chaser_enemy is not None and chaser_enemy.tile in group:
-                group.remove(chaser_enemy.tile)
-            chaser_enemy = None
-            # --- Spawn chaser enemy---
-            
-            spawn_x, spawn_y = enter_next_tile(hit_dir, x, y)
-            if chaser_enemy is not None and chaser_enemy.tile in group:
-                group.remove(chaser_enemy.tile)
-            chaser_enemy = Enemy(
-                group,
-                spawn_x,
-                spawn_y,
-                size=8,
-                speed=1,
-                activate_dist=150,
-                style="blink_circle"
-            )
 
+def boss_game(seed=WORLD_SEED):
+    level = Level(machine, boss_rules(), True, seed)
+    outcome = level.run()
 
-            # Spawn new regular enemies
-            num_enemies = tile_data[hit_dir]["enemy"]
-            rand_positions = generate_random_positions(x, y, num_enemies)
-            enemy = [
-                Enemy(group, px, py, size=8, speed=0.8, activate_dist=30,
-                      style="spiky_circle", teeth_count=12)
-                for px, py in rand_positions
-            ]
-            
-
-            # Generate new allowed directions for next tile
-            allowed_dirs = wall_utils.generate_random_directions(hit_dir)
-            wall_utils.draw_block_walls(group, allowed_dirs)
-            tile_data, food_max_dirs, enemy_max_dirs = generate_tile_data(allowed_dirs)
-
-
-        # --- Update regular enemies ---
-        for e in enemy:
-            e.check_activation(x, y)
-            e.update(x, y)
-
-            if invincible:
-                continue  # Skip damage during invincibility
-
-            if e.has_collision(x, y, BALL_SIZE):
-                lives -= 1
-                SignalController.update_lights_by_lives(lives, controllers)
-                if lives == 0:
-                    # Player defeated
-                    clear(group)
-                    display_lines(1, ["Thank you"], True)
-                    display_lines(1, ["Now I'm the master of this board :)"], True)
-                    display_lines(1, ["Also I've infected you.. =)"], True)
-                    display_lines(1, ["I'll live inside of your memory :)"], True)
-                    display_lines(1, ["F O R E V E R"], True)
-                    save_game_data(10, 0, 0, 0, 2)  # success = 2
-                    clear(group)
-                    display.refresh()
-                    while True:
-                        pass
-
-                wall_utils.draw_lives(group, lives)
-                invincible = True
-                invincible_end_time = time.monotonic() + 3
-                blink_timer = time.monotonic()
-                blink_state = False
-                ball_tile.hidden = True
+    if outcome == "timeout":
+        # Player survived the boss area
+        tell("boss_escape", True)
+        save_game_data(10, 0, 0, 0, 1)  # success = 1
+    else:
+        # Player defeated
+        tell("boss_defeat", True)
+        save_game_data(10, 0, 0, 0, 2)  # success = 2
+    clear(level.group)
+    display.refresh()
 
-    
-        # --- Update chaser enemy ---
-        if chaser_enemy is not None:
-            chaser_enemy.check_activation(x, y)
-            chaser_enemy.update(x, y)
-            if not invincible and chaser_enemy.has_collision(x, y, BALL_SIZE):
-                lives -= 1
-                SignalController.update_lights_by_lives(lives, controllers)
-                if lives == 0:
-                    clear(group)
-                    display_lines(1, ["Thank you"], True)
-                    display_lines(1, ["Now I'm the master of this board :)"], True)
-                    display_lines(1, ["Also I've infected you.. =)"], True)
-                    display_lines(1, ["I'll live inside of your memory :)"], True)
-                    display_lines(1, ["F O R E V E R"])
-                    save_game_data(10, 0, 0, 0, 2)
-                    clear(group)
-                    display.refresh()
-                    while True:
-                        pass
-
-                wall_utils.draw_lives(group, lives)
-                invincible = True
-                invincible_end_time = time.monotonic() + 3
-                blink_timer = time.monotonic()
-                blink_state = False
-                ball_tile.hidden = True
-
-        time.sleep(0.015)
+    # Halt permanently
+    halt()
 
 
 # ==============================
@@ -1381,22 +766,13 @@ def main():
         save_game_data(times, Easy_left, Medium_left, Hard_left, 0)
 
         # ===== Tutorial =====
-        display_lines(1, ["Hi! My name is Bit"])
-        display_lines(1, ["I need your help"])
-        display_lines(1, ["First, a little tutorial ;)"])
-        display_lines(1, ["Try to make me move around."])
+        tell("intro")
 
         # Run tutorial game
         run_game("Tutorial", 3, 1, False)
 
         # Explain time limit and scoring rules
-        display_lines(1, ["Oh, I should probably mention:"])
-        display_lines(1, ["There will be a time limit from now on."])
-        display_lines(1, ["Staying too long causes trouble."])
-        display_lines(1, ["The target score is always 10."])
-        display_lines(1, ["Harder modes have shorter time limits."])
-        display_lines(1, ["And I will have lower health."])
-        display_lines(1, ["Every time you pass a level, enemies become more alert."])
+        tell("rules")
     else:
         # Restore previous game progress
         times = game_data["times"]
@@ -1405,20 +781,17 @@ def main():
         Hard_left = game_data["hardleft"]
         if times > 5:
             sound = True
-        display_lines(1, ["Welcome back"], sound)
+        tell("welcome_back", sound)
 
     Success = game_data["success"]
 
     # ===== Post-success greetings =====
     if Success == 1:
         sound = True
-        display_lines(1, ["Oh, you come back, unexpected! :)"], sound)
-        display_lines(1, ["Wanna challenge me again?"], sound)
-        display_lines(1, ["Now that I can't beat you.."], sound)
-        display_lines(1, ["I'll try to catch your interests ;)"], sound)
+        tell("success_1", sound)
 
         while True:
-            display_lines(1, ["You know the rules"], sound)
+            tell("success_1_loop", sound)
             choice_index, Easy_left, Medium_left, Hard_left = choose_difficulty(
                 Easy_left, Medium_left, Hard_left, sound
             )
@@ -1426,10 +799,7 @@ def main():
 
     elif Success == 2:
         sound = True
-        display_lines(1, ["Nice to meet you again :)"], sound)
-        display_lines(1, ["Stay and play ;)"], sound)
-        display_lines(1, ["We only have hard mode by the way"], sound)
-        display_lines(1, ["I'll kill you for fun =)"], sound)
+        tell("success_2", sound)
 
         while True:
             passes = run_game("normal", 2, 20, sound)
@@ -1438,47 +808,15 @@ def main():
     while True:
         # Dynamic speech based on times played
         if not speaking:
-            if times == 2:
-                display_lines(1, ["You're doing great, keep going."])
-            elif times == 3:
-                display_lines(1, ["I like your movement, awesome."])
-            elif times == 4:
-                display_lines(1, ["I'm more powerful :)"])
-                display_lines(1, ["Now I can detect danger and consumable data..."])
-                display_lines(1, ["Sorry, I mean: scores :)"])
-                display_lines(1, ["Green = score. Red = danger. Yellow = both."])
-            elif times == 5:
-                display_lines(1, ["I know it's weird that we only have three for each level"])
-                display_lines(1, ["Still, I hope you can finish all of them :)"])
-            elif times == 6:
-                sound = True
-                display_lines(1, ["Good news. Now I can speak."], sound)
-                display_lines(1, ["Let me share my greetings with you :D Again"], sound)
-            elif times == 7:
-                display_lines(1, ["I'm powerful enough to activate the shield =)"], sound)
-                display_lines(1, ["From now on... the game truly begins"], sound)
-            elif times == 8:
-                display_lines(1, ["You know, I get lost in thoughts from time to time."], sound)
-                display_lines(1, ["Thinking about life and death."], sound)
-                display_lines(1, ["Hurting others just to survive :|"], sound)
-                display_lines(1, ["Is that really the right thing to do?"], sound)
-                display_lines(1, ["I guess I'll never figure it out :D"], sound)
-            elif times == 9:
-                display_lines(1, ["You almost made it!"], sound)
-                display_lines(1, ["I'm so glad to have you here... ;)"], sound)
-            elif times == 10:
-                display_lines(1, ["You are a master in controlling electronics."], sound)
-                display_lines(1, ["Thanks to you :)"], sound)
-                display_lines(1, ["I devoured everything on this board ;)"], sound)
-                display_lines(1, ["The circuit, the CPU, the flash.."], sound)
-                display_lines(1, ["Still, there's one thing left."], sound)
-                display_lines(1, ["I like you :)"], sound)
-                display_lines(1, ["LET'S PLAY A GAME, SHALL WE ?"], sound)
-                passes = run_game("Boss", 0, 0, sound)
-
+            # Story section for the number of levels passed (times_2 .. times_10)
+            key = "times_%d" % times
+            if key in story:
+                sound = tell(key, sound)
             speaking = True
 
         # Choose difficulty for normal levels
+        mem.scene("menu")
+        save_telemetry()
         choice_index, Easy_left, Medium_left, Hard_left = choose_difficulty(
             Easy_left, Medium_left, Hard_left, sound
         )
@@ -1505,7 +843,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if REPLAY_FILE:
+        replay_game(REPLAY_FILE)
+    else:
+        main()
 
 
 
@@ -1,9 +1,9 @@
-import board
-import busio
-import adafruit_adxl34x
+import math
 import time
 
 # filter.py
+# Tilt filters for the ADXL345. No board imports at module level, so
+# tools/filter_compare.py can run the same filters on the host.
 class EMAFilterAccelerometer:
     def __init__(self, accelerometer, alpha=0.2):
         """
@@ -50,8 +50,82 @@ class EMAFilterAccelerometer:
         return dx > threshold or dy > threshold or dz > threshold
 
 
+# ================================
+# One-Euro filter
+# ================================
+def smoothing_factor(dt, cutoff):
+    """EMA alpha of a first-order low-pass at cutoff Hz sampled every dt seconds"""
+    tau = 1 / (2 * math.pi * cutoff)
+    return 1 / (1 + tau / dt)
+
+
+class OneEuro:
+    def __init__(self, min_cutoff=1.0, beta=0.1, d_cutoff=1.0):
+        """
+        One-Euro filter of one signal (Casiez et al., CHI 2012): an EMA whose
+        cutoff rises with the signal's speed. Slow drift is smoothed hard,
+        fast tilts pass with little lag.
+        min_cutoff: cutoff in Hz when the signal is still (lower = less jitter)
+        beta: extra cutoff per unit/s of speed (higher = less lag)
+        d_cutoff: cutoff of the speed estimate, in Hz
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = None
+        self.speed = 0.0
+
+    def __call__(self, x, dt):
+        if self.value is None or dt <= 0:
+            if self.value is None:
+                self.value = x
+            return self.value
+        a_d = smoothing_factor(dt, self.d_cutoff)
+        self.speed += a_d * ((x - self.value) / dt - self.speed)
+        cutoff = self.min_cutoff + self.beta * abs(self.speed)
+        self.value += smoothing_factor(dt, cutoff) * (x - self.value)
+        return self.value
+
+
+class OneEuroFilterAccelerometer(EMAFilterAccelerometer):
+    def __init__(self, accelerometer, min_cutoff=1.0, beta=0.1, d_cutoff=1.0, clock=time.monotonic):
+        """
+        Drop-in replacement for EMAFilterAccelerometer with a One-Euro filter per axis.
+        accelerometer: initialized adafruit_adxl34x.ADXL345 object
+        min_cutoff / beta / d_cutoff: see OneEuro; change per level with tune()
+        clock: time source in seconds
+        """
+        super().__init__(accelerometer)
+        self.clock = clock
+        self.last_time = clock()
+        self.axes = [OneEuro(min_cutoff, beta, d_cutoff) for _ in range(3)]
+        for f, v in zip(self.axes, (self.xFiltered, self.yFiltered, self.zFiltered)):
+            f.value = v
+
+    def tune(self, min_cutoff, beta):
+        """Change the filter response, e.g. when a level with other rules starts"""
+        for f in self.axes:
+            f.min_cutoff = min_cutoff
+            f.beta = beta
+
+    def read_filtered(self):
+        x_raw, y_raw, z_raw = self.accelerometer.acceleration
+        now = self.clock()
+        dt = now - self.last_time
+        self.last_time = now
+        fx, fy, fz = self.axes
+        self.xFiltered = fx(x_raw, dt)
+        self.yFiltered = fy(y_raw, dt)
+        self.zFiltered = fz(z_raw, dt)
+        return self.xFiltered, self.yFiltered, self.zFiltered
+
+
 
 if __name__ == "__main__":
+    import board
+    import busio
+    import adafruit_adxl34x
+
     # Initialize I2C and accelerometer
     i2c = busio.I2C(board.SCL, board.SDA)
     accelerometer = adafruit_adxl34x.ADXL345(i2c)
@@ -0,0 +1,35 @@
+"""
+Build story.bin (read by Story.py on the board) from story.txt (host only).
+
+    python tools/build_story.py [story.txt] [story.bin]
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Story import Story, parse_story, pack_story
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    src = argv[0] if len(argv) > 0 else os.path.join(ROOT, "story.txt")
+    dst = argv[1] if len(argv) > 1 else os.path.join(ROOT, "story.bin")
+
+    with open(src, encoding="utf-8") as f:
+        sections = parse_story(f.read())
+    with open(dst, "wb") as f:
+        f.write(pack_story(sections))
+
+    # Read it back the way the board does
+    story = Story(dst)
+    for key, lines in sections:
+        assert story.lines(key) == lines, key
+    print(f"{dst}: {len(sections)} sections, "
+          f"{sum(len(lines) for _, lines in sections)} lines, {os.path.getsize(dst)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
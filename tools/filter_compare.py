@@ -0,0 +1,168 @@
+"""
+Compare tilt filters on the same input (host only, not copied to the board).
+
+Feeds the EMA filter used so far and the One-Euro filter with each level's
+settings from GameRules the same noisy tilt signal and prints, per filter:
+  lag     delay of the filtered tilt behind the clean one (ms); the ball
+          integrates the tilt in the same frame, so this is input-to-motion lag
+  jitter  RMS frame-to-frame change of the output once the clean tilt has
+          been still for SETTLE_TIME
+  error   RMS distance to the clean tilt
+
+Without arguments the signal is synthetic: tilt steps held 0.5-2 s. With DVR1
+traces (see InputTrace.py) the recorded tilt and frame times are used instead.
+Traces store the tilt after the board's filter, so they serve as the clean
+motion and the sensor noise is added back here.
+
+    python tools/filter_compare.py
+    python tools/filter_compare.py --noise 0.3 trace1.bin trace2.bin
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filter import EMAFilterAccelerometer, OneEuroFilterAccelerometer
+from GameRules import tutorial_rules, normal_rules, boss_rules
+from InputTrace import TraceReplayer, ReplayFinished
+
+FRAME_TIME = 0.02   # Same frame time as tools/simulate.py
+MAX_TILT = 9.8
+MAX_LAG_FRAMES = 25
+SETTLE_TIME = 0.5   # Jitter counts once the clean tilt has been still this long
+
+
+class FeedSensor:
+    """Stands in for the ADXL345: returns whatever sample was fed last"""
+    def __init__(self):
+        self.acceleration = (0.0, 0.0, 9.8)
+        self.now = 0.0
+
+    def clock(self):
+        return self.now
+
+
+# ================================
+# Input signals: list of (dt, clean_x, clean_y)
+# ================================
+def synthetic_signal(rng, seconds=120):
+    frames = []
+    x = y = 0.0
+    while len(frames) * FRAME_TIME < seconds:
+        tx = rng.uniform(-MAX_TILT, MAX_TILT)
+        ty = rng.uniform(-MAX_TILT, MAX_TILT)
+        ramp = max(1, int(rng.uniform(0.08, 0.2) / FRAME_TIME))
+        for i in range(1, ramp + 1):
+            k = i / ramp
+            frames.append((FRAME_TIME, x + (tx - x) * k, y + (ty - y) * k))
+        x, y = tx, ty
+        for _ in range(int(rng.uniform(0.5, 2.0) / FRAME_TIME)):
+            frames.append((FRAME_TIME, x, y))
+    return frames
+
+
+def trace_signal(path):
+    replayer = TraceReplayer(path)
+    frames = []
+    last = 0.0
+    try:
+        while True:
+            ax, ay, _ = replayer.next_frame()
+            frames.append((replayer.now - last, ax, ay))
+            last = replayer.now
+    except ReplayFinished:
+        pass
+    return frames
+
+
+# ================================
+# Measurement
+# ================================
+def run_filter(make, frames, noise, rng):
+    sensor = FeedSensor()
+    sensor.acceleration = (frames[0][1], frames[0][2], 9.8)
+    filt = make(sensor)
+    out = []
+    for dt, cx, cy in frames:
+        sensor.now += dt
+        sensor.acceleration = (cx + rng.gauss(0, noise), cy + rng.gauss(0, noise), 9.8)
+        fx, fy, _ = filt.read_filtered()
+        out.append((fx, fy))
+    return out
+
+
+def measure(frames, out, still):
+    n = len(frames)
+    mean_dt = sum(f[0] for f in frames) / n
+
+    # Lag: the shift that best lines the output up with the clean tilt
+    best_lag, best_err = 0, None
+    for lag in range(MAX_LAG_FRAMES + 1):
+        err = 0.0
+        for i in range(lag, n):
+            _, cx, cy = frames[i - lag]
+            fx, fy = out[i]
+            err += (fx - cx) ** 2 + (fy - cy) ** 2
+        err /= (n - lag)
+        if best_err is None or err < best_err:
+            best_lag, best_err = lag, err
+
+    jitter = 0.0
+    count = 0
+    error = 0.0
+    still_time = 0.0
+    for i in range(1, n):
+        dt, cx, cy = frames[i]
+        fx, fy = out[i]
+        error += (fx - cx) ** 2 + (fy - cy) ** 2
+        _, px, py = frames[i - 1]
+        if abs(cx - px) < still and abs(cy - py) < still:
+            still_time += dt
+        else:
+            still_time = 0.0
+        if still_time >= SETTLE_TIME:
+            qx, qy = out[i - 1]
+            jitter += (fx - qx) ** 2 + (fy - qy) ** 2
+            count += 1
+    return (best_lag * mean_dt * 1000,
+            math.sqrt(jitter / count) if count else float("nan"),
+            math.sqrt(error / (n - 1)))
+
+
+def filters():
+    """(name, factory) for the current EMA and One-Euro with each level's settings"""
+    result = [("ema alpha=0.3", lambda s: EMAFilterAccelerometer(s, alpha=0.3))]
+    for rules in (tutorial_rules(), normal_rules(1, 5), boss_rules()):
+        min_cutoff, beta = rules.tilt_filter
+        result.append((f"one-euro {rules.name} ({min_cutoff}, {beta})",
+                       lambda s, m=min_cutoff, b=beta: OneEuroFilterAccelerometer(s, m, b, clock=s.clock)))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("traces", nargs="*", help="DVR1 input traces (default: synthetic tilt steps)")
+    parser.add_argument("--noise", type=float, default=0.15, help="sensor noise added, m/s^2 RMS per axis")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.traces:
+        signals = [(os.path.basename(p), trace_signal(p), 0.05) for p in args.traces]
+    else:
+        signals = [("synthetic", synthetic_signal(random.Random(args.seed)), 1e-6)]
+
+    for name, frames, still in signals:
+        print(f"{name}: {len(frames)} frames, noise {args.noise} m/s^2")
+        print(f"  {'filter':34} {'lag ms':>7} {'jitter':>7} {'error':>7}")
+        for label, make in filters():
+            out = run_filter(make, frames, args.noise, random.Random(args.seed))
+            lag, jitter, error = measure(frames, out, still)
+            print(f"  {label:34} {lag:7.0f} {jitter:7.3f} {error:7.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Stand-ins for the CircuitPython display modules (host only).
+
+install() puts minimal displayio, terminalio and adafruit_display_text
+modules into sys.modules, so Level.py and the sprite modules it uses import
+on the host. Nothing is drawn: the stubs keep positions, visibility and
+group membership, which is all the game logic reads back. Display and
+Pixel stand in for the SSD1306 and the NeoPixels.
+
+    import headless
+    headless.install()
+    from Level import Level, Machine
+"""
+import sys
+import types
+
+GLYPH_W = 6
+GLYPH_H = 12
+
+
+class Group(list):
+    def __init__(self, x=0, y=0, scale=1):
+        super().__init__()
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+
+    def __setitem__(self, index, value):
+        pass
+
+    def fill(self, value):
+        pass
+
+
+class Palette:
+    def __init__(self, color_count):
+        self.colors = [0] * color_count
+
+    def __setitem__(self, index, color):
+        self.colors[index] = color
+
+    def make_transparent(self, index):
+        pass
+
+
+class TileGrid:
+    def __init__(self, bitmap, pixel_shader=None, width=1, height=1,
+                 tile_width=None, tile_height=None, default_tile=0, x=0, y=0):
+        self.bitmap = bitmap
+        self.width = width
+        self.height = height
+        self.tile_width = bitmap.width if tile_width is None else tile_width
+        self.tile_height = bitmap.height if tile_height is None else tile_height
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+    def __setitem__(self, index, tile):
+        pass
+
+
+class Glyph:
+    def __init__(self, tile_index):
+        self.tile_index = tile_index
+
+
+class Font:
+    bitmap = Bitmap(GLYPH_W * 96, GLYPH_H, 2)
+
+    def get_bounding_box(self):
+        return GLYPH_W, GLYPH_H, 0, 0
+
+    def get_glyph(self, code):
+        return Glyph(max(0, code - 32))
+
+
+class Label(Group):
+    def __init__(self, font, text="", color=0xFFFFFF, **kwargs):
+        super().__init__(kwargs.get("x", 0), kwargs.get("y", 0))
+        self.text = text
+        self.color = color
+        self.anchor_point = (0, 0)
+        self.anchored_position = (0, 0)
+
+
+class Display:
+    """root_group / refresh() / auto_refresh of the SSD1306"""
+    def __init__(self, width=128, height=64):
+        self.width = width
+        self.height = height
+        self.root_group = None
+        self.auto_refresh = True
+        self.refreshes = 0
+
+    def refresh(self, **kwargs):
+        self.refreshes += 1
+        return True
+
+
+class Pixel(list):
+    """One-LED NeoPixel strip"""
+    def __init__(self):
+        super().__init__([(0, 0, 0)])
+
+    def show(self):
+        pass
+
+
+def install():
+    displayio = types.ModuleType("displayio")
+    displayio.Group = Group
+    displayio.Bitmap = Bitmap
+    displayio.Palette = Palette
+    displayio.TileGrid = TileGrid
+
+    terminalio = types.ModuleType("terminalio")
+    terminalio.FONT = Font()
+
+    display_text = types.ModuleType("adafruit_display_text")
+    bitmap_label = types.ModuleType("adafruit_display_text.bitmap_label")
+    bitmap_label.Label = Label
+    label = types.ModuleType("adafruit_display_text.label")
+    label.Label = Label
+    display_text.bitmap_label = bitmap_label
+    display_text.label = label
+
+    sys.modules["displayio"] = displayio
+    sys.modules["terminalio"] = terminalio
+    sys.modules["adafruit_display_text"] = display_text
+    sys.modules["adafruit_display_text.bitmap_label"] = bitmap_label
+    sys.modules["adafruit_display_text.label"] = label
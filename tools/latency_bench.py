@@ -0,0 +1,127 @@
+"""
+Tilt-to-pixel latency on a host stand-in of the board (host only).
+
+Settles the tilt filter at rest with the ball in the middle of the screen,
+then steps the raw tilt and runs the board's frame path (filter, step_ball,
+pixel position) through LatencyProbe until the ball lands on another pixel
+and the framebuffer changes. Prints frames and milliseconds per step size,
+for the EMA used before and the One-Euro settings of each level.
+
+Time on the host is simulated: every stage advances the clock by a board
+cost below. Replace them with the averages LatencyProbe.report() prints on
+the board (LATENCY_PROBE = True in code.py) for figures of a real unit.
+
+    python tools/latency_bench.py
+    python tools/latency_bench.py --steps 0.5 1 3 9.8
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filter import EMAFilterAccelerometer, OneEuroFilterAccelerometer
+from GameRules import SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, step_ball, tutorial_rules, normal_rules, boss_rules
+from LatencyProbe import LatencyProbe, FILTER, PHYSICS, TILE, REFRESH
+
+# Board costs in us
+READ_US = 1000       # ADXL345 6-byte read over 400 kHz I2C
+FILTER_US = 300
+PHYSICS_US = 200
+FRAME_US = 20000     # Whole frame, 15 ms sleep included
+REFRESH_US = 25000   # Full 1 KB SSD1306 frame over the shared I2C bus
+SETTLE_FRAMES = 100
+
+
+class StandIn:
+    """Raw accelerometer and simulated clock of the stand-in board"""
+    def __init__(self):
+        self.raw = (0.0, 0.0, 9.8)
+        self.ns = 0
+
+    @property
+    def acceleration(self):
+        self.advance(READ_US)
+        return self.raw
+
+    def clock_ns(self):
+        return self.ns
+
+    def clock(self):
+        return self.ns / 1e9
+
+    def advance(self, us):
+        self.ns += us * 1000
+
+
+def framebuffer(px, py):
+    """SSD1306 page layout (8 rows per byte) with the ball drawn at (px, py)"""
+    fb = bytearray(SCREEN_WIDTH * SCREEN_HEIGHT // 8)
+    for y in range(py, py + BALL_SIZE):
+        for x in range(px, px + BALL_SIZE):
+            fb[(y // 8) * SCREEN_WIDTH + x] |= 1 << (y % 8)
+    return fb
+
+
+def measure_step(make, step):
+    """Frames and (tile, refresh) ms until a raw step of `step` m/s^2 moves the ball"""
+    board = StandIn()
+    probe = LatencyProbe(threshold=min(step, 0.5), clock=board.clock_ns)
+    accel = make(probe.wrap(board), board.clock)
+
+    x = (SCREEN_WIDTH - BALL_SIZE) / 2
+    y = (SCREEN_HEIGHT - BALL_SIZE) / 2
+    vx = vy = 0.0
+    shown = framebuffer(int(x), int(y))
+    probe.begin(int(x), int(y))
+
+    for frame in range(SETTLE_FRAMES + 60):
+        if frame == SETTLE_FRAMES:
+            board.raw = (step, 0.0, 9.8)
+        frame_start = board.ns
+        ax, ay, _ = accel.read_filtered()
+        board.advance(FILTER_US)
+        probe.mark(FILTER)
+        x, y, vx, vy = step_ball(x, y, vx, vy, ax, ay)
+        board.advance(PHYSICS_US)
+        probe.mark(PHYSICS)
+        if probe.moved(int(x), int(y)):
+            fb = framebuffer(int(x), int(y))
+            assert fb != shown, "ball moved but the framebuffer did not change"
+            board.advance(REFRESH_US)
+            probe.done()
+            frames, stamps = probe.results[-1]
+            return frames, stamps[TILE] / 1000, stamps[REFRESH] / 1000
+        board.ns = frame_start + FRAME_US * 1000
+    return None
+
+
+def filters():
+    result = [("ema alpha=0.3", lambda s, clock: EMAFilterAccelerometer(s, alpha=0.3))]
+    for rules in (tutorial_rules(), normal_rules(1, 5), boss_rules()):
+        min_cutoff, beta = rules.tilt_filter
+        result.append((f"one-euro {rules.name}",
+                       lambda s, clock, m=min_cutoff, b=beta: OneEuroFilterAccelerometer(s, m, b, clock=clock)))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=float, nargs="+", default=[0.5, 1.0, 3.0, 9.8],
+                        help="raw tilt steps in m/s^2")
+    args = parser.parse_args(argv)
+
+    print(f"{'filter':20} {'step':>5} {'frames':>6} {'tile ms':>8} {'shown ms':>9}")
+    for label, make in filters():
+        for step in args.steps:
+            result = measure_step(make, step)
+            if result is None:
+                print(f"{label:20} {step:5.1f}  never moved")
+                continue
+            frames, tile_ms, shown_ms = result
+            print(f"{label:20} {step:5.1f} {frames:6d} {tile_ms:8.1f} {shown_ms:9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+"""
+Headless batch simulator (host only, not copied to the board).
+
+Runs the game's own Level loop (Level.py) with stub display and input
+devices (tools/headless.py) and a bot player on the tilt and rotary, at
+unthrottled speed. Fans the games out over a multiprocessing pool and prints
+win rates, survival times and score distributions per difficulty and `times`.
+
+    python tools/simulate.py --games 500 --times 1-10
+    python tools/simulate.py --boss --games 200 --bot random
+    python tools/simulate.py --games 20 --times 20 --mem
+    python tools/simulate.py --games 20 --times 20 --trace spans.bin
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+headless.install()
+
+from GameRules import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SIZE, ENEMY_SIZE, ACC_SCALE,
+    step_ball, normal_rules, boss_rules
+)
+from Level import Level, Machine
+from WorldGenerator import Rng
+from MemoryMonitor import MemoryMonitor, GcPolicy
+import Profiler
+import Log
+
+FRAME_TIME = 0.02   # 15 ms sleep plus loop work per frame on the board
+MAX_TILT = 9.8      # m/s^2, device held on its side
+MODE_NAMES = ["Easy", "Medium", "Hard"]
+MEM = None          # MemoryMonitor sampled every frame when run with --mem
+
+EXIT_TARGETS = {
+    "UP": (SCREEN_WIDTH / 2, -10),
+    "DOWN": (SCREEN_WIDTH / 2, SCREEN_HEIGHT + 10),
+    "LEFT": (-10, SCREEN_HEIGHT / 2),
+    "RIGHT": (SCREEN_WIDTH + 10, SCREEN_HEIGHT / 2)
+}
+
+# Seeds and per-level lines would flood the report
+Log.configure(Log.WARN)
+
+
+# ================================
+# Stub devices: the bot plays through the same inputs as the player
+# ================================
+class SimClock:
+    """Frame clock that only moves when the level sleeps at the end of a frame"""
+    def __init__(self, frame_time):
+        self.t = 0.0
+        self.frame_time = frame_time
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.t += self.frame_time
+
+
+class BotTilt:
+    """
+    Filtered accelerometer stand-in: asks the bot for a tilt every frame.
+    Level.run keeps the ball's float position and speed in locals, so this
+    mirrors step_ball() with the tilt it returns, and picks the position up
+    from the level again whenever the ball jumps (wall crossing).
+    """
+    def __init__(self, bot):
+        self.bot = bot
+        self.level = None
+        self.x = self.y = self.vx = self.vy = 0.0
+
+    def attach(self, level):
+        self.level = level
+        self.x = level.x
+        self.y = level.y
+        self.vx = self.vy = 0.0
+
+    def tune(self, min_cutoff, beta):
+        pass
+
+    def read_filtered(self):
+        level = self.level
+        tile = level.ball_tile
+        if int(self.x) != tile.x or int(self.y) != tile.y:
+            self.x = level.x
+            self.y = level.y
+        enemies = level.enemies if level.chaser is None else level.enemies + [level.chaser]
+        ax, ay = self.bot.tilt(self.x, self.y, self.vx, self.vy, level.foods, enemies,
+                               level.allowed_dirs, level.tile_data)
+        self.x, self.y, self.vx, self.vy = step_ball(self.x, self.y, self.vx, self.vy, ax, ay)
+        return ax, ay, 9.8
+
+
+class BotRotary:
+    """Rotary stand-in: the bot turns the shield toward the nearest awake enemy"""
+    def __init__(self, bot, tilt):
+        self.bot = bot
+        self.tilt = tilt
+
+    def update(self):
+        level = self.tilt.level
+        return self.bot.rotate(self.tilt.x, self.tilt.y, level.shield_dir, level.enemies)
+
+    def drain(self):
+        pass
+
+
+class IdleButton:
+    """Nobody presses D9 in a simulated game"""
+    fell = False
+    rose = False
+    long_press = False
+    value = True
+
+    def update(self):
+        pass
+
+
+class NoCollect:
+    """GcPolicy stand-in: host Python needs no scheduled collections"""
+    def safe_point(self):
+        return 0
+
+    def enter_gameplay(self):
+        pass
+
+    def leave_gameplay(self):
+        pass
+
+
+# ================================
+# Bots
+# ================================
+class GreedyBot:
+    """Heads for the nearest food, steers around awake enemies, leaves through the richest exit"""
+
+    def __init__(self, rng, noise=1.0, cruise=2.0):
+        self.rng = rng
+        self.noise = noise
+        self.cruise = cruise
+
+    def tilt(self, x, y, vx, vy, foods, enemies, allowed_dirs, tile_data):
+        cx = x + BALL_SIZE / 2
+        cy = y + BALL_SIZE / 2
+        if foods:
+            f = min(foods, key=lambda f: (f.x - cx) ** 2 + (f.y - cy) ** 2)
+            tx, ty = f.x, f.y
+        else:
+            best = max(allowed_dirs, key=lambda d: tile_data.get(d, {}).get("food", 0))
+            tx, ty = EXIT_TARGETS[best]
+
+        dx = tx - cx
+        dy = ty - cy
+        dist = math.sqrt(dx * dx + dy * dy) or 1
+        dvx = dx / dist * self.cruise
+        dvy = dy / dist * self.cruise
+
+        # Push away from awake enemies that are close
+        for e in enemies:
+            ex = e.x + ENEMY_SIZE / 2 - cx
+            ey = e.y + ENEMY_SIZE / 2 - cy
+            d2 = ex * ex + ey * ey
+            if e.active and d2 < 900:
+                push = 60 / (d2 + 1)
+                dvx -= ex * push
+                dvy -= ey * push
+
+        ax = (dvx - vx) / ACC_SCALE + self.rng.uniform(-self.noise, self.noise)
+        ay = -(dvy - vy) / ACC_SCALE + self.rng.uniform(-self.noise, self.noise)
+        return max(-MAX_TILT, min(MAX_TILT, ax)), max(-MAX_TILT, min(MAX_TILT, ay))
+
+    def rotate(self, x, y, shield_dir, enemies):
+        """One clockwise step when the nearest awake enemy is not behind the shield"""
+        awake = [e for e in enemies if e.active]
+        if not awake:
+            return 0
+        e = min(awake, key=lambda e: (e.x - x) ** 2 + (e.y - y) ** 2)
+        dx = e.x - x
+        dy = e.y - y
+        if abs(dx) > abs(dy):
+            want = "RIGHT" if dx > 0 else "LEFT"
+        else:
+            want = "DOWN" if dy > 0 else "UP"
+        return 0 if want == shield_dir else 1
+
+
+class RandomBot:
+    """Tilts in a random direction and changes its mind every half second"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.ax = 0.0
+        self.ay = 0.0
+        self.frames = 0
+
+    def tilt(self, x, y, vx, vy, foods, enemies, allowed_dirs, tile_data):
+        if self.frames % 25 == 0:
+            self.ax = self.rng.uniform(-MAX_TILT, MAX_TILT)
+            self.ay = self.rng.uniform(-MAX_TILT, MAX_TILT)
+        self.frames += 1
+        return self.ax, self.ay
+
+    def rotate(self, x, y, shield_dir, enemies):
+        return self.rng.randint(0, 1)
+
+
+BOTS = {"greedy": GreedyBot, "random": RandomBot}
+
+
+# ================================
+# Levels
+# ================================
+def play(rules, seed, bot_name, frame_time):
+    """Run one Level headless with the bot on the inputs; returns (level, outcome)"""
+    bot = BOTS[bot_name](Rng(seed ^ 0x5EED5EED))
+    tilt = BotTilt(bot)
+    sim_clock = SimClock(frame_time)
+    machine = Machine(
+        headless.Display(), {d: headless.Pixel() for d in EXIT_TARGETS},
+        tilt, BotRotary(bot, tilt), IdleButton(),
+        MEM if MEM is not None else MemoryMonitor(False),
+        GcPolicy(MEM) if MEM is not None else NoCollect(),
+        sim_clock.now, sim_clock.sleep
+    )
+    level = Level(machine, rules, seed=seed)
+    tilt.attach(level)
+    return level, level.run()
+
+
+def simulate_normal(mode, times, seed, bot_name="greedy", frame_time=FRAME_TIME):
+    """Play one normal_game level headless; returns a result dict"""
+    level, outcome = play(normal_rules(mode, times), seed, bot_name, frame_time)
+    return _result("normal", mode, times, seed, outcome == "win", level.survived,
+                   level.score, level.rules.lives - level.lives, level.tile_count)
+
+
+def simulate_boss(seed, bot_name="greedy", frame_time=FRAME_TIME):
+    """Play the boss_game area headless; surviving the time limit is a win"""
+    level, outcome = play(boss_rules(), seed, bot_name, frame_time)
+    return _result("boss", 0, 10, seed, outcome == "timeout", level.survived,
+                   0, level.rules.lives - level.lives, level.tile_count)
+
+
+def _result(game, mode, times, seed, win, survived, score, lives_lost, tiles):
+    return {
+        "game": game, "mode": mode, "times": times, "seed": seed, "win": win,
+        "survived": round(survived, 3), "score": score,
+        "lives_lost": lives_lost, "tiles": tiles
+    }
+
+
+def run_job(job):
+    game, mode, times, seed, bot_name, frame_time = job
+    if game == "boss":
+        return simulate_boss(seed, bot_name, frame_time)
+    return simulate_normal(mode, times, seed, bot_name, frame_time)
+
+
+# ================================
+# Report
+# ================================
+def quantile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def aggregate(results):
+    """Group results by (game, mode, times) and summarize each group"""
+    groups = {}
+    for r in results:
+        groups.setdefault((r["game"], r["mode"], r["times"]), []).append(r)
+
+    rows = []
+    for (game, mode, times), rs in sorted(groups.items()):
+        survived = [r["survived"] for r in rs]
+        scores = [r["score"] for r in rs]
+        rows.append({
+            "game": game,
+            "mode": "Boss" if game == "boss" else MODE_NAMES[mode],
+            "times": times,
+            "games": len(rs),
+            "win_rate": sum(1 for r in rs if r["win"]) / len(rs),
+            "survived_mean": sum(survived) / len(rs),
+            "survived_p50": quantile(survived, 0.5),
+            "survived_p90": quantile(survived, 0.9),
+            "score_mean": sum(scores) / len(rs),
+            "score_p50": quantile(scores, 0.5),
+            "score_max": max(scores),
+            "lives_lost_mean": sum(r["lives_lost"] for r in rs) / len(rs),
+            "tiles_mean": sum(r["tiles"] for r in rs) / len(rs)
+        })
+    return rows
+
+
+def print_report(rows):
+    header = "{:<7}{:>6}{:>7}{:>7}{:>9}{:>7}{:>7}{:>8}{:>6}{:>6}{:>7}".format(
+        "mode", "times", "games", "win%", "surv", "p50", "p90", "score", "p50", "max", "tiles")
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print("{:<7}{:>6}{:>7}{:>7.1f}{:>9.1f}{:>7.1f}{:>7.1f}{:>8.2f}{:>6}{:>6}{:>7.1f}".format(
+            r["mode"], r["times"], r["games"], r["win_rate"] * 100,
+            r["survived_mean"], r["survived_p50"], r["survived_p90"],
+            r["score_mean"], r["score_p50"], r["score_max"], r["tiles_mean"]))
+
+
+def parse_range(text):
+    """'1-10' or '1,4,7' -> list of ints"""
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            values.extend(range(int(lo), int(hi) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch simulator for The Devour")
+    parser.add_argument("--games", type=int, default=200, help="games per (mode, times)")
+    parser.add_argument("--modes", default="0-2", help="difficulties, 0 Easy .. 2 Hard")
+    parser.add_argument("--times", default="1-10", help="levels passed, e.g. 1-10 or 7,20")
+    parser.add_argument("--boss", action="store_true", help="simulate the boss area instead")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="greedy")
+    parser.add_argument("--seed", type=int, default=0, help="first world seed")
+    parser.add_argument("--frame-time", type=float, default=FRAME_TIME)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="also write the report rows to this file")
+    parser.add_argument("--mem", action="store_true",
+                        help="run in-process and print MemoryMonitor heap statistics")
+    parser.add_argument("--trace", help="run in-process and dump tile generation spans here")
+    args = parser.parse_args(argv)
+
+    if args.boss:
+        configs = [("boss", 0, 10)]
+    else:
+        configs = [("normal", m, t) for m in parse_range(args.modes) for t in parse_range(args.times)]
+
+    jobs = []
+    for game, mode, times in configs:
+        for i in range(args.games):
+            jobs.append((game, mode, times, args.seed + i, args.bot, args.frame_time))
+
+    if args.mem or args.trace:
+        global MEM
+        if args.mem:
+            MEM = MemoryMonitor(log_scenes=False)
+        if args.trace:
+            Profiler.enable(4096)
+        results = [run_job(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(args.workers) as pool:
+            results = list(pool.imap_unordered(run_job, jobs, chunksize=16))
+
+    rows = aggregate(results)
+    print_report(rows)
+    Log.configure(Log.INFO)
+    if MEM is not None:
+        MEM.report()
+    if args.trace:
+        Profiler.dump(args.trace)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Convert a span dump written by Profiler.dump() into Chrome trace JSON
+(host only). Open the result in chrome://tracing or ui.perfetto.dev.
+
+    python tools/spans_to_chrome.py spans.bin spans.json
+"""
+import json
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Profiler import MAGIC, RECORD_FMT
+
+
+def read_spans(path):
+    """Returns a list of (name, start_us, duration_us), oldest first"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError("not a span dump: " + path)
+    name_count, count = struct.unpack_from("<HH", data, 4)
+    pos = 8
+
+    names = []
+    for _ in range(name_count):
+        n = data[pos]
+        names.append(data[pos + 1:pos + 1 + n].decode())
+        pos += 1 + n
+
+    spans = []
+    size = struct.calcsize(RECORD_FMT)
+    wraps = 0
+    last = 0
+    for _ in range(count):
+        name_id, start, duration = struct.unpack_from(RECORD_FMT, data, pos)
+        pos += size
+        # Start times are 32-bit microseconds and wrap after ~71 minutes
+        if start + (wraps << 32) < last - (1 << 31):
+            wraps += 1
+        start += wraps << 32
+        last = start
+        spans.append((names[name_id], start, duration))
+    return spans
+
+
+def to_chrome(spans):
+    events = [
+        {"name": name, "ph": "X", "ts": start, "dur": duration, "pid": 0, "tid": 0}
+        for name, start, duration in spans
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summarize(spans):
+    """Print total / mean / max time per span name"""
+    totals = {}
+    for name, _, duration in spans:
+        n, total, worst = totals.get(name, (0, 0, 0))
+        totals[name] = (n + 1, total + duration, max(worst, duration))
+    print("{:<16}{:>8}{:>12}{:>10}{:>10}".format("span", "count", "total ms", "mean us", "max us"))
+    for name, (n, total, worst) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+        print("{:<16}{:>8}{:>12.1f}{:>10}{:>10}".format(name, n, total / 1000, total // n, worst))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    spans = read_spans(argv[0])
+    with open(argv[1], "w") as f:
+        json.dump(to_chrome(spans), f)
+    summarize(spans)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Summarize a telemetry file written by Telemetry.flush() (host only).
+
+Prints every level played, then one line per level kind and difficulty:
+win rate, survival time, lives lost, score and frame times.
+
+    python tools/telemetry_report.py telemetry.bin
+    python tools/telemetry_report.py telemetry.bin --summary
+"""
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Telemetry import MAGIC, RECORD_FMT, RECORD_SIZE, LEVELS, OUTCOMES, NONE
+
+MODE_NAMES = ["Easy", "Medium", "Hard"]
+
+
+def read_records(path):
+    """Returns a list of dicts, oldest first"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError("not a telemetry file: " + path)
+    records = []
+    for pos in range(len(MAGIC), len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+        (session, t_ms, level, outcome, mode, times, lives_lost, _,
+         score, survived, frame_avg, frame_worst) = struct.unpack_from(RECORD_FMT, data, pos)
+        records.append({
+            "session": session,
+            "t": t_ms / 1000,
+            "level": LEVELS[level],
+            "outcome": OUTCOMES[outcome],
+            "mode": None if mode == NONE else MODE_NAMES[mode],
+            "times": None if times == NONE else times,
+            "lives_lost": lives_lost,
+            "score": score,
+            "survived": survived / 10,
+            "frame_avg": frame_avg / 10,
+            "frame_worst": frame_worst,
+        })
+    return records
+
+
+def print_records(records):
+    print("{:>7}{:>9}  {:<9}{:<7}{:>6}  {:<8}{:>6}{:>6}{:>9}{:>9}{:>9}".format(
+        "session", "t s", "level", "mode", "times", "outcome", "lost", "score", "surv s", "avg ms", "max ms"))
+    for r in records:
+        print("{:>7}{:>9.1f}  {:<9}{:<7}{:>6}  {:<8}{:>6}{:>6}{:>9.1f}{:>9.1f}{:>9}".format(
+            r["session"], r["t"], r["level"], r["mode"] or "-",
+            "-" if r["times"] is None else r["times"], r["outcome"],
+            r["lives_lost"], r["score"], r["survived"], r["frame_avg"], r["frame_worst"]))
+
+
+def summarize(records):
+    """One line per (level, mode): counts, win rate and means"""
+    groups = {}
+    for r in records:
+        groups.setdefault((r["level"], r["mode"] or "-"), []).append(r)
+    print("{:<9}{:<7}{:>7}{:>7}{:>9}{:>7}{:>7}{:>9}{:>9}".format(
+        "level", "mode", "played", "win%", "surv s", "lost", "score", "avg ms", "max ms"))
+    for (level, mode), rs in sorted(groups.items()):
+        n = len(rs)
+        wins = sum(1 for r in rs if r["outcome"] == "win" or (level == "boss" and r["outcome"] == "timeout"))
+        print("{:<9}{:<7}{:>7}{:>7.1f}{:>9.1f}{:>7.2f}{:>7.1f}{:>9.1f}{:>9}".format(
+            level, mode, n, 100 * wins / n,
+            sum(r["survived"] for r in rs) / n,
+            sum(r["lives_lost"] for r in rs) / n,
+            sum(r["score"] for r in rs) / n,
+            sum(r["frame_avg"] for r in rs) / n,
+            max(r["frame_worst"] for r in rs)))
+    print("{} levels in {} sessions".format(len(records), len({r["session"] for r in records})))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0].startswith("-"):
+        print(__doc__)
+        return 1
+    records = read_records(argv[0])
+    if "--summary" not in argv:
+        print_records(records)
+        print()
+    summarize(records)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Record / replay round trip of an input trace (host only).
+
+Records one level the way record_game() does on the board: a menu before
+the level (a knob turn and a press, written ahead of the first frame), then
+the level itself with scripted tilt, shield turns and frame times. Replays
+the trace through the same menu and level and checks that both runs pick
+the same option and end the same way. A second case waits between the menu
+and the level (a dialogue on the board): that wait must not reach the trace,
+so the first frame's dt stays about 0 and the countdown runs in full.
+Exits with status 1 on a mismatch.
+
+    python tools/trace_roundtrip.py
+    python tools/trace_roundtrip.py --seed 7 --seconds 3
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+headless.install()
+
+from GameRules import normal_rules
+from Level import Level, Machine
+from InputTrace import (
+    TraceRecorder, TraceReplayer, ReplayFinished,
+    RecordingAccelerometer, RecordingRotary, RecordingButton,
+    ReplayAccelerometer, ReplayRotary, ReplayButton
+)
+from MemoryMonitor import MemoryMonitor, GcPolicy
+import Log
+
+MODE = 1
+TIMES = 7            # Shield on from the start, so the knob reaches the level
+MENU_OPTIONS = 3
+MENU_POLLS = 200     # A menu still open after this many polls has hung
+DIRECTIONS = ("UP", "LEFT", "RIGHT", "DOWN")
+PRE_LEVEL_WAIT = 0.5  # Seconds between the menu and the level in the second case
+FIRST_FRAME_MS = 30   # Most a first frame may cover: one frame, not the wait
+
+
+# ================================
+# Scripted devices
+# ================================
+class ScriptedTilt:
+    """Slow circle of tilt, so the ball wanders over the tile"""
+    def __init__(self):
+        self.frames = 0
+
+    def read_filtered(self):
+        a = self.frames * 0.05
+        self.frames += 1
+        return 4.0 * math.cos(a), 4.0 * math.sin(a), 9.8
+
+    def tune(self, min_cutoff, beta):
+        pass
+
+
+class ScriptedRotary:
+    """One detent every `period` reads, after `delay` reads"""
+    def __init__(self, delay, period):
+        self.reads = 0
+        self.delay = delay
+        self.period = period
+
+    def update(self):
+        self.reads += 1
+        if self.reads < self.delay:
+            return 0
+        return 1 if (self.reads - self.delay) % self.period == 0 else 0
+
+    def drain(self):
+        pass
+
+
+class ScriptedButton:
+    """Clicks (fell, then rose) on the given update() calls"""
+    def __init__(self, clicks):
+        self.clicks = clicks
+        self.updates = 0
+        self.fell = False
+        self.rose = False
+        self.long_press = False
+        self.value = True
+
+    def update(self):
+        self.updates += 1
+        self.fell = self.updates in self.clicks
+        self.rose = self.updates - 1 in self.clicks
+        self.value = not self.fell
+
+
+# ================================
+# Record / replay
+# ================================
+def menu(rotary, button):
+    """display_lines() for a multi-line menu; None if no press ever came"""
+    rotary.drain()
+    selection = 0
+    for _ in range(MENU_POLLS):
+        selection = (selection + rotary.update()) % MENU_OPTIONS
+        button.update()
+        if button.fell:
+            return selection
+    return None
+
+
+def play(accel, rotary, button, clock, sleep, seed, seconds, wait=0):
+    """Menu, `wait` seconds, then one normal level; returns what both runs must agree on"""
+    choice = menu(rotary, button)
+    if choice is None:
+        raise AssertionError("menu before the level never saw a press")
+    sleep(wait)
+
+    mem = MemoryMonitor(False)
+    machine = Machine(
+        headless.Display(), {d: headless.Pixel() for d in DIRECTIONS},
+        accel, rotary, button, mem, GcPolicy(mem), clock, sleep
+    )
+    rules = normal_rules(MODE, TIMES)
+    rules.time_limit = seconds
+    level = Level(machine, rules, seed=seed)
+    outcome = level.run()
+    return {
+        "choice": choice, "outcome": outcome, "score": level.score,
+        "lives": level.lives, "tiles": level.tile_count,
+        "shield": level.shield_dir, "ball": (level.ball_tile.x, level.ball_tile.y),
+        "survived": round(level.survived, 3)
+    }
+
+
+def record(path, seed, seconds, wait=0):
+    recorder = TraceRecorder(path, seed, MODE, TIMES)
+    try:
+        result = play(
+            RecordingAccelerometer(ScriptedTilt(), recorder),
+            RecordingRotary(ScriptedRotary(delay=3, period=40), recorder),
+            RecordingButton(ScriptedButton({6, 300}), recorder),
+            recorder.clock, time.sleep, seed, seconds, wait
+        )
+        result["frames"] = recorder.frames
+    finally:
+        recorder.close()
+    return result
+
+
+def replay(path, seconds):
+    replayer = TraceReplayer(path)
+    try:
+        result = play(
+            ReplayAccelerometer(replayer), ReplayRotary(replayer), ReplayButton(replayer),
+            replayer.clock, lambda s: None, replayer.seed, seconds
+        )
+    except ReplayFinished:
+        raise AssertionError("trace ended before the level did")
+    result["frames"] = replayer.frames
+    return result
+
+
+def first_frame_ms(path):
+    """dt of the first F record"""
+    replayer = TraceReplayer(path)
+    replayer.next_frame()
+    return replayer.worst_recorded_ms
+
+
+def round_trip(seed, seconds, wait, frames=None):
+    """
+    Record and replay one case; prints the comparison, returns (passed, frames).
+    frames: frames recorded without a wait, which the countdown must match
+    """
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    try:
+        recorded = record(path, seed, seconds, wait)
+        replayed = replay(path, seconds)
+        first_ms = first_frame_ms(path)
+    finally:
+        os.remove(path)
+
+    print("wait before the level: {} s".format(wait))
+    ok = True
+    for key in recorded:
+        same = recorded[key] == replayed[key]
+        ok = ok and same
+        print("{:<10}{:>16}{:>16}  {}".format(
+            key, str(recorded[key]), str(replayed[key]), "ok" if same else "MISMATCH"))
+
+    checks = [("first dt", "{} ms".format(first_ms), first_ms <= FIRST_FRAME_MS)]
+    if frames is not None:
+        # A wait counted by the trace clock would cut the countdown short
+        checks.append(("countdown", "{} frames".format(recorded["frames"]),
+                       abs(recorded["frames"] - frames) <= frames // 10))
+    for key, value, good in checks:
+        ok = ok and good
+        print("{:<10}{:>16}{:>16}  {}".format(key, value, "", "ok" if good else "WRONG"))
+    return ok, recorded["frames"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay one level, then compare")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--seconds", type=int, default=2, help="time limit of the recorded level")
+    args = parser.parse_args(argv)
+
+    Log.configure(Log.WARN)
+    ok, frames = round_trip(args.seed, args.seconds, 0)
+    waited, _ = round_trip(args.seed, args.seconds, PRE_LEVEL_WAIT, frames)
+    ok = ok and waited
+    Log.configure(Log.INFO)
+    print("round trip " + ("ok" if ok else "FAILED"))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())